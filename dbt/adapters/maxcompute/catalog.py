@@ -0,0 +1,138 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import agate
+from odps import ODPS
+from odps import types as odps_types
+from odps.models import Table
+
+from dbt.adapters.maxcompute.metadata import TableMetadataLoader
+from dbt.adapters.maxcompute.metadata_cache import MetadataCache
+from dbt.adapters.maxcompute.relation import MaxComputeRelation
+from dbt.adapters.maxcompute.utils import WaitPolicy
+
+INFORMATION_SCHEMA_CATALOG_MACRO_NAME = "mc_get_catalog_from_information_schema"
+
+CATALOG_COLUMN_NAMES = [
+    "table_database",
+    "table_schema",
+    "table_name",
+    "table_type",
+    "table_comment",
+    "column_name",
+    "column_type",
+    "column_index",
+    "column_comment",
+    "table_owner",
+]
+
+
+def catalog_table_type(odps_table: Table) -> str:
+    if odps_table.is_virtual_view:
+        return "VIEW"
+    if odps_table.is_materialized_view:
+        return "MATERIALIZED_VIEW"
+    return "TABLE"
+
+
+def catalog_column_type(data_type: str) -> str:
+    """The catalog spelling of a column type, as PyODPS names it (`decimal(10,2)`).
+
+    Both catalog paths go through it, so `column_type` does not depend on
+    whether the information schema or the table metadata was read.
+    """
+    try:
+        return odps_types.validate_data_type(data_type).name
+    except (ValueError, TypeError):
+        return data_type.lower()
+
+
+def normalize_column_types(table: agate.Table) -> agate.Table:
+    """Respell the `column_type` of catalog rows read from the information schema."""
+    index = list(table.column_names).index("column_type")
+    rows = [
+        tuple(
+            catalog_column_type(value) if i == index and value is not None else value
+            for i, value in enumerate(row)
+        )
+        for row in table.rows
+    ]
+    return agate.Table(rows, column_names=table.column_names, column_types=table.column_types)
+
+
+def catalog_rows(relation: MaxComputeRelation, odps_table: Optional[Table]) -> List[Tuple]:
+    """Build the catalog rows of one relation from its reloaded table metadata."""
+    if odps_table is None:
+        return []
+    table_type = catalog_table_type(odps_table)
+    rows = []
+    for column_index, column in enumerate(odps_table.table_schema.simple_columns, start=1):
+        rows.append(
+            (
+                relation.project,
+                relation.schema,
+                relation.table,
+                table_type,
+                odps_table.comment,
+                column.name,
+                catalog_column_type(column.type.name),
+                column_index,
+                column.comment,
+                odps_table.owner,
+            )
+        )
+    return rows
+
+
+def schema_scopes(project_schemas: Iterable[Tuple[str, str]]) -> List[Dict[str, Any]]:
+    """Scopes covering whole schemas, for the information schema catalog query."""
+    pairs = {(project.lower(), schema.lower()) for project, schema in project_schemas}
+    return [
+        {"project": project, "schema": schema, "tables": []} for project, schema in sorted(pairs)
+    ]
+
+
+def relation_scopes(relations: Iterable[MaxComputeRelation]) -> List[Dict[str, Any]]:
+    """Scopes covering the given relations only, grouped by project and schema."""
+    tables: Dict[Tuple[str, str], set] = {}
+    for relation in relations:
+        key = (relation.project.lower(), relation.schema.lower())
+        tables.setdefault(key, set()).add(relation.identifier.lower())
+    return [
+        {"project": project, "schema": schema, "tables": sorted(names)}
+        for (project, schema), names in sorted(tables.items())
+    ]
+
+
+class MaxComputeCatalogBuilder:
+    """Build the `dbt docs generate` catalog for a set of relations.
+
+    Table metadata is reloaded through a bounded thread pool, while rows are
+    emitted in the order the relations were given, so the resulting agate
+    table is identical to the one built by reloading tables one at a time.
+    """
+
+    def __init__(
+        self,
+        odps: ODPS,
+        max_workers: int = 1,
+        retry_times: int = 10,
+        metadata_cache: Optional[MetadataCache] = None,
+        wait_policy: Optional[WaitPolicy] = None,
+    ):
+        self.loader = TableMetadataLoader(
+            odps,
+            max_workers=max_workers,
+            retry_times=retry_times,
+            metadata_cache=metadata_cache,
+            wait_policy=wait_policy,
+        )
+
+    def build_rows(self, relations: Iterable[MaxComputeRelation]) -> List[Tuple]:
+        relations = list(relations)
+        rows: List[Tuple] = []
+        for relation, odps_table in zip(relations, self.loader.load_all(relations)):
+            rows.extend(catalog_rows(relation, odps_table))
+        return rows
+
+    def build(self, relations: Iterable[MaxComputeRelation]) -> agate.Table:
+        return agate.Table(self.build_rows(relations), column_names=CATALOG_COLUMN_NAMES)
@@ -0,0 +1,75 @@
+import hashlib
+import json
+import threading
+from dataclasses import fields
+from typing import Dict
+
+from dbt.adapters.events.logging import AdapterLogger
+from dbt_common.exceptions import DbtConfigError
+from odps import ODPS
+from odps import options
+
+logger = AdapterLogger("MaxCompute")
+
+
+def client_key(credentials) -> str:
+    """Identify the ODPS client of a profile by its connection and auth fields."""
+    values = {field.name: getattr(credentials, field.name) for field in fields(credentials)}
+    payload = json.dumps(values, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def reserve_http_connections(size: int) -> None:
+    """Let each HTTP session of PyODPS keep at least `size` sockets alive per host."""
+    options.pool_connections = max(options.pool_connections or 0, size)
+    options.pool_maxsize = max(options.pool_maxsize or 0, size)
+
+
+class OdpsClientPool:
+    """Process-wide ODPS clients, built and validated once per credentials.
+
+    Building a client resolves the credential provider, and validating it
+    reloads the project; both are done by the first connection of a profile
+    only, the connections opened afterwards (one per dbt thread) share the
+    same client and therefore its credential provider, its tenant settings
+    and the keep-alive sockets of PyODPS' HTTP sessions.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clients: Dict[str, ODPS] = {}
+        self._key_locks: Dict[str, threading.Lock] = {}
+
+    def get(self, credentials) -> ODPS:
+        key = client_key(credentials)
+        client = self._clients.get(key)
+        if client is not None:
+            return client
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        # Threads opening a connection for the same profile wait for the one
+        # validating the client instead of validating it again.
+        with key_lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = self._open(credentials)
+                self._clients[key] = client
+        return client
+
+    @staticmethod
+    def _open(credentials) -> ODPS:
+        client = credentials.odps()
+        try:
+            client.get_project().reload()
+        except Exception as e:
+            raise DbtConfigError(f"Failed to connect to MaxCompute: {str(e)}") from e
+        logger.debug(f"Validated MaxCompute client for project {credentials.database}")
+        return client
+
+    def clear(self) -> None:
+        with self._lock:
+            self._clients.clear()
+            self._key_locks.clear()
+
+
+CLIENT_POOL = OdpsClientPool()
@@ -3,10 +3,12 @@ from contextlib import contextmanager
 from dbt.adapters.contracts.connection import AdapterResponse
 from dbt.adapters.events.logging import AdapterLogger
 from dbt.adapters.sql import SQLConnectionManager
-from dbt_common.exceptions import DbtConfigError, DbtRuntimeError
+from dbt_common.exceptions import DbtRuntimeError
 from odps import options
 
+from dbt.adapters.maxcompute.client_pool import CLIENT_POOL, reserve_http_connections
 from dbt.adapters.maxcompute.context import GLOBAL_SQL_HINTS
+from dbt.adapters.maxcompute.utils import resolve_wait_policy
 from dbt.adapters.maxcompute.wrapper import ConnectionWrapper, MaxQAConfig
 
 logger = AdapterLogger("MaxCompute")
@@ -15,6 +17,10 @@ logger = AdapterLogger("MaxCompute")
 class MaxComputeConnectionManager(SQLConnectionManager):
     TYPE = "maxcompute"
 
+    def __init__(self, profile, mp_context):
+        super().__init__(profile, mp_context)
+        reserve_http_connections(profile.threads or 1)
+
     @classmethod
     def open(cls, connection):
         if connection.state == "open":
@@ -22,13 +28,8 @@ class MaxComputeConnectionManager(SQLConnectionManager):
             return connection
 
         credentials = connection.credentials
-        o = credentials.odps()
         options.user_agent_pattern = "dbt-maxcompute $pyodps_version $python_version"
-
-        try:
-            o.get_project().reload()
-        except Exception as e:
-            raise DbtConfigError(f"Failed to connect to MaxCompute: {str(e)}") from e
+        o = CLIENT_POOL.get(credentials)
 
         maxqa_config = None
         if credentials.execution_mode == "maxqa":
@@ -38,7 +39,12 @@ class MaxComputeConnectionManager(SQLConnectionManager):
                 offline_quota_name=credentials.maxqa_fallback_quota,
             )
 
-        handle = ConnectionWrapper(odps=o, hints=GLOBAL_SQL_HINTS, maxqa_config=maxqa_config)
+        handle = ConnectionWrapper(
+            odps=o,
+            hints=GLOBAL_SQL_HINTS,
+            maxqa_config=maxqa_config,
+            wait_policy=resolve_wait_policy("sql_retry", credentials.wait_policies),
+        )
         connection.state = "open"
         connection.handle = handle
         return connection
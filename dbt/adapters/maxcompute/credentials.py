@@ -1,12 +1,25 @@
 from dataclasses import dataclass
-from typing import Optional
+from typing import Any, Dict, Optional
 
-from alibabacloud_credentials.client import Client
-from alibabacloud_credentials.models import Config
+from alibabacloud_credentials.http import HttpOptions
+from alibabacloud_credentials.provider import (
+    DefaultCredentialsProvider,
+    EcsRamRoleCredentialsProvider,
+    OIDCRoleArnCredentialsProvider,
+    RamRoleArnCredentialsProvider,
+    RsaKeyPairCredentialsProvider,
+    StaticAKCredentialsProvider,
+    StaticSTSCredentialsProvider,
+    URLCredentialsProvider,
+)
+from alibabacloud_credentials_api import ICredentialsProvider
 from dbt.adapters.contracts.connection import Credentials
+from dbt_common.exceptions import DbtRuntimeError
 from odps import ODPS
 from odps import options
-from odps.accounts import CredentialProviderAccount
+from odps.accounts import BearerTokenAccount, CredentialProviderAccount
+
+from dbt.adapters.maxcompute.token_cache import TOKEN_CACHE
 
 
 @dataclass
@@ -21,6 +34,34 @@ class MaxComputeCredentials(Credentials):
     maxqa_fallback: bool = True
     maxqa_fallback_quota: Optional[str] = None
 
+    # Metadata fan-out (catalog generation, ...), defaults to `threads`
+    metadata_threads: Optional[int] = None
+    # `table` reloads each table's metadata, `information_schema` reads the
+    # whole catalog from SYSTEM_CATALOG.INFORMATION_SCHEMA with one query
+    catalog_mode: str = "table"
+    # Persist table metadata across invocations, in `metadata_cache_path`
+    # (defaults to `maxcompute_metadata.db` under the target path)
+    metadata_cache: bool = False
+    metadata_cache_path: Optional[str] = None
+    metadata_cache_max_age: int = 7 * 24 * 3600
+    # In-process cache of reloaded tables, 0 disables it
+    table_cache_size: int = 256
+    table_cache_ttl: int = 300
+    # Per call site overrides of the metadata consistency waits, e.g.
+    # {"table_visible": {"deadline": 30}}; see utils.DEFAULT_WAIT_POLICIES
+    wait_policies: Optional[Dict[str, Dict[str, Any]]] = None
+    # `query` reads the output schema of a query by running it with `limit 0`,
+    # `explain` reads it from the compiled plan and falls back to `query`
+    schema_inference: str = "query"
+    # Persist exchanged STS tokens in `token_cache_path` so that back-to-back
+    # invocations skip the exchange. They are encrypted with the Fernet key
+    # `token_cache_key` (e.g. from an env_var), without it nothing is
+    # persisted; requires `cryptography`
+    token_cache: bool = False
+    token_cache_path: Optional[str] = None
+    token_cache_ttl: int = 3600
+    token_cache_key: Optional[str] = None
+
     # auth config: All configuration items supported by alibabacloud_credentials
     # It should be noted that in order to avoid ambiguity,
     # `type` becomes `auth_type`, `policy` becomes `auth_policy`, `host` becomes `auth_host`,
@@ -70,38 +111,133 @@ class MaxComputeCredentials(Credentials):
     def _connection_keys(self):
         return "project", "database", "schema", "endpoint", "execution_mode"
 
-    def odps(self):
+    def _auth_keys(self):
+        return (
+            "auth_type",
+            "access_key_id",
+            "access_key_secret",
+            "security_token",
+            "bearer_token",
+            "duration_seconds",
+            "role_arn",
+            "oidc_provider_arn",
+            "oidc_token_file_path",
+            "auth_policy",
+            "role_session_expiration",
+            "role_session_name",
+            "public_key_id",
+            "private_key_file",
+            "role_name",
+            "auth_host",
+            "auth_timeout",
+            "auth_connect_timeout",
+            "auth_proxy",
+            "credentials_uri",
+            "disable_imds_v1",
+            "enable_imds_v2",
+            "metadata_token_duration",
+            "sts_endpoint",
+        )
+
+    def _check_auth_options(self) -> None:
+        """Reject auth options that the provider of `auth_type` cannot honor."""
+        unsupported = []
+        # The providers take neither a custom host nor a metadata token lifetime
+        if self.auth_host is not None:
+            unsupported.append("auth_host")
+        if self.metadata_token_duration not in (
+            None,
+            EcsRamRoleCredentialsProvider.DEFAULT_METADATA_TOKEN_DURATION,
+        ):
+            unsupported.append("metadata_token_duration")
+        if self.duration_seconds is not None and self.auth_type not in (
+            "ram_role_arn",
+            "oidc_role_arn",
+            "rsa_key_pair",
+        ):
+            unsupported.append("duration_seconds")
+        if self.enable_imds_v2 and self.auth_type != "ecs_ram_role":
+            unsupported.append("enable_imds_v2")
+        if unsupported:
+            raise DbtRuntimeError(
+                f"Auth options not supported with auth_type '{self.auth_type}': "
+                f"{', '.join(unsupported)}"
+            )
+
+    def _credentials_provider(self) -> ICredentialsProvider:
+        """Build the `alibabacloud_credentials` provider of the auth config."""
+        self._check_auth_options()
+        # `duration_seconds` is the older name of `role_session_expiration`
+        duration_seconds = self.role_session_expiration or self.duration_seconds
+        http_options = HttpOptions(
+            read_timeout=self.auth_timeout,
+            connect_timeout=self.auth_connect_timeout,
+            proxy=self.auth_proxy,
+        )
         if self.auth_type == "chain":
-            cred = Client()
-        else:
-            config = Config(
-                type=self.auth_type,
+            return DefaultCredentialsProvider()
+        if self.auth_type == "access_key":
+            return StaticAKCredentialsProvider(
+                access_key_id=self.access_key_id, access_key_secret=self.access_key_secret
+            )
+        if self.auth_type == "sts":
+            return StaticSTSCredentialsProvider(
                 access_key_id=self.access_key_id,
                 access_key_secret=self.access_key_secret,
                 security_token=self.security_token,
-                bearer_token=self.bearer_token,
-                duration_seconds=self.duration_seconds,
+            )
+        if self.auth_type == "ram_role_arn":
+            return RamRoleArnCredentialsProvider(
+                access_key_id=self.access_key_id,
+                access_key_secret=self.access_key_secret,
+                security_token=self.security_token or None,
+                role_arn=self.role_arn,
+                role_session_name=self.role_session_name,
+                duration_seconds=duration_seconds,
+                policy=self.auth_policy,
+                sts_endpoint=self.sts_endpoint,
+                http_options=http_options,
+            )
+        if self.auth_type == "oidc_role_arn":
+            return OIDCRoleArnCredentialsProvider(
                 role_arn=self.role_arn,
                 oidc_provider_arn=self.oidc_provider_arn,
                 oidc_token_file_path=self.oidc_token_file_path,
-                policy=self.auth_policy,
-                role_session_expiration=self.role_session_expiration,
                 role_session_name=self.role_session_name,
+                duration_seconds=duration_seconds,
+                policy=self.auth_policy,
+                sts_endpoint=self.sts_endpoint,
+                http_options=http_options,
+            )
+        if self.auth_type == "rsa_key_pair":
+            return RsaKeyPairCredentialsProvider(
                 public_key_id=self.public_key_id,
                 private_key_file=self.private_key_file,
-                role_name=self.role_name,
-                host=self.auth_host,
-                timeout=self.auth_timeout,
-                connect_timeout=self.auth_connect_timeout,
-                proxy=self.auth_proxy,
-                credentials_uri=self.credentials_uri,
-                disable_imds_v1=self.disable_imds_v1,
-                enable_imds_v2=self.enable_imds_v2,
-                metadata_token_duration=self.metadata_token_duration,
+                duration_seconds=duration_seconds,
                 sts_endpoint=self.sts_endpoint,
+                http_options=http_options,
+            )
+        if self.auth_type == "ecs_ram_role":
+            return EcsRamRoleCredentialsProvider(
+                role_name=self.role_name,
+                # IMDSv2 only: a failed metadata token fetch is not retried with v1
+                disable_imds_v1=self.disable_imds_v1 or self.enable_imds_v2,
+                http_options=http_options,
             )
-            cred = Client(config)
-        account = CredentialProviderAccount(cred)
+        if self.auth_type == "credentials_uri":
+            return URLCredentialsProvider(uri=self.credentials_uri, http_options=http_options)
+        raise DbtRuntimeError(
+            f"Unsupported auth_type '{self.auth_type}', supported: access_key, sts, bearer, "
+            "ram_role_arn, oidc_role_arn, rsa_key_pair, ecs_ram_role, credentials_uri, chain"
+        )
+
+    def odps(self):
+        if self.auth_type == "bearer":
+            account = BearerTokenAccount(self.bearer_token)
+        else:
+            # Every client of the same auth config shares one token provider
+            provider = TOKEN_CACHE.provider(self, self._credentials_provider)
+            account = CredentialProviderAccount(provider)
         o = ODPS(
             account=account,
             project=self.database,
@@ -1,19 +1,19 @@
-import re
-import time
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
 from multiprocessing.context import SpawnContext
-from typing import Optional, List, Dict, Any, Set, FrozenSet, Tuple
+from typing import Optional, List, Dict, Any, Set, FrozenSet, Tuple, Iterable, Callable
 
 import agate
 import numpy as np
 import odps.models
 import pandas as pd
 import pytz
-from agate import Table
 from dbt.adapters.base import ConstraintSupport, available
 from dbt.adapters.base.impl import FreshnessResponse
-from dbt.adapters.base.relation import InformationSchema
+from dbt.adapters.base.relation import BaseRelation, InformationSchema
 from dbt.adapters.capability import (
     CapabilityDict,
     Capability,
@@ -22,7 +22,7 @@ from dbt.adapters.capability import (
 )
 from dbt.adapters.contracts.connection import AdapterResponse
 from dbt.adapters.contracts.macros import MacroResolverProtocol
-from dbt.adapters.contracts.relation import RelationType
+from dbt.adapters.contracts.relation import RelationConfig, RelationType
 from dbt.adapters.protocol import AdapterConfig
 from dbt.adapters.sql import SQLAdapter
 from dbt_common.contracts.constraints import ConstraintType
@@ -31,19 +31,51 @@ from odps import ODPS
 from odps.errors import ODPSError, NoSuchObject
 
 from dbt.adapters.maxcompute import MaxComputeConnectionManager
+from dbt.adapters.maxcompute.catalog import (
+    INFORMATION_SCHEMA_CATALOG_MACRO_NAME,
+    MaxComputeCatalogBuilder,
+    normalize_column_types,
+    relation_scopes,
+    schema_scopes,
+)
 from dbt.adapters.maxcompute.column import MaxComputeColumn
+from dbt.adapters.maxcompute.metadata import TableMetadataLoader, map_concurrently
+from dbt.adapters.maxcompute.metadata_cache import METADATA_CACHE_FILE_NAME, MetadataCache
+from dbt.adapters.maxcompute.probe_cache import SchemaProbeCache, probe_key
 from dbt.adapters.maxcompute.relation import MaxComputeRelation
+from dbt.adapters.maxcompute.schema_inference import explain_query_schema
+from dbt.adapters.maxcompute.setting_parser import SettingParser
+from dbt.adapters.maxcompute.table_cache import TableCache
 from dbt.adapters.events.logging import AdapterLogger
 
 from dbt.adapters.maxcompute.relation_configs._partition import PartitionConfig
 from dbt.adapters.maxcompute.relation_configs._materialized_view import (
     MaxComputeMaterializedViewConfig,
 )
-from dbt.adapters.maxcompute.utils import is_schema_not_found, quote_string, quote_ref
+from dbt.adapters.maxcompute.relation_configs._table import MaxComputeTableConfig
+from dbt.adapters.maxcompute.utils import (
+    WAIT_STATS,
+    WaitPolicy,
+    call_with_retry,
+    compile_like_pattern,
+    is_schema_not_found,
+    is_table_not_found,
+    like_pattern_prefix,
+    like_pattern_to_regex,
+    quote_ref,
+    quote_string,
+    resolve_wait_policy,
+    returns_rows,
+    unquote_literal,
+)
 
 logger = AdapterLogger("MaxCompute")
 
 
+class _SchemaStateNotVisible(Exception):
+    """A schema created or dropped by this process is not seen as such yet."""
+
+
 @dataclass
 class MaxComputeConfig(AdapterConfig):
     partitionColumns: Optional[List[Dict[str, str]]] = None
@@ -78,36 +110,258 @@ class MaxComputeAdapter(SQLAdapter):
     _capabilities: CapabilityDict = CapabilityDict(
         {
             Capability.TableLastModifiedMetadata: CapabilitySupport(support=Support.Full),
+            Capability.TableLastModifiedMetadataBatch: CapabilitySupport(support=Support.Full),
             Capability.SchemaMetadataByRelations: CapabilitySupport(support=Support.Full),
+            Capability.MicrobatchConcurrency: CapabilitySupport(support=Support.Full),
         }
     )
 
     def __init__(self, config, mp_context: SpawnContext) -> None:
         super().__init__(config, mp_context)
         self.connections: MaxComputeConnectionManager = self.connections
+        self._information_schema_catalog_failed = False
+        self._metadata_cache_instance: Optional[MetadataCache] = None
+        self._metadata_cache_lock = threading.Lock()
+        self._schema_state_lock = threading.Lock()
+        # Schemas of each project as listed in this invocation
+        self._listed_schemas: Dict[str, Set[str]] = {}
+        # Schemas created (True) or dropped (False) by this process, and
+        # whether the server was seen to agree yet
+        self._changed_schemas: Dict[Tuple[str, str], Tuple[bool, bool]] = {}
+        self._table_cache = TableCache(
+            max_size=config.credentials.table_cache_size, ttl=config.credentials.table_cache_ttl
+        )
+        self._probe_cache = SchemaProbeCache()
 
     def get_odps_client(self) -> ODPS:
         conn = self.acquire_connection()
         return conn.handle.odps
 
+    def _metadata_threads(self) -> int:
+        """Size of the thread pool used for metadata fan-out (catalog, listing, ...)."""
+        threads = self.config.credentials.metadata_threads or self.config.threads
+        return max(1, threads or 1)
+
+    def _wait_policy(self, call_site: str) -> WaitPolicy:
+        return resolve_wait_policy(call_site, self.config.credentials.wait_policies)
+
+    def _metadata_cache(self) -> Optional[MetadataCache]:
+        """The on-disk table metadata cache, None unless the profile enables it."""
+        credentials = self.config.credentials
+        if not credentials.metadata_cache:
+            return None
+        with self._metadata_cache_lock:
+            if self._metadata_cache_instance is None:
+                path = credentials.metadata_cache_path or os.path.join(
+                    self.config.project_target_path, METADATA_CACHE_FILE_NAME
+                )
+                logger.debug(f"Using table metadata cache {path}")
+                self._metadata_cache_instance = MetadataCache(
+                    path, max_age=credentials.metadata_cache_max_age
+                )
+        return self._metadata_cache_instance
+
+    def _load_table_metadata(
+        self, relation: MaxComputeRelation, retry_times=1
+    ) -> Optional[odps.models.Table]:
+        """Table metadata of a relation, from the table or metadata cache when possible."""
+        table = self._table_cache.get(relation)
+        if table is not None:
+            return table
+        loader = TableMetadataLoader(
+            self.get_odps_client(),
+            retry_times=retry_times,
+            metadata_cache=self._metadata_cache(),
+            wait_policy=self._wait_policy("table_visible"),
+        )
+        table = loader.load(relation)
+        if isinstance(table, odps.models.Table):
+            self._table_cache.put(relation, table)
+        return table
+
+    @available
+    def invalidate_table_metadata(self, relation: Optional[MaxComputeRelation]) -> str:
+        """Forget the cached metadata of a relation whose DDL is changed by this run."""
+        if relation is None or not relation.identifier:
+            return ""
+        self._table_cache.invalidate(relation)
+        self._probe_cache.invalidate(relation)
+        metadata_cache = self._metadata_cache()
+        if metadata_cache is not None:
+            metadata_cache.invalidate(relation.project, relation.schema, relation.identifier)
+        return ""
+
+    @available
+    def table_cache_stats(self) -> Dict[str, int]:
+        """Hit/miss counters of the in-process table cache."""
+        return self._table_cache.stats()
+
+    def cleanup_connections(self) -> None:
+        logger.debug(f"Table cache stats: {self._table_cache.stats()}")
+        logger.debug(f"Schema probe stats: {self._probe_cache.stats()}")
+        logger.debug(f"Wait stats: {WAIT_STATS.snapshot()}")
+        super().cleanup_connections()
+
     @available.parse_none
     def get_odps_table_by_relation(
-        self, relation: MaxComputeRelation, retry_times=1
+        self, relation: MaxComputeRelation, retry_times=1, use_cache=True
     ) -> Optional[odps.models.Table]:
-        # Sometimes the newly created table will be judged as not existing, so add retry to obtain it.
-        for i in range(retry_times):
-            table = self.get_odps_client().get_table(
-                relation.identifier, relation.project, relation.schema
-            )
-            try:
-                table.reload()
+        if use_cache:
+            table = self._table_cache.get(relation)
+            if table is not None:
                 return table
-            except NoSuchObject:
-                logger.info(f"Table {relation.render()} does not exist, retrying...")
-                time.sleep(10)
+        loader = TableMetadataLoader(
+            self.get_odps_client(),
+            retry_times=retry_times,
+            wait_policy=self._wait_policy("table_visible"),
+        )
+        table = loader.reload(relation)
+        if table is not None:
+            self._table_cache.put(relation, table)
+        return table
+
+    @staticmethod
+    def _partition_values(table: odps.models.Table) -> Dict[str, Set[str]]:
+        """The values of each partition column among the partitions of a table."""
+        values: Dict[str, Set[str]] = {
+            column.name: set() for column in table.table_schema.partitions
+        }
+        for partition in table.iterate_partitions():
+            for name, value in partition.partition_spec.kv.items():
+                values.setdefault(name, set()).add(value)
+        return values
+
+    @available.parse(lambda *a, **k: [])
+    def list_partitions(self, relation: MaxComputeRelation) -> List[str]:
+        """The partition specs of a relation, e.g. `ds=20240101`, read fresh from metadata."""
+        table = self.get_odps_table_by_relation(relation, 3, use_cache=False)
+        if table is None or not table.table_schema.partitions:
+            return []
+        return [
+            ",".join(f"{name}={value}" for name, value in partition.partition_spec.kv.items())
+            for partition in table.iterate_partitions()
+        ]
+
+    @available.parse(lambda *a, **k: False)
+    def can_clone_partitions(self, target: MaxComputeRelation) -> bool:
+        """
+        Whether partitions can be cloned into `target`: it exists and is not
+        transactional, which CLONE TABLE does not support.
+        """
+        table = self.get_odps_table_by_relation(target, 3)
+        return table is not None and not table.is_transactional
+
+    @staticmethod
+    def _clone_layout(table: odps.models.Table) -> Tuple[List[Tuple[str, str]], ...]:
+        """The columns and partition columns of a table, by name and type, in order."""
+        schema = table.table_schema
+        return tuple(
+            [(column.name.lower(), str(column.type).lower()) for column in columns]
+            for columns in (schema.simple_columns, schema.partitions)
+        )
+
+    @available.parse_none
+    def clone_partitions_sql(
+        self, source: MaxComputeRelation, target: MaxComputeRelation, batch_size: int = 1000
+    ) -> Optional[str]:
+        """
+        CLONE TABLE statements copying every partition of `source` into `target`.
+
+        Target partitions with the same spec are overwritten, the others are
+        kept. Returns an empty string when `source` has no partitions, and None
+        when the partitions cannot be cloned: either table is missing or
+        transactional, or their columns differ in name, type or order.
+        """
+        table = self.get_odps_table_by_relation(source, 3, use_cache=False)
+        target_table = self.get_odps_table_by_relation(target, 3)
+        if table is None or target_table is None:
+            return None
+        if table.is_transactional or target_table.is_transactional:
+            logger.debug(f"Cannot clone partitions of transactional tables into {target.render()}")
+            return None
+        if self._clone_layout(table) != self._clone_layout(target_table):
+            logger.debug(f"Cannot clone partitions of {source.render()}: columns differ")
+            return None
+        if not table.table_schema.partitions:
+            return ""
+        specs = [
+            f"partition({partition.partition_spec})" for partition in table.iterate_partitions()
+        ]
+        statements = [
+            f"clone table {source.render()} {', '.join(specs[start : start + batch_size])} "
+            f"to {target.render()} if exists overwrite;"
+            for start in range(0, len(specs), batch_size)
+        ]
+        logger.debug(f"Cloning {len(specs)} partitions of {source.render()} to {target.render()}")
+        return "\n".join(statements)
+
+    @available.parse_none
+    def partitions_without_data(
+        self, source: MaxComputeRelation, partitions: List[str]
+    ) -> Optional[List[str]]:
+        """
+        The static `partitions` of an insert_overwrite that `source` has no rows for.
+
+        INSERT OVERWRITE already replaces every partition it writes, so only
+        these need a DELETE. Returns None when this cannot be told: `source` is
+        not partitioned by a single column, or a partition is not a literal.
+        """
+        table = self.get_odps_table_by_relation(source, 3, use_cache=False)
+        if table is None:
+            return None
+        values = self._partition_values(table)
+        if len(values) != 1:
+            return None
+        present = next(iter(values.values()))
+        missing = []
+        for partition in partitions:
+            value = unquote_literal(str(partition))
+            if value is None:
+                return None
+            if value not in present:
+                missing.append(partition)
+        return missing
+
+    @available.parse(lambda *a, **k: [])
+    def partition_predicates(
+        self,
+        source: MaxComputeRelation,
+        target: MaxComputeRelation,
+        alias: Optional[str] = None,
+        max_values: int = 1000,
+    ) -> List[str]:
+        """
+        Predicates restricting `target` to the partitions present in `source`.
+
+        The partitions are listed from the metadata of `source`, which must be
+        partitioned by the same columns as `target`, so no query is run.
+        Returns an empty list when no restriction can be derived.
+        """
+        target_table = self._load_table_metadata(target, 3)
+        source_table = self.get_odps_table_by_relation(source, 3, use_cache=False)
+        if target_table is None or source_table is None:
+            return []
+        columns = target_table.table_schema.partitions
+        names = [column.name for column in columns]
+        if not names or [column.name for column in source_table.table_schema.partitions] != names:
+            logger.debug(f"{source.render()} is not partitioned like {target.render()}")
+            return []
+
+        values = self._partition_values(source_table)
+        prefix = f"{alias}." if alias else ""
+        predicates = []
+        for column in columns:
+            column_values = sorted(values[column.name])
+            # An empty source merges nothing; very long lists cost more than they prune
+            if not column_values or len(column_values) > max_values:
                 continue
-        logger.warning(f"Table {relation.render()} does not exist.")
-        return None
+            if str(column.type).lower() in ("tinyint", "smallint", "int", "bigint"):
+                rendered = ", ".join(column_values)
+            else:
+                rendered = ", ".join(quote_string(value) for value in column_values)
+            predicates.append(f"{prefix}{quote_ref(column.name)} in ({rendered})")
+        logger.debug(f"Partition predicates of {target.render()}: {predicates}")
+        return predicates
 
     @available.parse_none
     def materialized_view_config_changes(
@@ -157,18 +411,62 @@ class MaxComputeAdapter(SQLAdapter):
 
         return changes or None
 
+    @available.parse_none
+    def table_config_changes(
+        self, existing_relation: MaxComputeRelation, relation_config
+    ) -> Optional[Dict[str, Any]]:
+        """Compare the lifecycle, tblproperties and table_comment of a model
+        with the existing table's persisted metadata. Return None when they
+        match, or a dict of (existing, new) values of the settings that drifted.
+        """
+        table = self.get_odps_table_by_relation(existing_relation, 3)
+        if table is None:
+            return None
+        new_config = MaxComputeTableConfig.from_relation_config(relation_config)
+        existing_config = MaxComputeTableConfig.from_mc_table(table)
+        return new_config.changes_from(existing_config) or None
+
+    @available
+    def table_config_alter_sql(
+        self, relation: MaxComputeRelation, changes: Optional[Dict[str, Any]]
+    ) -> str:
+        """The ALTER TABLE script applying `table_config_changes` in place."""
+        if not changes:
+            return ""
+        return "\n".join(MaxComputeTableConfig.alter_table_sql(relation.render(), changes))
+
     ###
     # Implementations of abstract methods
     ###
     def get_relation(
         self, database: str, schema: str, identifier: str
     ) -> Optional[MaxComputeRelation]:
+        relation = MaxComputeRelation.create(
+            database=database, schema=schema, identifier=identifier
+        )
+        table = self._table_cache.get(relation)
+        if table is not None:
+            return MaxComputeRelation.from_odps_table(table)
+        metadata_cache = self._metadata_cache()
+        if metadata_cache is not None and database:
+            cached = metadata_cache.cached_table(database, schema, identifier)
+            if cached is not None:
+                return MaxComputeRelation.create(
+                    database=database,
+                    schema=schema,
+                    identifier=identifier,
+                    type=MaxComputeRelation.relation_type_of(cached),
+                )
         odpsTable = self.get_odps_client().get_table(identifier, database, schema)
         try:
             odpsTable.reload()
         except NoSuchObject:
             return None
-        return MaxComputeRelation.from_odps_table(odpsTable)
+        self._table_cache.put(relation, odpsTable)
+        relation = MaxComputeRelation.from_odps_table(odpsTable)
+        if metadata_cache is not None:
+            metadata_cache.store_table(relation.project, relation.schema, odpsTable)
+        return relation
 
     @classmethod
     def date_function(cls) -> str:
@@ -184,6 +482,7 @@ class MaxComputeAdapter(SQLAdapter):
             self.cache_dropped(relation)
         if relation.table is None:
             return
+        self.invalidate_table_metadata(relation)
         logger.debug(f"Dropping relation {relation.render()}")
         if relation.is_view or relation.is_materialized_view:
             self.get_odps_client().delete_view(
@@ -194,9 +493,16 @@ class MaxComputeAdapter(SQLAdapter):
                 relation.identifier, relation.project, True, relation.schema
             )
 
+    def rename_relation(
+        self, from_relation: MaxComputeRelation, to_relation: MaxComputeRelation
+    ) -> None:
+        self.invalidate_table_metadata(from_relation)
+        self.invalidate_table_metadata(to_relation)
+        super().rename_relation(from_relation, to_relation)
+
     def get_columns_in_relation(self, relation: MaxComputeRelation):
         logger.debug(f"get_columns_in_relation: {relation.render()}")
-        odps_table = self.get_odps_table_by_relation(relation, 3)
+        odps_table = self._load_table_metadata(relation, 3)
         if not odps_table:
             return []
         columns = [
@@ -224,10 +530,9 @@ class MaxComputeAdapter(SQLAdapter):
         try:
             self.get_odps_client().create_schema(relation.schema, relation.database)
         except ODPSError as e:
-            if is_schema_not_found(e):
-                return
-            else:
+            if not is_schema_not_found(e):
                 raise e
+        self._schema_changed(relation.database, relation.schema, exists=True)
 
     def drop_schema(self, relation: MaxComputeRelation) -> None:
         logger.debug(f"drop_schema: '{relation.database}.{relation.schema}'")
@@ -238,44 +543,155 @@ class MaxComputeAdapter(SQLAdapter):
 
         try:
             self.cache.drop_schema(relation.database, relation.schema)
-            for relation in self.list_relations_without_caching(relation):
-                self.drop_relation(relation)
+            for schema_relation in self.list_relations_without_caching(relation):
+                self.drop_relation(schema_relation)
             self.get_odps_client().delete_schema(relation.schema, relation.database)
         except ODPSError as e:
-            if is_schema_not_found(e):
-                return
-            else:
+            if not is_schema_not_found(e):
                 raise e
+        self._schema_changed(relation.database, relation.schema, exists=False)
 
     def list_relations_without_caching(
         self,
         schema_relation: MaxComputeRelation,
     ) -> List[MaxComputeRelation]:
         logger.debug(f"list_relations_without_caching: {schema_relation}")
+        return self._list_schema_relations(
+            self.get_odps_client(), schema_relation.database, schema_relation.schema
+        )
+
+    def _list_schema_relations(
+        self,
+        odps: ODPS,
+        database: Optional[str],
+        schema: str,
+        prefix: Optional[str] = None,
+        name_filter: Optional[Callable[[str], bool]] = None,
+    ) -> List[MaxComputeRelation]:
+        """List the relations of one schema, see `_list_schemas_relations`."""
+        return self._list_schemas_relations(odps, [(database, schema)], prefix, name_filter)
+
+    def _list_schemas_relations(
+        self,
+        odps: ODPS,
+        schemas: Iterable[Tuple[Optional[str], str]],
+        prefix: Optional[str] = None,
+        name_filter: Optional[Callable[[str], bool]] = None,
+    ) -> List[MaxComputeRelation]:
+        """List the relations of several (database, schema) pairs.
+
+        The relation type comes from the listing itself; only entries whose
+        type the listing did not report, nor the metadata cache, are reloaded.
+        Listings and reloads share one pool of `metadata_threads` workers, so
+        the number of concurrent metadata calls stays bounded however many
+        schemas are listed. `prefix` is pushed down to `list_tables`,
+        `name_filter` drops listed tables client-side.
+        """
+        relations = []
+        with ThreadPoolExecutor(max_workers=self._metadata_threads()) as pool:
+            listings = [
+                pool.submit(self._scan_schema, odps, database, schema, prefix, name_filter)
+                for database, schema in schemas
+            ]
+            reloads = []
+            for listing in listings:
+                listed, ambiguous = listing.result()
+                relations.extend(listed)
+                reloads.extend(pool.submit(self._relation_from_reload, t) for t in ambiguous)
+            if reloads:
+                logger.debug(f"Reload {len(reloads)} tables for type")
+            relations.extend(
+                relation for relation in (r.result() for r in reloads) if relation is not None
+            )
+        return relations
+
+    def _scan_schema(
+        self,
+        odps: ODPS,
+        database: Optional[str],
+        schema: str,
+        prefix: Optional[str] = None,
+        name_filter: Optional[Callable[[str], bool]] = None,
+    ) -> Tuple[List[MaxComputeRelation], List[odps.models.Table]]:
+        """List one schema: the relations typed by the listing or the metadata
+        cache, and the listed tables whose type needs a reload.
+        """
+        metadata_cache = self._metadata_cache()
+        project = database or odps.project
+        list_kwargs = {"prefix": prefix} if prefix else {}
+        if metadata_cache is not None:
+            # The plain listing lacks the DDL time the cache entries are validated against
+            list_kwargs["extended"] = True
         try:
             relations = []
-            results = self.get_odps_client().list_tables(
-                project=schema_relation.database, schema=schema_relation.schema
-            )
-            for table in results:
-                for i in range(3):
-                    try:
-                        table.reload()
-                        relations.append(MaxComputeRelation.from_odps_table(table))
-                        break
-                    except NoSuchObject:
-                        if i == 2:
-                            logger.debug(f"Table {table.name} does not exist, skip it.")
-                        else:
-                            time.sleep(5)
-            return relations
+            ambiguous = []
+            names = []
+            for table in odps.list_tables(project=database, schema=schema, **list_kwargs):
+                names.append(table.name)
+                if name_filter is not None and not name_filter(table.name):
+                    continue
+                table_type = MaxComputeRelation.relation_type_from_listing(table)
+                if metadata_cache is not None:
+                    metadata_cache.observe(project, schema, table)
+                    if table_type is None:
+                        cached = metadata_cache.cached_table(project, schema, table.name)
+                        if cached is not None:
+                            table_type = MaxComputeRelation.relation_type_of(cached)
+                if table_type is None:
+                    ambiguous.append(table)
+                else:
+                    relations.append(MaxComputeRelation.from_odps_table(table, table_type))
+            if metadata_cache is not None and not prefix:
+                # Only a complete listing tells which tables were dropped.
+                metadata_cache.retain_schema(project, schema, names)
+            return relations, ambiguous
         except ODPSError as e:
             if is_schema_not_found(e):
-                return []
+                return [], []
             else:
                 logger.error(f"Error in list_relations_without_caching: {str(e)}")
                 raise e
 
+    def _relation_from_reload(self, table: odps.models.Table) -> Optional[MaxComputeRelation]:
+        try:
+            table.reload()
+        except NoSuchObject:
+            # Dropped between listing and reload.
+            logger.debug(f"Table {table.name} does not exist, skip it.")
+            return None
+        relation = MaxComputeRelation.from_odps_table(table)
+        self._table_cache.put(relation, table)
+        metadata_cache = self._metadata_cache()
+        if metadata_cache is not None:
+            metadata_cache.store_table(relation.project, relation.schema, table)
+        return relation
+
+    def _relations_cache_for_schemas(
+        self,
+        relation_configs: Iterable[RelationConfig],
+        cache_schemas: Optional[Set[BaseRelation]] = None,
+    ) -> None:
+        """Populate the relations cache, listing all schemas concurrently through
+        one shared ODPS client instead of one dbt connection per schema.
+        """
+        if not cache_schemas:
+            cache_schemas = self._get_cache_schemas(relation_configs)
+        cache_schemas = list(cache_schemas)
+        for relation in self._list_schemas_relations(
+            self.get_odps_client(),
+            [
+                (schema_relation.database, schema_relation.schema)
+                for schema_relation in cache_schemas
+            ],
+        ):
+            self.cache.add(relation)
+
+        # Schemas without relations are recorded too, so later lookups know
+        # they were listed.
+        self.cache.update_schemas(
+            {(relation.database, relation.schema) for relation in cache_schemas if relation.schema}
+        )
+
     @classmethod
     def quote(cls, identifier):
         return "`{}`".format(identifier)
@@ -284,31 +700,124 @@ class MaxComputeAdapter(SQLAdapter):
         database = database.split(".")[0]
         database = database.strip("`")
         res = [schema.name for schema in self.get_odps_client().list_schemas(database)]
+        with self._schema_state_lock:
+            self._listed_schemas[database.lower()] = {name.lower() for name in res}
 
         logger.debug(f"list_schemas: {res}")
         return res
 
+    def _schema_changed(self, database: str, schema: str, exists: bool) -> None:
+        """Record a schema created or dropped by this process.
+
+        Its existence is eventually consistent, so the next check polls
+        the server instead of trusting listings.
+        """
+        key = (database.strip("`").lower(), schema.strip("`").lower())
+        with self._schema_state_lock:
+            self._changed_schemas[key] = (exists, False)
+            listed = self._listed_schemas.get(key[0])
+            if listed is not None:
+                if exists:
+                    listed.add(key[1])
+                else:
+                    listed.discard(key[1])
+
     def check_schema_exists(self, database: str, schema: str) -> bool:
         database = database.strip("`")
         schema = schema.strip("`")
-        time.sleep(10)
-        schema_exist = self.get_odps_client().exist_schema(schema, database)
+        key = (database.lower(), schema.lower())
+        with self._schema_state_lock:
+            changed = self._changed_schemas.get(key)
+        if changed is not None:
+            expected, confirmed = changed
+            schema_exist = (
+                expected if confirmed else self._wait_for_schema(database, schema, expected)
+            )
+        elif self.cache.get_relations(database, schema):
+            schema_exist = True
+        else:
+            with self._schema_state_lock:
+                listed = self._listed_schemas.get(key[0])
+            if listed is None:
+                self.list_schemas(database)
+                with self._schema_state_lock:
+                    listed = self._listed_schemas.get(key[0], set())
+            schema_exist = key[1] in listed
         logger.debug(f"check_schema_exists: {database}.{schema}, answer is {schema_exist}")
         return schema_exist
 
+    def _wait_for_schema(self, database: str, schema: str, expected: bool) -> bool:
+        """Poll until a schema created or dropped by this process is seen as such."""
+
+        def check() -> bool:
+            schema_exist = self.get_odps_client().exist_schema(schema, database)
+            if schema_exist != expected:
+                raise _SchemaStateNotVisible()
+            return schema_exist
+
+        try:
+            schema_exist = call_with_retry(
+                check,
+                self._wait_policy("schema_visible"),
+                exceptions=(_SchemaStateNotVisible,),
+                call_site="schema_visible",
+            )
+        except _SchemaStateNotVisible:
+            return not expected
+        with self._schema_state_lock:
+            self._changed_schemas[(database.lower(), schema.lower())] = (expected, True)
+        return schema_exist
+
+    def _use_information_schema_catalog(self) -> bool:
+        if self._information_schema_catalog_failed:
+            return False
+        return self.config.credentials.catalog_mode == "information_schema"
+
+    def _get_catalog_from_information_schema(
+        self, scopes: List[Dict[str, Any]], used_schemas: FrozenSet[Tuple[str, str]]
+    ) -> Optional["agate.Table"]:
+        """Fetch the catalog with one query on SYSTEM_CATALOG.INFORMATION_SCHEMA.
+
+        Return None when the query fails (e.g. no tenant-level catalog access),
+        so the caller falls back to reloading table metadata one by one.
+        """
+        if not scopes:
+            return None
+        try:
+            table = self.execute_macro(
+                INFORMATION_SCHEMA_CATALOG_MACRO_NAME, kwargs={"scopes": scopes}
+            )
+        except (DbtRuntimeError, ODPSError) as e:
+            logger.warning(
+                f"Failed to read the catalog from information schema, "
+                f"falling back to table metadata: {str(e)}"
+            )
+            self._information_schema_catalog_failed = True
+            return None
+        return self._catalog_filter_table(normalize_column_types(table), used_schemas)
+
     def _get_one_catalog(
         self,
         information_schema: InformationSchema,
         schemas: Set[str],
         used_schemas: FrozenSet[Tuple[str, str]],
     ) -> "agate.Table":
-        relations = []
-        for schema in schemas:
-            results = self.get_odps_client().list_tables(schema=schema)
-            for odps_table in results:
-                relation = MaxComputeRelation.from_odps_table(odps_table)
-                relations.append(relation)
-        return self._get_one_catalog_by_relations(information_schema, relations, used_schemas)
+        if self._use_information_schema_catalog():
+            # All projects share SYSTEM_CATALOG.INFORMATION_SCHEMA, so the
+            # project of each schema has to be recovered from used_schemas.
+            scopes = schema_scopes(
+                (database, schema)
+                for database, schema in used_schemas
+                if database and schema and schema.lower() in schemas
+            )
+            results = self._get_catalog_from_information_schema(scopes, used_schemas)
+            if results is not None:
+                return results
+
+        relations = self._list_schemas_relations(
+            self.get_odps_client(), [(None, schema) for schema in schemas]
+        )
+        return self._get_one_catalog_by_relations_from_metadata(relations, used_schemas)
 
     def _get_one_catalog_by_relations(
         self,
@@ -316,60 +825,27 @@ class MaxComputeAdapter(SQLAdapter):
         relations: List[MaxComputeRelation],
         used_schemas: FrozenSet[Tuple[str, str]],
     ) -> "agate.Table":
-        sql_column_names = [
-            "table_database",
-            "table_schema",
-            "table_name",
-            "table_type",
-            "table_comment",
-            "column_name",
-            "column_type",
-            "column_index",
-            "column_comment",
-            "table_owner",
-        ]
-
-        sql_rows = []
-
-        for relation in relations:
-            odps_table = self.get_odps_table_by_relation(relation, 10)
-            table_database = relation.project
-            table_schema = relation.schema
-            table_name = relation.table
-
-            if not odps_table:
-                continue
+        if self._use_information_schema_catalog():
+            results = self._get_catalog_from_information_schema(
+                relation_scopes(relations), used_schemas
+            )
+            if results is not None:
+                return results
 
-            if odps_table.is_virtual_view:
-                table_type = "VIEW"
-            elif odps_table.is_materialized_view:
-                table_type = "MATERIALIZED_VIEW"
-            else:
-                table_type = "TABLE"
-            table_comment = odps_table.comment
-            table_owner = odps_table.owner
-            column_index = 1
-            for column in odps_table.table_schema.simple_columns:
-                column_name = column.name
-                column_type = column.type.name
-                column_comment = column.comment
-                sql_rows.append(
-                    (
-                        table_database,
-                        table_schema,
-                        table_name,
-                        table_type,
-                        table_comment,
-                        column_name,
-                        column_type,
-                        column_index,
-                        column_comment,
-                        table_owner,
-                    )
-                )
-                column_index += 1
+        return self._get_one_catalog_by_relations_from_metadata(relations, used_schemas)
 
-        table_instance = Table(sql_rows, column_names=sql_column_names)
+    def _get_one_catalog_by_relations_from_metadata(
+        self,
+        relations: List[MaxComputeRelation],
+        used_schemas: FrozenSet[Tuple[str, str]],
+    ) -> "agate.Table":
+        builder = MaxComputeCatalogBuilder(
+            self.get_odps_client(),
+            max_workers=self._metadata_threads(),
+            metadata_cache=self._metadata_cache(),
+            wait_policy=self._wait_policy("table_visible"),
+        )
+        table_instance = builder.build(relations)
         results = self._catalog_filter_table(table_instance, used_schemas)
         return results
 
@@ -402,15 +878,42 @@ class MaxComputeAdapter(SQLAdapter):
 
     @available.parse(lambda *a, **k: [])
     def get_column_schema_from_query(self, sql: str) -> List[MaxComputeColumn]:
-        """Get a list of the Columns with names and data types from the given sql."""
-        _, cursor = self.connections.add_select_query(sql)
-        columns = [
-            self.Column.create(column_name, column_type_code)
-            # https://peps.python.org/pep-0249/#description
-            for column_name, column_type_code, *_ in cursor.description
-        ]
+        """Get a list of the Columns with names and data types from the given sql.
+
+        Each distinct query (and set of `set` statements) is probed once per
+        invocation, later calls are answered from the probe cache.
+        """
+        key = probe_key(sql)
+        columns = self._probe_cache.get(key)
+        if columns is not None:
+            logger.debug(f"Schema probe cache hit: {self._probe_cache.stats()}")
+            return columns
+        columns = self._explain_column_schema(sql)
+        if columns is None:
+            _, cursor = self.connections.add_select_query(sql)
+            columns = [
+                self.Column.create(column_name, column_type_code)
+                # https://peps.python.org/pep-0249/#description
+                for column_name, column_type_code, *_ in cursor.description
+            ]
+        self._probe_cache.put(key, columns)
+        logger.debug(f"Schema probe cache miss: {self._probe_cache.stats()}")
         return columns
 
+    def _explain_column_schema(self, sql: str) -> Optional[List[MaxComputeColumn]]:
+        """Columns of a query read from its EXPLAIN plan when the profile sets
+        `schema_inference: explain`, None when disabled or unavailable."""
+        if self.config.credentials.schema_inference != "explain":
+            return None
+        try:
+            schema = explain_query_schema(self.get_odps_client(), sql)
+        except Exception as e:
+            logger.debug(f"Schema inference by explain failed, running the query instead: {e}")
+            return None
+        if schema is None:
+            return None
+        return [self.Column.create(name, data_type) for name, data_type in schema]
+
     def timestamp_add_sql(self, add_to: str, number: int = 1, interval: str = "hour") -> str:
         return f"dateadd({add_to}, {number}, '{interval}')"
 
@@ -450,16 +953,43 @@ class MaxComputeAdapter(SQLAdapter):
         macro_resolver: Optional[MacroResolverProtocol] = None,
     ) -> Tuple[Optional[AdapterResponse], FreshnessResponse]:
 
-        table = self.get_odps_table_by_relation(source)
+        # Data modification times change without DDL, so never serve them from the cache.
+        table = self.get_odps_table_by_relation(source, use_cache=False)
+        return None, self._freshness_from_table(table)
+
+    def calculate_freshness_from_metadata_batch(
+        self,
+        sources: List[MaxComputeRelation],
+        macro_resolver: Optional[MacroResolverProtocol] = None,
+    ) -> Tuple[List[Optional[AdapterResponse]], Dict[BaseRelation, FreshnessResponse]]:
+        """Reload the tables of all sources concurrently and compute their freshness.
+
+        Sources whose table does not exist get no FreshnessResponse.
+        """
+        loader = TableMetadataLoader(
+            self.get_odps_client(), wait_policy=self._wait_policy("table_visible")
+        )
+        tables = map_concurrently(loader.reload, sources, self._metadata_threads())
+        freshness_responses: Dict[BaseRelation, FreshnessResponse] = {}
+        for source, table in zip(sources, tables):
+            if table is not None:
+                freshness_responses[source] = self._freshness_from_table(table)
+        logger.debug(
+            f"Calculated freshness of {len(freshness_responses)}/{len(sources)} sources "
+            "from metadata"
+        )
+        return [], freshness_responses
+
+    @staticmethod
+    def _freshness_from_table(table: odps.models.Table) -> FreshnessResponse:
         max_loaded_at = table.last_data_modified_time
         max_loaded_at = max_loaded_at.replace(tzinfo=pytz.UTC)
         snapshot = datetime.now(tz=pytz.UTC)
-        freshness = FreshnessResponse(
+        return FreshnessResponse(
             max_loaded_at=max_loaded_at,
             snapshotted_at=snapshot,
             age=(snapshot - max_loaded_at).total_seconds(),
         )
-        return None, freshness
 
     @available.parse_none
     def load_dataframe(
@@ -486,22 +1016,22 @@ class MaxComputeAdapter(SQLAdapter):
             dtype=np.dtype(object),
         )
         logger.debug(f"Load csv to table {database}.{schema}.{table_name}")
-        # make sure target table exist
-        for i in range(10):
-            try:
-                self.get_odps_client().write_table(
-                    table_name,
-                    pd_dataframe,
-                    project=database,
-                    schema=schema,
-                    create_table=False,
-                    create_partition=False,
-                )
-                break
-            except ODPSError:
-                logger.info(f"Table {database}.{schema}.{table_name} does not exist, retrying...")
-                time.sleep(10)
-                continue
+        # The seed table was created right before, wait until it is visible.
+        call_with_retry(
+            lambda: self.get_odps_client().write_table(
+                table_name,
+                pd_dataframe,
+                project=database,
+                schema=schema,
+                create_table=False,
+                create_partition=False,
+            ),
+            self._wait_policy("seed_table_visible"),
+            exceptions=(ODPSError,),
+            # Permission, quota or schema errors will not go away by waiting
+            condition=is_table_not_found,
+            call_site="seed_table_visible",
+        )
 
     ###
     # Methods about grants
@@ -629,8 +1159,13 @@ class MaxComputeAdapter(SQLAdapter):
     @available
     def add_comment(self, relation: MaxComputeRelation, comment: str) -> str:
         """
-        Add comment to a relation.
+        Add comment to a relation, or return "" when it already has this comment.
         """
+        table = self._load_table_metadata(relation)
+        if table is not None and (table.comment or "") == (comment or ""):
+            logger.debug(f"The comment of {relation.render()} does not need to be modified.")
+            return ""
+        self.invalidate_table_metadata(relation)
         if relation.is_table:
             sql = f"ALTER TABLE {relation.database}.{relation.schema}.{relation.identifier} SET COMMENT {quote_string(comment)};"
             return sql
@@ -650,53 +1185,131 @@ class MaxComputeAdapter(SQLAdapter):
         """
         Add comment to column.
         """
-        table = self.get_odps_table_by_relation(relation)
-        if table is not None:
-            for column in table.table_schema.columns:
-                if column.name == column_name and column.comment != comment:
-                    if relation.is_table:
-                        sql = f"ALTER TABLE {relation.database}.{relation.schema}.{relation.identifier} CHANGE COLUMN {quote_ref(column_name)} COMMENT {quote_string(comment)};"
-                        self.run_raw_sql(sql, None)
-                    if relation.is_view:
-                        sql = f"ALTER VIEW {relation.database}.{relation.schema}.{relation.identifier} CHANGE COLUMN {quote_ref(column_name)} COMMENT {quote_string(comment)};"
-                        self.run_raw_sql(sql, None)
-                    if relation.is_materialized_view:
-                        raise DbtRuntimeError("Unsupported set comment to materialized view. ")
-                else:
-                    logger.debug(
-                        f"The comments for column {column_name} do not need to be modified because the same comments already exist."
-                    )
+        self.alter_column_comments(relation, {column_name: {"description": comment}})
         return ""
 
+    def _column_comment_sql(self, relation: MaxComputeRelation, column_name: str, comment: str):
+        if relation.is_materialized_view:
+            raise DbtRuntimeError("Unsupported set comment to materialized view. ")
+        kind = "VIEW" if relation.is_view else "TABLE"
+        name = f"{relation.database}.{relation.schema}.{relation.identifier}"
+        return (
+            f"ALTER {kind} {name} CHANGE COLUMN {quote_ref(column_name)} "
+            f"COMMENT {quote_string(comment)};"
+        )
+
+    @available
+    def alter_column_comments(
+        self, relation: MaxComputeRelation, column_dict: Dict[str, Dict[str, Any]]
+    ) -> int:
+        """
+        Set the comments of the documented columns of a relation.
+
+        The desired comments are compared with one metadata snapshot of the
+        relation, and the changed ones are applied by a single script. Returns
+        the number of changed comments.
+        """
+        table = self._load_table_metadata(relation)
+        if table is None:
+            return 0
+        current = {column.name: column.comment or "" for column in table.table_schema.columns}
+        statements = []
+        for column_name, column in column_dict.items():
+            comment = column.get("description") or ""
+            if column_name not in current:
+                continue
+            if current[column_name] == comment:
+                logger.debug(
+                    f"The comments for column {column_name} do not need to be modified "
+                    "because the same comments already exist."
+                )
+                continue
+            statements.append(self._column_comment_sql(relation, column_name, comment))
+
+        if statements:
+            # The connection submits in script mode: one job for all columns
+            self.execute("\n".join(statements))
+            self.invalidate_table_metadata(relation)
+        logger.info(
+            f"Changed {len(statements)} of {len(column_dict)} column comments "
+            f"on {relation.render()}"
+        )
+        return len(statements)
+
+    @available
+    def fuse_sql_script(self, statements: List[str]) -> str:
+        """
+        Join the steps of a materialization into one MaxCompute script.
+
+        The `set` statements leading each step are hoisted in front of the
+        script, where the connection submits them as hints of the single
+        instance. Empty steps are skipped and every step ends with `;`.
+        """
+        settings: Dict[str, str] = {}
+        bodies = []
+        for statement in statements:
+            result = SettingParser.parse(statement or "")
+            settings.update(result.settings)
+            body = result.remaining_query.strip()
+            if not body:
+                continue
+            bodies.append(body if body.endswith(";") else body + ";")
+        header = "".join(f"set {key}={value};\n" for key, value in settings.items())
+        return header + "\n".join(bodies)
+
+    @available
+    def batch_hook_sql(self, hooks: List[str]) -> List[str]:
+        """
+        Group the rendered SQL hooks of a phase into as few scripts as possible.
+
+        Consecutive hooks with the same `set` statements share one script, so
+        that hoisting the settings never applies them to another hook. All
+        hooks run one by one when any of them returns data.
+        """
+        if any(returns_rows(SettingParser.parse(hook).remaining_query) for hook in hooks):
+            return list(hooks)
+        groups: List[Tuple[Dict[str, str], List[str]]] = []
+        for hook in hooks:
+            settings = SettingParser.parse(hook).settings
+            if groups and groups[-1][0] == settings:
+                groups[-1][1].append(hook)
+            else:
+                groups.append((settings, [hook]))
+        logger.debug(f"Batched {len(hooks)} hooks into {len(groups)} scripts")
+        return [self.fuse_sql_script(group) for _, group in groups]
+
     @available
     def get_relations_by_pattern(
         self, schema_pattern: str, table_pattern: str, exclude: str, database: str
     ) -> List[MaxComputeRelation]:
         o = self.get_odps_client()
-        results = []
 
         # 转换模式为正则表达式
-        schema_regex = self.sql_like_to_regex(schema_pattern)
-        table_regex = self.sql_like_to_regex(table_pattern)
-        exclude_regex = self.sql_like_to_regex(exclude)
+        schema_regex = compile_like_pattern(schema_pattern)
+        table_regex = compile_like_pattern(table_pattern)
+        exclude_regex = compile_like_pattern(exclude) if exclude else None
 
         # 获取 schemas
-        schemas = []
-        for schema in o.list_schemas(database):
-            if re.fullmatch(schema_regex, schema.name):
-                schemas.append(schema)
-        logger.debug(f"Found {len(schemas)} schemas matching {schema_regex}")
+        schemas = [
+            schema.name
+            for schema in o.list_schemas(database)
+            if schema_regex.fullmatch(schema.name)
+        ]
+        logger.debug(f"Found {len(schemas)} schemas matching {schema_regex.pattern}")
 
         # 获取 tables
-        for schema in schemas:
-            for table in o.list_tables(project=database, schema=schema.name):
-                if re.fullmatch(table_regex, table.name):
-                    if exclude and re.fullmatch(exclude_regex, table.name):
-                        continue
-                    table = self.get_relation(database, schema.name, table.name)
-                    if table:
-                        results.append(table)
-        logger.debug(f"Found {len(results)} tables matching {schema_regex}.{table_regex}")
+        def matches(name: str) -> bool:
+            if not table_regex.fullmatch(name):
+                return False
+            return exclude_regex is None or not exclude_regex.fullmatch(name)
+
+        prefix = like_pattern_prefix(table_pattern)
+        results = self._list_schemas_relations(
+            o, [(database, schema) for schema in schemas], prefix=prefix, name_filter=matches
+        )
+        logger.debug(
+            f"Found {len(results)} tables matching {schema_regex.pattern}.{table_regex.pattern}"
+        )
 
         return results
 
@@ -705,20 +1318,16 @@ class MaxComputeAdapter(SQLAdapter):
         self, schema: str, prefix: str, exclude: str, database: str
     ) -> List[MaxComputeRelation]:
         o = self.get_odps_client()
-        exclude_regex = self.sql_like_to_regex(exclude)
-        results = []
-        for table in o.list_tables(project=database, schema=schema, prefix=prefix):
-            if exclude and re.fullmatch(exclude_regex, table.name):
-                continue
-            table = self.get_relation(database, schema, table.name)
-            if table:
-                results.append(table)
+        exclude_regex = compile_like_pattern(exclude) if exclude else None
+        results = self._list_schema_relations(
+            o,
+            database,
+            schema,
+            prefix=prefix,
+            name_filter=lambda name: exclude_regex is None or not exclude_regex.fullmatch(name),
+        )
         logger.debug(f"Get tables by pattern({schema}.{prefix}) : {results}")
         return results
 
     def sql_like_to_regex(self, pattern: str) -> str:
-        if not pattern:
-            return "^$"
-        regex = re.escape(pattern)
-        regex = regex.replace("%", ".*").replace("_", ".")
-        return f"^{regex}$"
+        return like_pattern_to_regex(pattern)
@@ -0,0 +1,95 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from typing import Callable, Iterable, List, Optional, TypeVar
+
+from dbt.adapters.events.logging import AdapterLogger
+from odps import ODPS
+from odps.errors import NoSuchObject
+from odps.models import Table
+
+from dbt.adapters.maxcompute.metadata_cache import MetadataCache
+from dbt.adapters.maxcompute.relation import MaxComputeRelation
+from dbt.adapters.maxcompute.utils import DEFAULT_WAIT_POLICIES, WaitPolicy, call_with_retry
+
+logger = AdapterLogger("MaxCompute")
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def map_concurrently(func: Callable[[T], R], items: Iterable[T], max_workers: int) -> List[R]:
+    """Apply `func` to every item through a bounded thread pool.
+
+    Results are returned in the order the items were submitted. The first
+    exception raised by `func` is propagated to the caller.
+    """
+    items = list(items)
+    if max_workers <= 1 or len(items) <= 1:
+        return [func(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as pool:
+        return list(pool.map(func, items))
+
+
+class TableMetadataLoader:
+    """Reload ODPS table metadata for many relations concurrently.
+
+    The ODPS client is shared by all worker threads, so the loader can be
+    used outside of the dbt connection that created it. With a metadata
+    cache, tables whose cached entry is still valid are not reloaded and
+    reloaded tables are written back to the cache.
+    """
+
+    def __init__(
+        self,
+        odps: ODPS,
+        max_workers: int = 1,
+        retry_times: int = 1,
+        metadata_cache: Optional[MetadataCache] = None,
+        wait_policy: Optional[WaitPolicy] = None,
+    ):
+        self.odps = odps
+        self.max_workers = max(1, max_workers)
+        self.retry_times = max(1, retry_times)
+        self.metadata_cache = metadata_cache
+        self.wait_policy = replace(
+            wait_policy or DEFAULT_WAIT_POLICIES["table_visible"], max_attempts=self.retry_times
+        )
+
+    def load(self, relation: MaxComputeRelation) -> Optional[Table]:
+        if self.metadata_cache is not None:
+            cached = self.metadata_cache.cached_table(
+                relation.project, relation.schema, relation.identifier
+            )
+            if cached is not None:
+                return cached
+        table = self.reload(relation)
+        if table is not None and self.metadata_cache is not None:
+            self.metadata_cache.store_table(relation.project, relation.schema, table)
+        return table
+
+    def reload(self, relation: MaxComputeRelation) -> Optional[Table]:
+        """Reload the table of a relation, None when it does not exist.
+
+        Sometimes a newly created table is judged as not existing, so
+        NoSuchObject is retried as the wait policy allows.
+        """
+
+        def reload_table() -> Table:
+            table = self.odps.get_table(relation.identifier, relation.project, relation.schema)
+            table.reload()
+            return table
+
+        try:
+            return call_with_retry(
+                reload_table,
+                self.wait_policy,
+                exceptions=(NoSuchObject,),
+                call_site="table_visible",
+            )
+        except NoSuchObject:
+            logger.warning(f"Table {relation.render()} does not exist.")
+            return None
+
+    def load_all(self, relations: Iterable[MaxComputeRelation]) -> List[Optional[Table]]:
+        """Reload every relation; the result list is aligned with the input order."""
+        return map_concurrently(self.load, relations, self.max_workers)
@@ -0,0 +1,210 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from dbt.adapters.events.logging import AdapterLogger
+from odps.models import Table
+from odps.models.table import TableSchema
+
+logger = AdapterLogger("MaxCompute")
+
+METADATA_CACHE_FILE_NAME = "maxcompute_metadata.db"
+
+
+def metadata_version(table: Table) -> Optional[str]:
+    """The token a cache entry is validated against.
+
+    The token is built from the creation and the last DDL times, so that a
+    recreated table and DDL run outside dbt (added columns, changed comments)
+    both invalidate the entry. They are read through `_getattr` so that
+    listed tables are not reloaded; only an extended `list_tables` carries
+    the DDL time. None means the version is not known without a reload.
+    """
+    creation_time = table._getattr("creation_time")
+    ddl_time = table._getattr("last_meta_modified_time")
+    if not isinstance(creation_time, datetime) or not isinstance(ddl_time, datetime):
+        return None
+    return f"{int(creation_time.timestamp())}:{int(ddl_time.timestamp())}"
+
+
+def table_metadata(table: Table) -> Dict[str, Any]:
+    """Serialize the parts of a reloaded table the adapter reads back from the cache."""
+    columns = []
+    for column in table.table_schema.simple_columns:
+        columns.append({"name": column.name, "type": column.type.name, "comment": column.comment})
+    partitions = []
+    for partition in table.table_schema._partitions or []:
+        partitions.append(
+            {
+                "name": partition.name,
+                "type": partition.type.name,
+                "comment": partition.comment,
+                "generated": bool(getattr(partition, "_generate_expression", None)),
+            }
+        )
+    if table.is_virtual_view:
+        table_type = "view"
+    elif table.is_materialized_view:
+        table_type = "materialized_view"
+    else:
+        table_type = "table"
+    return {
+        "type": table_type,
+        "comment": table.comment,
+        "owner": table.owner,
+        "columns": columns,
+        "partitions": partitions,
+    }
+
+
+class CachedTable:
+    """Stand-in for a reloaded `odps.models.Table`, rebuilt from a cache entry.
+
+    Only exposes the attributes the adapter reads from reloaded tables.
+    """
+
+    def __init__(self, name: str, metadata: Dict[str, Any]):
+        self.name = name
+        self.comment = metadata["comment"]
+        self.owner = metadata["owner"]
+        self.is_virtual_view = metadata["type"] == "view"
+        self.is_materialized_view = metadata["type"] == "materialized_view"
+        columns = [
+            TableSchema.TableColumn(name=c["name"], type=c["type"], comment=c["comment"])
+            for c in metadata["columns"]
+        ]
+        partitions = []
+        for p in metadata["partitions"]:
+            partition = TableSchema.TablePartition(
+                name=p["name"], type=p["type"], comment=p["comment"]
+            )
+            if p["generated"]:
+                # Only the presence of the expression is checked by the adapter.
+                partition._generate_expression = True
+            partitions.append(partition)
+        self.table_schema = TableSchema(columns=columns, partitions=partitions)
+
+
+class MetadataCache:
+    """Table metadata persisted in SQLite, shared across dbt invocations.
+
+    Entries are keyed by project/schema/table and are only returned when the
+    caller presents the same version token that was stored with them. The
+    versions seen while listing schemas in this invocation are kept in memory,
+    so later lookups of a listed table need no ODPS call at all. Entries older
+    than `max_age` seconds, and entries of tables that disappeared from a
+    schema listing, are evicted.
+    """
+
+    def __init__(self, path: str, max_age: int = 7 * 24 * 3600):
+        self.path = path
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._versions: Dict[Tuple[str, str, str], str] = {}
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # Several dbt processes may share the file, so wait on locks instead of failing.
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "create table if not exists table_metadata ("
+                " project text not null, schema text not null, name text not null,"
+                " version text not null, payload text not null, stored_at real not null,"
+                " primary key (project, schema, name))"
+            )
+        self.evict_expired()
+
+    @staticmethod
+    def _key(project: str, schema: str, name: str):
+        return project.lower(), (schema or "default").lower(), name.lower()
+
+    def get(self, project: str, schema: str, name: str, version: Optional[str]) -> Optional[Dict]:
+        if version is None:
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "select version, payload from table_metadata"
+                " where project = ? and schema = ? and name = ?",
+                self._key(project, schema, name),
+            ).fetchone()
+        if row is None or row[0] != version:
+            return None
+        return json.loads(row[1])
+
+    def put(
+        self, project: str, schema: str, name: str, version: Optional[str], payload: Dict
+    ) -> None:
+        if version is None:
+            return
+        with self._lock, self._conn:
+            self._conn.execute(
+                "insert or replace into table_metadata values (?, ?, ?, ?, ?, ?)",
+                self._key(project, schema, name) + (version, json.dumps(payload), time.time()),
+            )
+
+    def observe(self, project: str, schema: str, table: Table) -> None:
+        """Remember the version of a table returned by `list_tables`."""
+        version = metadata_version(table)
+        key = self._key(project, schema, table.name)
+        with self._lock:
+            if version is None:
+                self._versions.pop(key, None)
+            else:
+                self._versions[key] = version
+
+    def cached_table(self, project: str, schema: str, name: str) -> Optional[CachedTable]:
+        """The cached metadata of a table observed in this invocation, if still valid."""
+        with self._lock:
+            version = self._versions.get(self._key(project, schema, name))
+        metadata = self.get(project, schema, name, version)
+        if metadata is None:
+            return None
+        return CachedTable(name, metadata)
+
+    def store_table(self, project: str, schema: str, table: Table) -> None:
+        """Persist the metadata of a reloaded table."""
+        version = metadata_version(table)
+        if version is None:
+            return
+        self.put(project, schema, table.name, version, table_metadata(table))
+        with self._lock:
+            self._versions[self._key(project, schema, table.name)] = version
+
+    def invalidate(self, project: str, schema: str, name: str) -> None:
+        with self._lock:
+            self._versions.pop(self._key(project, schema, name), None)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "delete from table_metadata where project = ? and schema = ? and name = ?",
+                self._key(project, schema, name),
+            )
+
+    def retain_schema(self, project: str, schema: str, names: Iterable[str]) -> None:
+        """Evict the entries of a schema whose tables are not in `names` any more."""
+        project, schema, _ = self._key(project, schema, "")
+        existing = {name.lower() for name in names}
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                "select name from table_metadata where project = ? and schema = ?",
+                (project, schema),
+            ).fetchall()
+            dropped = [(project, schema, row[0]) for row in rows if row[0] not in existing]
+            self._conn.executemany(
+                "delete from table_metadata where project = ? and schema = ? and name = ?",
+                dropped,
+            )
+        if dropped:
+            logger.debug(f"Evicted {len(dropped)} dropped tables of {project}.{schema}")
+
+    def evict_expired(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "delete from table_metadata where stored_at < ?", (time.time() - self.max_age,)
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,65 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from dbt.adapters.maxcompute.column import MaxComputeColumn
+from dbt.adapters.maxcompute.relation import MaxComputeRelation
+from dbt.adapters.maxcompute.setting_parser import SettingParser
+
+ProbeKey = Tuple[Tuple[Tuple[str, str], ...], str]
+
+
+def probe_key(sql: str) -> ProbeKey:
+    """Key a schema probe by its `set` statements and whitespace-normalized query."""
+    result = SettingParser.parse(sql)
+    query = " ".join(result.remaining_query.split()).rstrip(";").strip()
+    return tuple(sorted(result.settings.items())), query
+
+
+class SchemaProbeCache:
+    """Result schemas of the queries probed during an invocation.
+
+    The same model SQL is probed by the table DDL, the INSERT column list,
+    contract enforcement and snapshot checks; each probe is a MaxCompute job.
+    Entries whose query mentions a relation are dropped when the adapter
+    invalidates that relation, so a probe never outlives a DDL change of the
+    tables it reads.
+    """
+
+    def __init__(self, max_size: int = 512):
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[ProbeKey, List[MaxComputeColumn]]" = OrderedDict()
+        self.hits = 0
+        self.probes = 0
+
+    def get(self, key: ProbeKey) -> Optional[List[MaxComputeColumn]]:
+        with self._lock:
+            columns = self._entries.get(key)
+            if columns is None:
+                self.probes += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return list(columns)
+
+    def put(self, key: ProbeKey, columns: List[MaxComputeColumn]) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = list(columns)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, relation: MaxComputeRelation) -> None:
+        name = (relation.identifier or "").lower()
+        if not name:
+            return
+        with self._lock:
+            for key in [key for key in self._entries if name in key[1].lower()]:
+                del self._entries[key]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "probes": self.probes, "size": len(self._entries)}
@@ -63,15 +63,12 @@ class MaxComputeRelation(BaseRelation):
         return MaxComputeInformationSchema.from_relation(self, identifier)
 
     @classmethod
-    def from_odps_table(cls, table: Table):
+    def from_odps_table(cls, table: Table, table_type: Optional[RelationType] = None):
         schema = table.get_schema()
         schema = schema.name if schema else "default"
 
-        table_type = RelationType.Table
-        if table.is_virtual_view:
-            table_type = RelationType.View
-        if table.is_materialized_view:
-            table_type = RelationType.MaterializedView
+        if table_type is None:
+            table_type = cls.relation_type_of(table)
 
         return cls.create(
             database=table.project.name,
@@ -80,6 +77,31 @@ class MaxComputeRelation(BaseRelation):
             type=table_type,
         )
 
+    @classmethod
+    def relation_type_of(cls, table: Table) -> RelationType:
+        # Reads metadata fields, which reloads tables that are not loaded yet.
+        if table.is_materialized_view:
+            return RelationType.MaterializedView
+        if table.is_virtual_view:
+            return RelationType.View
+        return RelationType.Table
+
+    @classmethod
+    def relation_type_from_listing(cls, table: Table) -> Optional[RelationType]:
+        """Resolve the relation type of a table returned by `list_tables` without reloading it.
+
+        Return None when the listing did not carry the table type.
+        """
+        # _getattr bypasses PyODPS lazy loading, which would reload the table.
+        table_type = table._getattr("type")
+        if table_type in (Table.Type.MANAGED_TABLE, Table.Type.EXTERNAL_TABLE):
+            return RelationType.Table
+        if table_type == Table.Type.VIRTUAL_VIEW:
+            return RelationType.View
+        if table_type == Table.Type.MATERIALIZED_VIEW:
+            return RelationType.MaterializedView
+        return None
+
     @classmethod
     def materialized_view_from_relation_config(
         cls, relation_config: RelationConfig
@@ -0,0 +1,122 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from dbt.adapters.contracts.relation import (
+    RelationConfig,
+    ComponentName,
+)
+from dbt.adapters.maxcompute.relation_configs._base import MaxComputeBaseRelationConfig
+from dbt.adapters.maxcompute.utils import quote_string
+
+# Table properties that cannot be changed by ALTER TABLE ... SET TBLPROPERTIES
+IMMUTABLE_TBLPROPERTIES = frozenset(["transactional", "write.bucket.num"])
+
+
+def normalize_property(value: Any) -> str:
+    """Render a tblproperties value the way MaxCompute stores it, e.g. True as "true"."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+@dataclass(frozen=True, eq=True, unsafe_hash=True)
+class MaxComputeTableConfig(MaxComputeBaseRelationConfig):
+    """The settings of a table or incremental model that can be altered in place."""
+
+    name: str
+    project: str
+    schema: str
+    lifecycle: Optional[int] = None
+    table_comment: Optional[str] = None
+    tblproperties: Optional[Dict[str, str]] = None
+
+    @classmethod
+    def from_dict(cls, config_dict: Dict[str, Any]) -> "MaxComputeTableConfig":
+        kwargs_dict: Dict[str, Any] = {
+            "name": cls._render_part(ComponentName.Identifier, config_dict["name"]),
+            "schema": cls._render_part(ComponentName.Schema, config_dict["schema"]),
+            "project": cls._render_part(ComponentName.Database, config_dict["project"]),
+        }
+        if config_dict.get("table_comment") is not None:
+            kwargs_dict["table_comment"] = config_dict["table_comment"]
+        if config_dict.get("lifecycle") is not None:
+            kwargs_dict["lifecycle"] = int(config_dict["lifecycle"])
+        if config_dict.get("tblproperties") is not None:
+            kwargs_dict["tblproperties"] = {
+                str(k).lower(): normalize_property(v)
+                for k, v in config_dict["tblproperties"].items()
+            }
+
+        table: "MaxComputeTableConfig" = super().from_dict(kwargs_dict)
+        return table
+
+    @classmethod
+    def parse_mc_table(cls, table) -> Dict[str, Any]:
+        schema_obj = table.get_schema()
+        return {
+            "name": table.name,
+            "project": table.project.name,
+            "schema": schema_obj.name if schema_obj else "default",
+            "lifecycle": table.lifecycle if table.lifecycle and table.lifecycle > 0 else None,
+            "table_comment": table.comment or None,
+            "tblproperties": dict(table.table_properties or {}),
+        }
+
+    @classmethod
+    def parse_relation_config(cls, relation_config: RelationConfig) -> Dict[str, Any]:
+        config_dict = {
+            "name": relation_config.identifier,
+            "schema": relation_config.schema,
+            "project": relation_config.database,
+        }
+        for item in ("lifecycle", "table_comment", "tblproperties"):
+            if item in relation_config.config:
+                config_dict[item] = relation_config.config[item]
+        persist_docs = relation_config.config.get("persist_docs") or {}
+        if persist_docs.get("relation") and getattr(relation_config, "description", None):
+            # persist_docs sets the comment from the description after every
+            # run, so it takes precedence over `table_comment`
+            config_dict.pop("table_comment", None)
+        return config_dict
+
+    def changes_from(self, existing: "MaxComputeTableConfig") -> Dict[str, Any]:
+        """Settings of this config that differ from `existing`, as (old, new) pairs.
+
+        Settings left unset in this config are ignored, so that an unset value
+        never drifts against the MaxCompute default.
+        """
+        changes: Dict[str, Any] = {}
+        if self.lifecycle is not None and self.lifecycle != existing.lifecycle:
+            changes["lifecycle"] = (existing.lifecycle, self.lifecycle)
+        if self.table_comment is not None and self.table_comment != existing.table_comment:
+            changes["table_comment"] = (existing.table_comment, self.table_comment)
+        # Keys and values are compared case-insensitively: MaxCompute stores
+        # "transactional"="true" whatever the case of the config
+        existing_props = {
+            key.lower(): value.lower() for key, value in (existing.tblproperties or {}).items()
+        }
+        props = {
+            key: (existing_props.get(key), value)
+            for key, value in (self.tblproperties or {}).items()
+            if key not in IMMUTABLE_TBLPROPERTIES and existing_props.get(key) != value.lower()
+        }
+        if props:
+            changes["tblproperties"] = props
+        return changes
+
+    @staticmethod
+    def alter_table_sql(relation_name: str, changes: Dict[str, Any]) -> List[str]:
+        statements = []
+        if "lifecycle" in changes:
+            statements.append(
+                f"ALTER TABLE {relation_name} SET LIFECYCLE {changes['lifecycle'][1]};"
+            )
+        if "tblproperties" in changes:
+            props = ", ".join(
+                f'"{key}"="{new}"' for key, (_, new) in changes["tblproperties"].items()
+            )
+            statements.append(f"ALTER TABLE {relation_name} SET TBLPROPERTIES({props});")
+        if "table_comment" in changes:
+            comment = quote_string(changes["table_comment"][1])
+            statements.append(f"ALTER TABLE {relation_name} SET COMMENT {comment};")
+        return statements
@@ -0,0 +1,82 @@
+import re
+from typing import List, Optional, Tuple
+
+from dbt.adapters.events.logging import AdapterLogger
+from odps import ODPS
+
+from dbt.adapters.maxcompute.context import GLOBAL_SQL_HINTS
+from dbt.adapters.maxcompute.setting_parser import SettingParser
+
+logger = AdapterLogger("MaxCompute")
+
+# The final operator of a SELECT plan writes to the client:
+#   FS: output: Screen
+#       schema:
+#         t1.id (bigint) AS id
+#         amount (decimal(10,2))
+_SCREEN_SINK = re.compile(r"FS:\s*output:\s*Screen", re.IGNORECASE)
+_SCHEMA_HEADER = re.compile(r"^\s*schema:\s*$", re.IGNORECASE)
+# A plain or backquoted identifier, the latter may contain spaces and dots
+_NAME = r"(?:`[^`]+`|[^\s`.]+)"
+_SCHEMA_COLUMN = re.compile(
+    rf"^\s*(?:{_NAME}\.)*(?P<name>{_NAME})\s+\((?P<type>.+)\)(?:\s+AS\s+(?P<alias>{_NAME}))?\s*$",
+    re.IGNORECASE,
+)
+
+
+def _indent(line: str) -> int:
+    return len(line) - len(line.lstrip())
+
+
+def parse_explain_schema(plan: str) -> Optional[List[Tuple[str, str]]]:
+    """Output (name, type) pairs of a query, read from its EXPLAIN plan.
+
+    The schema section is made of the lines indented below its header. Returns
+    None when the plan does not describe the rows sent to the client in the
+    expected layout, including when a line of the section cannot be parsed.
+    """
+    sinks = list(_SCREEN_SINK.finditer(plan))
+    if not sinks:
+        return None
+    sink_end = sinks[-1].end()
+    lines = plan[sink_end:].splitlines()
+    for header, line in enumerate(lines):
+        if _SCHEMA_HEADER.match(line):
+            break
+    else:
+        return None
+
+    columns = []
+    header_indent = _indent(lines[header])
+    first = header + 1
+    for line in lines[first:]:
+        if not line.strip() or _indent(line) <= header_indent:
+            break
+        match = _SCHEMA_COLUMN.match(line)
+        if match is None:
+            # A truncated schema would be worse than running the query
+            return None
+        name = match.group("alias") or match.group("name")
+        columns.append((name.strip("`"), match.group("type").strip().lower()))
+    return columns or None
+
+
+def explain_query_schema(odps: ODPS, sql: str) -> Optional[List[Tuple[str, str]]]:
+    """Infer the output schema of `sql` by compiling it, without running it.
+
+    `set` statements in front of the query are passed as hints. Returns None
+    when the plan cannot be parsed, so that the caller can fall back to
+    running the query.
+    """
+    result = SettingParser.parse(sql)
+    hints = dict(GLOBAL_SQL_HINTS)
+    hints.update(result.settings)
+    # EXPLAIN takes a single statement
+    hints.pop("odps.sql.submit.mode", None)
+    query = result.remaining_query.strip().rstrip(";")
+    instance = odps.execute_sql(f"explain {query};", hints=hints)
+    plan = "\n".join(str(text) for text in instance.get_task_results().values())
+    columns = parse_explain_schema(plan)
+    if columns is None:
+        logger.debug(f"Could not read the output schema from the plan of {instance.id}")
+    return columns
@@ -0,0 +1,77 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+from odps.models import Table
+
+from dbt.adapters.maxcompute.relation import MaxComputeRelation
+
+TableKey = Tuple[str, str, str]
+
+
+def table_key(relation: MaxComputeRelation) -> TableKey:
+    return (
+        (relation.project or "").lower(),
+        (relation.schema or "default").lower(),
+        (relation.identifier or "").lower(),
+    )
+
+
+class TableCache:
+    """Bounded in-process cache of reloaded `odps.models.Table` objects.
+
+    Entries are dropped in least recently used order once `max_size` is
+    reached, and are not served any more `ttl` seconds after they were
+    reloaded. A `max_size` of 0 disables the cache. The adapter invalidates
+    the entry of a relation whenever it issues DDL against it.
+    """
+
+    def __init__(
+        self, max_size: int = 256, ttl: float = 300, clock: Callable[[], float] = time.monotonic
+    ):
+        self.max_size = max(0, max_size)
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[TableKey, Tuple[float, Table]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, relation: MaxComputeRelation) -> Optional[Table]:
+        if self.max_size == 0:
+            return None
+        key = table_key(relation)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= self._clock():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, relation: MaxComputeRelation, table: Table) -> None:
+        if self.max_size == 0:
+            return
+        key = table_key(relation)
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl, table)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, relation: MaxComputeRelation) -> None:
+        with self._lock:
+            self._entries.pop(table_key(relation), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
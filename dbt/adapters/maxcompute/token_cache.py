@@ -0,0 +1,240 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from alibabacloud_credentials.models import CredentialModel
+from alibabacloud_credentials_api import ICredentialsProvider
+from dbt.adapters.events.logging import AdapterLogger
+
+logger = AdapterLogger("MaxCompute")
+
+DEFAULT_TOKEN_CACHE_DIR = os.path.join("~", ".dbt", "maxcompute_tokens")
+# Never hand out a token that expires within this many seconds
+EXPIRY_GUARD = 60
+# Refresh in the background at most this long before a token expires
+REFRESH_MARGIN = 300
+# Delay before retrying a failed or premature background refresh
+RETRY_DELAY = 30
+
+
+def auth_key(credentials) -> str:
+    """Identify a credential provider by the auth fields of a profile."""
+    values = {name: getattr(credentials, name) for name in credentials._auth_keys()}
+    payload = json.dumps(values, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class TokenStore:
+    """Encrypted on-disk copies of STS tokens, one file per auth config.
+
+    Tokens are encrypted with the Fernet key of the profile
+    (`token_cache_key`), which is never written next to them, and are not
+    read back once older than `ttl` seconds or about to expire. Requires the
+    optional `cryptography` package (`pip install dbt-maxcompute[token-cache]`).
+    """
+
+    def __init__(self, path: str, ttl: int, key: str):
+        from cryptography.fernet import Fernet
+
+        self._fernet = Fernet(key)
+        self.path = os.path.expanduser(path)
+        self.ttl = ttl
+        os.makedirs(self.path, mode=0o700, exist_ok=True)
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.path, f"{key}.token")
+
+    def load(self, key: str, now: float) -> Optional[Tuple[CredentialModel, float]]:
+        from cryptography.fernet import InvalidToken
+
+        try:
+            with open(self._entry_path(key), "rb") as f:
+                data = json.loads(self._fernet.decrypt(f.read(), ttl=self.ttl))
+        except (OSError, ValueError, InvalidToken):
+            return None
+        expiration = data.pop("expiration")
+        if expiration - EXPIRY_GUARD <= now:
+            return None
+        return CredentialModel(**data), expiration
+
+    def save(self, key: str, credential: CredentialModel, expiration: float) -> None:
+        data = {
+            "access_key_id": credential.access_key_id,
+            "access_key_secret": credential.access_key_secret,
+            "security_token": credential.security_token,
+            "type": credential.type,
+            "provider_name": credential.provider_name,
+            "expiration": expiration,
+        }
+        path = self._entry_path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "wb") as f:
+                f.write(self._fernet.encrypt(json.dumps(data).encode("utf-8")))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.debug(f"Failed to persist MaxCompute token: {e}")
+
+
+def open_token_store(path: Optional[str], ttl: int, key: Optional[str]) -> Optional[TokenStore]:
+    if not key:
+        logger.warning(
+            "`token_cache` requires `token_cache_key` to encrypt the tokens, "
+            "tokens are kept in memory only."
+        )
+        return None
+    try:
+        return TokenStore(path or DEFAULT_TOKEN_CACHE_DIR, ttl, key)
+    except ImportError:
+        logger.warning(
+            "`token_cache` requires the `cryptography` package "
+            "(pip install dbt-maxcompute[token-cache]), tokens are kept in memory only."
+        )
+    except ValueError:
+        logger.warning(
+            "`token_cache_key` is not a valid Fernet key, tokens are kept in memory only."
+        )
+    except OSError as e:
+        logger.warning(
+            f"Failed to open the MaxCompute token cache, tokens are kept in memory only: {e}"
+        )
+    return None
+
+
+class CachedCredentialProvider:
+    """Credential provider shared by every ODPS client of one auth config.
+
+    Wraps an `alibabacloud_credentials` provider so that a token is exchanged
+    once, and then refreshed by a background timer shortly before it
+    expires, instead of by the first request that finds it stale. Tokens
+    obtained through an exchange (`ram_role_arn`, `oidc_role_arn`,
+    `ecs_ram_role`, ...) carry an expiration and can be persisted in a
+    `TokenStore`; static access keys are never written to disk.
+    """
+
+    def __init__(
+        self,
+        provider: ICredentialsProvider,
+        key: str,
+        store: Optional[TokenStore] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self._provider = provider
+        self._key = key
+        self._store = store
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._credential: Optional[CredentialModel] = None
+        self._expiration: Optional[float] = None
+        self._timer: Optional[threading.Timer] = None
+        self.exchanges = 0
+        if store is not None:
+            loaded = store.load(key, clock())
+            if loaded is not None:
+                self._credential, self._expiration = loaded
+                logger.debug("Reusing persisted MaxCompute token")
+                self._schedule(self._refresh_delay())
+
+    def get_credential(self) -> CredentialModel:
+        with self._lock:
+            if self._needs_refresh():
+                self._refresh()
+            return self._credential
+
+    # `CredentialProviderAccount` falls back to the plural form
+    get_credentials = get_credential
+
+    def _needs_refresh(self) -> bool:
+        if self._credential is None:
+            return True
+        return self._expiration is not None and self._expiration - EXPIRY_GUARD <= self._clock()
+
+    def _fetch(self) -> Tuple[CredentialModel, Optional[float]]:
+        credentials = self._provider.get_credentials()
+        credential = CredentialModel(
+            access_key_id=credentials.get_access_key_id(),
+            access_key_secret=credentials.get_access_key_secret(),
+            security_token=credentials.get_security_token(),
+            type=self._provider.get_provider_name(),
+            provider_name=credentials.get_provider_name(),
+        )
+        return credential, credentials.get_expiration()
+
+    def _refresh(self) -> None:
+        """Fetch a token, the caller holds `_lock`."""
+        previous = self._expiration
+        credential, expiration = self._fetch()
+        self.exchanges += 1
+        self._credential, self._expiration = credential, expiration
+        if expiration is None:
+            return
+        if self._store is not None:
+            self._store.save(self._key, credential, expiration)
+        if previous is not None and expiration <= previous:
+            # The underlying provider served its cached token again.
+            self._schedule(RETRY_DELAY)
+        else:
+            self._schedule(self._refresh_delay())
+
+    def _refresh_delay(self) -> float:
+        remaining = self._expiration - self._clock()
+        return max(0.0, remaining - min(REFRESH_MARGIN, remaining / 4))
+
+    def _schedule(self, delay: float) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(delay, self._refresh_in_background)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _refresh_in_background(self) -> None:
+        with self._lock:
+            try:
+                self._refresh()
+            except Exception as e:
+                logger.debug(f"Background refresh of MaxCompute token failed: {e}")
+                if self._expiration is not None and self._expiration > self._clock():
+                    self._schedule(min(RETRY_DELAY, self._expiration - self._clock()))
+
+    def close(self) -> None:
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+
+class TokenCache:
+    """Process-wide credential providers, one per auth config."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._providers: Dict[str, CachedCredentialProvider] = {}
+
+    def provider(self, credentials, provider_factory: Callable[[], ICredentialsProvider]):
+        key = auth_key(credentials)
+        with self._lock:
+            provider = self._providers.get(key)
+            if provider is None:
+                store = None
+                if credentials.token_cache:
+                    store = open_token_store(
+                        credentials.token_cache_path,
+                        credentials.token_cache_ttl,
+                        credentials.token_cache_key,
+                    )
+                provider = CachedCredentialProvider(provider_factory(), key, store=store)
+                self._providers[key] = provider
+            return provider
+
+    def clear(self) -> None:
+        with self._lock:
+            for provider in self._providers.values():
+                provider.close()
+            self._providers.clear()
+
+
+TOKEN_CACHE = TokenCache()
@@ -1,5 +1,12 @@
-import time
 import functools
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, fields, replace
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, Type, TypeVar
+
+from dbt_common.exceptions import DbtConfigError
 
 from odps.errors import ODPSError, NoSuchObject
 
@@ -8,6 +15,8 @@ from pathlib import Path
 # used for this adapter's version and in determining the compatible dbt-core version
 VERSION = Path(__file__).parent / "__version__.py"
 
+T = TypeVar("T")
+
 
 def _dbt_maxcompute_version() -> str:
     """
@@ -23,11 +32,62 @@ def quote_string(value: str) -> str:
     return f"'{value}'"
 
 
+def unquote_literal(literal: str) -> Optional[str]:
+    """The value of a quoted string or integer SQL literal, None for anything else."""
+    literal = literal.strip()
+    if len(literal) >= 2 and literal[0] == literal[-1] and literal[0] in "'\"":
+        value = literal[1:-1]
+        return None if literal[0] in value or "\\" in value else value
+    if re.fullmatch(r"-?\d+", literal):
+        return literal
+    return None
+
+
 def quote_ref(value: str) -> str:
     value = value.replace("`", "``")
     return f"`{value}`"
 
 
+def like_pattern_to_regex(pattern: str) -> str:
+    """Translate a SQL LIKE pattern (`%`, `_`) into an anchored regex."""
+    if not pattern:
+        return "^$"
+    regex = re.escape(pattern)
+    regex = regex.replace("%", ".*").replace("_", ".")
+    return f"^{regex}$"
+
+
+@functools.lru_cache(maxsize=256)
+def compile_like_pattern(pattern: str) -> re.Pattern:
+    return re.compile(like_pattern_to_regex(pattern))
+
+
+def like_pattern_prefix(pattern: str) -> Optional[str]:
+    """The literal leading part of a LIKE pattern, None when it starts with a wildcard."""
+    match = re.match(r"[^%_\\]*", pattern or "")
+    return match.group(0) or None
+
+
+_LEADING_COMMENTS = re.compile(r"^(?:\s+|--[^\n]*(?:\n|$)|/\*.*?\*/)*", re.DOTALL)
+# Statements whose result is a set of rows rather than a side effect
+_QUERY_KEYWORDS = frozenset(
+    ["select", "with", "from", "values", "show", "desc", "describe", "explain"]
+)
+
+
+def returns_rows(sql: str) -> bool:
+    """Whether any `;`-separated statement of `sql` is a query returning rows.
+
+    The split ignores quoting, so a `;` inside a literal can only make the
+    answer more conservative.
+    """
+    for statement in sql.split(";"):
+        words = _LEADING_COMMENTS.sub("", statement).split(None, 1)
+        if words and words[0].lower().rstrip("(") in _QUERY_KEYWORDS:
+            return True
+    return False
+
+
 def is_schema_not_found(e: ODPSError) -> bool:
     if isinstance(e, NoSuchObject):
         return True
@@ -40,11 +100,151 @@ def is_schema_not_found(e: ODPSError) -> bool:
     return False
 
 
+def is_table_not_found(e: ODPSError) -> bool:
+    """Whether `e` says the table does not exist (yet), e.g. right after its DDL."""
+    if isinstance(e, NoSuchObject):
+        return True
+    message = str(e)
+    return "ODPS-0130131" in message or "table not found" in message.lower()
+
+
 from dbt.adapters.events.logging import AdapterLogger
 
 logger = AdapterLogger("MaxCompute")
 
 
+@dataclass(frozen=True)
+class WaitPolicy:
+    """How long to wait for MaxCompute to reach a consistent state.
+
+    Delays grow exponentially from `initial_delay` up to `max_delay`, each
+    one randomized by +/- `jitter` (a fraction of the delay). Retrying stops
+    after `max_attempts` calls or once `deadline` seconds have passed since
+    the first call, whichever comes first; None means unbounded.
+    """
+
+    initial_delay: float = 0.5
+    max_delay: float = 10
+    backoff: float = 2
+    jitter: float = 0.2
+    deadline: Optional[float] = 120
+    max_attempts: Optional[int] = None
+
+    def delays(self) -> Iterator[float]:
+        delay = self.initial_delay
+        attempt = 1
+        while self.max_attempts is None or attempt < self.max_attempts:
+            capped = min(delay, self.max_delay)
+            yield max(0.0, capped * (1 + random.uniform(-self.jitter, self.jitter)))
+            delay *= self.backoff
+            attempt += 1
+
+
+# Call sites waiting for metadata consistency, overridable through the
+# `wait_policies` profile field.
+DEFAULT_WAIT_POLICIES: Dict[str, WaitPolicy] = {
+    # A table created moments ago is not visible to metadata reads yet.
+    "table_visible": WaitPolicy(initial_delay=0.3, max_delay=10, deadline=120),
+    # The seed table is created right before its data is uploaded.
+    "seed_table_visible": WaitPolicy(initial_delay=0.3, max_delay=10, deadline=120),
+    # A schema created or dropped moments ago is not seen as such yet.
+    "schema_visible": WaitPolicy(initial_delay=0.3, max_delay=5, deadline=30),
+    # Transient errors reported while submitting SQL.
+    "sql_retry": WaitPolicy(initial_delay=2, max_delay=15, deadline=300, max_attempts=10),
+}
+
+
+def resolve_wait_policy(
+    call_site: str, overrides: Optional[Dict[str, Dict[str, Any]]] = None
+) -> WaitPolicy:
+    policy = DEFAULT_WAIT_POLICIES[call_site]
+    if overrides and call_site in overrides:
+        options = overrides[call_site] or {}
+        unknown = set(options) - {f.name for f in fields(WaitPolicy)}
+        if unknown:
+            raise DbtConfigError(
+                f"Unknown options {sorted(unknown)} in wait policy for '{call_site}'"
+            )
+        policy = replace(policy, **options)
+    return policy
+
+
+class WaitStats:
+    """Thread-safe record of the time spent waiting at each call site."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def record(self, call_site: str, seconds: float, retries: int, succeeded: bool) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(
+                call_site,
+                {"waits": 0, "retries": 0, "seconds": 0.0, "max_seconds": 0.0, "failures": 0},
+            )
+            stats["waits"] += 1
+            stats["retries"] += retries
+            stats["seconds"] += seconds
+            stats["max_seconds"] = max(stats["max_seconds"], seconds)
+            if not succeeded:
+                stats["failures"] += 1
+        logger.debug(
+            f"Waited {seconds:.2f}s over {retries} retries at {call_site}"
+            f"{'' if succeeded else ', giving up'}"
+        )
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {call_site: dict(stats) for call_site, stats in self._stats.items()}
+
+
+WAIT_STATS = WaitStats()
+
+
+def call_with_retry(
+    func: Callable[[], T],
+    policy: WaitPolicy,
+    exceptions: Tuple[Type[BaseException], ...] = (Exception,),
+    condition: Optional[Callable[[BaseException], bool]] = None,
+    call_site: Optional[str] = None,
+    on_retry: Optional[Callable[[BaseException, float], None]] = None,
+    sleep: Callable[[float], None] = time.sleep,
+) -> T:
+    """Call `func` until it stops raising `exceptions`, waiting as `policy` says.
+
+    The last exception is re-raised once the policy is exhausted. When
+    `call_site` is given, the time spent until success or failure is
+    recorded in `WAIT_STATS`.
+    """
+    start = time.monotonic()
+    delays = policy.delays()
+    retries = 0
+    while True:
+        try:
+            result = func()
+        except exceptions as ex:
+            if condition is not None and not condition(ex):
+                raise
+            delay = next(delays, None)
+            if delay is not None and policy.deadline is not None:
+                remaining = policy.deadline - (time.monotonic() - start)
+                delay = min(delay, remaining) if remaining > 0 else None
+            if delay is None:
+                if call_site is not None:
+                    WAIT_STATS.record(call_site, time.monotonic() - start, retries, False)
+                raise
+            if on_retry is not None:
+                on_retry(ex, delay)
+            else:
+                logger.debug(f"{str(ex)}, retrying in {delay:.2f} seconds...")
+            sleep(delay)
+            retries += 1
+            continue
+        if call_site is not None and retries:
+            WAIT_STATS.record(call_site, time.monotonic() - start, retries, True)
+        return result
+
+
 def retry_on_exception(max_retries=3, delay=1, backoff=2, exceptions=(Exception,), condition=None):
     """
     Decorator for retrying a function if it throws an exception.
@@ -55,22 +255,21 @@ def retry_on_exception(max_retries=3, delay=1, backoff=2, exceptions=(Exception,
     :param exceptions: Tuple of exceptions to catch. Defaults to base Exception.
     :param condition: Optional function to determine if the exception should trigger a retry.
     """
+    policy = WaitPolicy(
+        initial_delay=delay,
+        max_delay=float("inf"),
+        backoff=backoff,
+        jitter=0,
+        deadline=None,
+        max_attempts=max_retries,
+    )
 
     def decorator_retry(func):
         @functools.wraps(func)
         def wrapper_retry(*args, **kwargs):
-            mtries, mdelay = max_retries, delay
-            while mtries > 1:
-                try:
-                    return func(*args, **kwargs)
-                except exceptions as ex:
-                    if condition is not None and not condition(ex):
-                        raise
-                    logger.warning(f"{str(ex)}, Retrying in {mdelay} seconds...")
-                    time.sleep(mdelay)
-                    mtries -= 1
-                    mdelay *= backoff
-            return func(*args, **kwargs)
+            return call_with_retry(
+                lambda: func(*args, **kwargs), policy, exceptions=exceptions, condition=condition
+            )
 
         return wrapper_retry
 
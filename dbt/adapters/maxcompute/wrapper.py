@@ -1,5 +1,4 @@
 import copy
-import time
 from dataclasses import dataclass
 from typing import Optional
 
@@ -8,6 +7,16 @@ from odps.dbapi import Cursor, Connection
 from odps.errors import ODPSError
 
 from dbt.adapters.maxcompute.setting_parser import SettingParser
+from dbt.adapters.maxcompute.utils import DEFAULT_WAIT_POLICIES, WaitPolicy, call_with_retry
+
+# Transient errors worth resubmitting the query for.
+RETRYABLE_ERROR_CODES = {
+    "ODPS-0130201",
+    "ODPS-0130211",
+    "ODPS-0110061",
+    "ODPS-0130131",
+    "ODPS-0420111",
+}
 
 
 @dataclass
@@ -18,9 +27,10 @@ class MaxQAConfig:
 
 
 class ConnectionWrapper(Connection):
-    def __init__(self, odps=None, hints=None, maxqa_config=None, **kwargs):
+    def __init__(self, odps=None, hints=None, maxqa_config=None, wait_policy=None, **kwargs):
         super().__init__(odps=odps, hints=hints, **kwargs)
         self._maxqa_config = maxqa_config
+        self._wait_policy = wait_policy
 
     def cursor(self, *args, **kwargs):
         return CursorWrapper(
@@ -28,6 +38,7 @@ class ConnectionWrapper(Connection):
             *args,
             hints=copy.deepcopy(self._hints),
             maxqa_config=self._maxqa_config,
+            wait_policy=self._wait_policy,
             **kwargs,
         )
 
@@ -39,41 +50,41 @@ logger = AdapterLogger("MaxCompute")
 
 
 class CursorWrapper(Cursor):
-    def __init__(self, connection, *args, maxqa_config=None, **kwargs):
+    _wait_policy: WaitPolicy = DEFAULT_WAIT_POLICIES["sql_retry"]
+
+    def __init__(self, connection, *args, maxqa_config=None, wait_policy=None, **kwargs):
         super().__init__(connection, *args, **kwargs)
         self._maxqa_config = maxqa_config
+        if wait_policy is not None:
+            self._wait_policy = wait_policy
 
     def execute(self, operation, parameters=None, **kwargs):
         result = SettingParser.parse(operation)
         effective_maxqa = self._resolve_maxqa(result.settings)
-        retry_times = 10
-        for i in range(retry_times):
-            try:
-                if effective_maxqa:
-                    self._execute_maxqa(result, effective_maxqa)
-                else:
-                    super().execute(result.remaining_query, hints=result.settings)
-                    self._instance.wait_for_success()
-                return
-            except ODPSError as e:
-                if (
-                    e.code == "ODPS-0130201"
-                    or e.code == "ODPS-0130211"
-                    or e.code == "ODPS-0110061"
-                    or e.code == "ODPS-0130131"
-                    or e.code == "ODPS-0420111"
-                ):
-                    if i == retry_times - 1:
-                        raise e
-                    logger.warning(f"Retry because of {e}, retry times {i + 1}")
-                    time.sleep(15)
-                    continue
-                else:
-                    o = self.connection.odps
-                    if e.instance_id:
-                        instance = o.get_instance(e.instance_id)
-                        logger.error(instance.get_logview_address())
-                    raise e
+
+        def submit():
+            if effective_maxqa:
+                self._execute_maxqa(result, effective_maxqa)
+            else:
+                super(CursorWrapper, self).execute(result.remaining_query, hints=result.settings)
+                self._instance.wait_for_success()
+
+        try:
+            call_with_retry(
+                submit,
+                self._wait_policy,
+                exceptions=(ODPSError,),
+                condition=lambda e: e.code in RETRYABLE_ERROR_CODES,
+                call_site="sql_retry",
+                on_retry=lambda e, delay: logger.warning(
+                    f"Retry because of {e}, retrying in {delay:.1f} seconds"
+                ),
+            )
+        except ODPSError as e:
+            if e.code not in RETRYABLE_ERROR_CODES and e.instance_id:
+                instance = self.connection.odps.get_instance(e.instance_id)
+                logger.error(instance.get_logview_address())
+            raise
 
     def _resolve_maxqa(self, settings):
         model_mode = settings.pop("dbt.execution_mode", None)
@@ -1,9 +1,11 @@
 {% macro maxcompute__alter_column_type(relation, column_name, new_column_type) -%}
+    {% do adapter.invalidate_table_metadata(relation) %}
     alter table {{ relation.render() }} change column {{ adapter.quote(column_name) }} {{ adapter.quote(column_name) }} {{ new_column_type }};
 {% endmacro %}
 
 
 {% macro maxcompute__alter_relation_add_remove_columns(relation, add_columns, remove_columns) %}
+  {% do adapter.invalidate_table_metadata(relation) %}
   {% if add_columns is not none and add_columns|length > 0%}
       {% set sql -%}
          alter {{ relation.type }} {{ relation.render() }} add columns
@@ -23,3 +25,10 @@
       {% do run_query(sql) %}
   {% endif %}
 {% endmacro %}
+
+
+{% macro maxcompute__get_columns_in_query(select_sql) %}
+    {#- Goes through the adapter's schema probe cache instead of a new query job -#}
+    {% set columns = adapter.get_column_schema_from_query(get_empty_subquery_sql(select_sql)) %}
+    {{ return(columns | map(attribute='name') | list) }}
+{% endmacro %}
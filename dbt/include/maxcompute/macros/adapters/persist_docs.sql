@@ -1,6 +1,10 @@
 {% macro maxcompute__persist_docs(relation, model, for_relation, for_columns) -%}
   {% if for_relation and config.persist_relation_docs() and model.description %}
-    {% do run_query(alter_relation_comment(relation, model.description)) %}
+    {% set comment_sql = alter_relation_comment(relation, model.description) %}
+    {% if comment_sql | trim %}
+      {% do run_query(comment_sql) %}
+      {% do adapter.invalidate_table_metadata(relation) %}
+    {% endif %}
   {% endif %}
 
   {% if for_columns and config.persist_column_docs() and model.columns %}
@@ -9,17 +13,16 @@
 {% endmacro %}
 
 {% macro maxcompute__alter_column_comment(relation, column_dict) %}
-  {% set existing_columns = adapter.get_columns_in_relation(relation) | map(attribute="name") | list %}
-  {% for column_name in column_dict if (column_name in existing_columns) %}
-    {% set comment = column_dict[column_name]['description'] %}
-    {{ adapter.add_comment_to_column(relation, column_name, comment) }}
-  {% endfor %}
+  {% do adapter.alter_column_comments(relation, column_dict) %}
 {% endmacro %}
 
 {% macro maxcompute__alter_relation_comment(relation, relation_comment) -%}
-  {%- set sql_hints = config.get('sql_hints', none) -%}
-  {%- set sql_header = merge_sql_hints_and_header(sql_hints, config.get('sql_header', none)) -%}
+  {%- set comment_sql = adapter.add_comment(relation, relation_comment) -%}
+  {%- if comment_sql -%}
+    {%- set sql_hints = config.get('sql_hints', none) -%}
+    {%- set sql_header = merge_sql_hints_and_header(sql_hints, config.get('sql_header', none)) -%}
 
-  {{ sql_header if sql_header is not none }}
-  {{ adapter.add_comment(relation, relation_comment) }}
+    {{ sql_header if sql_header is not none }}
+    {{ comment_sql }}
+  {%- endif -%}
 {% endmacro %}
@@ -0,0 +1,48 @@
+{#
+  Catalog query used when the profile sets `catalog_mode: information_schema`.
+  `scopes` is a list of {project, schema, tables} dicts built by the adapter;
+  `tables` is empty when the whole schema is requested. The adapter respells
+  `column_type` the way the table metadata path does.
+#}
+{% macro mc_get_catalog_from_information_schema(scopes) -%}
+  {% set query %}
+    select
+        c.table_catalog as table_database,
+        c.table_schema as table_schema,
+        c.table_name as table_name,
+        case t.table_type
+            when 'VIRTUAL_VIEW' then 'VIEW'
+            when 'MATERIALIZED_VIEW' then 'MATERIALIZED_VIEW'
+            else 'TABLE'
+        end as table_type,
+        t.table_comment as table_comment,
+        c.column_name as column_name,
+        c.data_type as column_type,
+        c.ordinal_position as column_index,
+        c.column_comment as column_comment,
+        t.owner_name as table_owner
+    from SYSTEM_CATALOG.INFORMATION_SCHEMA.COLUMNS c
+    join SYSTEM_CATALOG.INFORMATION_SCHEMA.TABLES t
+        on c.table_catalog = t.table_catalog
+        and c.table_schema = t.table_schema
+        and c.table_name = t.table_name
+    where not c.is_partition_key
+      and (
+        {%- for scope in scopes %}
+        (
+            c.table_catalog = '{{ escape_single_quotes(scope.project) }}'
+            and c.table_schema = '{{ escape_single_quotes(scope.schema) }}'
+            {%- if scope.tables %}
+            and c.table_name in (
+                {%- for table in scope.tables -%}
+                '{{ escape_single_quotes(table) }}'{{ ", " if not loop.last }}
+                {%- endfor -%}
+            )
+            {%- endif %}
+        ){{ " or" if not loop.last }}
+        {%- endfor %}
+      )
+    order by table_database, table_schema, table_name, column_index
+  {% endset %}
+  {{ return(run_query(query)) }}
+{%- endmacro %}
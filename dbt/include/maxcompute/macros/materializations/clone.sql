@@ -4,6 +4,7 @@
 
 
 {% macro maxcompute__create_or_replace_clone(this_relation, defer_relation) %}
+    {% do adapter.invalidate_table_metadata(this_relation) %}
     {% call statement('drop_table', auto_begin=False) -%}
         drop table if exists {{ this_relation.render() }};
     {% endcall -%}
@@ -1,10 +1,30 @@
 {% macro run_hooks(hooks, inside_transaction=True) %}
+  {% if config.get('batch_hooks', false) %}
+    {{ run_hooks_batched(hooks, inside_transaction) }}
+  {% else %}
+    {% for hook in hooks | selectattr('transaction', 'equalto', inside_transaction)  %}
+      {% set rendered = render(hook.get('sql')) | trim %}
+      {% if (rendered | length) > 0 %}
+        {% call statement(auto_begin=inside_transaction) %}
+          {{ rendered }}
+        {% endcall %}
+      {% endif %}
+    {% endfor %}
+  {% endif %}
+{% endmacro %}
+
+{#- All hooks of the phase are rendered before the first one runs. -#}
+{% macro run_hooks_batched(hooks, inside_transaction=True) %}
+  {% set rendered_hooks = [] %}
   {% for hook in hooks | selectattr('transaction', 'equalto', inside_transaction)  %}
     {% set rendered = render(hook.get('sql')) | trim %}
     {% if (rendered | length) > 0 %}
-      {% call statement(auto_begin=inside_transaction) %}
-        {{ rendered }}
-      {% endcall %}
+      {% do rendered_hooks.append(rendered) %}
     {% endif %}
   {% endfor %}
+  {% for script in adapter.batch_hook_sql(rendered_hooks) %}
+    {% call statement(auto_begin=inside_transaction) %}
+      {{ script }}
+    {% endcall %}
+  {% endfor %}
 {% endmacro %}
@@ -15,7 +15,12 @@
   -- relations
   {%- set existing_relation = load_cached_relation(this) -%}
   {%- set target_relation = this.incorporate(type='table') -%}
-  {%- set temp_relation = make_temp_relation(target_relation)-%}
+  {#- batches of a microbatch model may run concurrently: one temp table each -#}
+  {%- if incremental_strategy == 'microbatch' and model.batch -%}
+    {%- set temp_relation = make_temp_relation(target_relation, '__dbt_tmp_' ~ model.batch.id) -%}
+  {%- else -%}
+    {%- set temp_relation = make_temp_relation(target_relation)-%}
+  {%- endif -%}
   {%- set backup_relation_type = 'table' if existing_relation is none else existing_relation.type -%}
   {%- set backup_relation = make_backup_relation(target_relation, backup_relation_type) -%}
 
@@ -62,6 +67,7 @@
         {{ create_table_as_internal(False, target_relation, sql, True, partition_config=partition_by, lifecycle=lifecycle, tblproperties=tblproperties) }}
       {%- endcall -%}
   {% else %}
+    {% do reconcile_table_config(existing_relation) %}
     {% set temp_relation_exists = false %}
     {% if on_schema_change != 'ignore' %}
       {#-- Check first, since otherwise we may not build a temp table --#}
@@ -88,7 +94,11 @@
     {#- prevents that inner assignment from propagating, so we mark the flag here -#}
     {#- to ensure the post-run cleanup drops it. insert_overwrite and microbatch  -#}
     {#- emit their own `drop table if exists` in the generated SQL.               -#}
-    {%- if incremental_strategy not in ('insert_overwrite', 'microbatch') -%}
+    {#- With script_fusion the build script drops the temp itself.               -#}
+    {%- if config.get('script_fusion', false) -%}
+        {% set temp_relation_exists = false %}
+    {%- elif incremental_strategy not in ('insert_overwrite', 'microbatch')
+            and not mc_merges_from_model_sql(incremental_strategy, temp_relation_exists, dest_columns) -%}
         {% set temp_relation_exists = true %}
     {%- endif -%}
 
@@ -125,18 +135,72 @@
         temp_relation, target_relation, sql, unique_key, partition_by, partitions, dest_columns, temp_relation_exists, tblproperties
     ) %}
   {% else %} {# strategy == 'dbt origin' #}
-    {%- call statement('create_temp_relation') -%}
-      {% if not temp_relation_exists %}
-          {{ create_table_as_internal(True, temp_relation, sql, True, partition_config=partition_by, tblproperties=tblproperties) }}
-      {% endif %}
-    {%- endcall -%}
+    {% set fused = config.get('script_fusion', false) %}
+    {% set from_model_sql = mc_merges_from_model_sql(strategy, temp_relation_exists, dest_columns) %}
+    {% set source = temp_relation %}
+    {% set steps = [] %}
+    {% if from_model_sql %}
+      {#- the trailing newline keeps a final `--` comment out of the bracket -#}
+      {% set source = "(\n" ~ sql ~ "\n)" %}
+    {% elif fused and not temp_relation_exists %}
+      {% do steps.append(create_table_as_internal(True, temp_relation, sql, True, partition_config=partition_by, tblproperties=tblproperties)) %}
+    {% elif not fused %}
+      {%- call statement('create_temp_relation') -%}
+        {% if not temp_relation_exists %}
+            {{ create_table_as_internal(True, temp_relation, sql, True, partition_config=partition_by, tblproperties=tblproperties) }}
+        {% endif %}
+      {%- endcall -%}
+    {% endif %}
+    {#- the partitions of the temp table are known once it is filled -#}
+    {% if config.get('partition_pruning', false) and strategy in ('merge', 'delete+insert')
+          and not from_model_sql and (temp_relation_exists or not fused)
+          and mc_unique_key_covers_partitions(unique_key, partition_by) %}
+      {% set incremental_predicates = (incremental_predicates or []) + adapter.partition_predicates(
+          temp_relation, target_relation, 'DBT_INTERNAL_DEST' if strategy == 'merge' else none) %}
+    {% endif %}
     {% set strategy_sql_macro_func = adapter.get_incremental_strategy_macro(context, strategy) %}
-    {% set strategy_arg_dict = ({'target_relation': target_relation, 'temp_relation': temp_relation, 'unique_key': unique_key, 'dest_columns': dest_columns, 'incremental_predicates': incremental_predicates }) %}
+    {% set strategy_arg_dict = ({'target_relation': target_relation, 'temp_relation': source, 'unique_key': unique_key, 'dest_columns': dest_columns, 'incremental_predicates': incremental_predicates }) %}
     {% set build_sql = strategy_sql_macro_func(strategy_arg_dict) %}
+    {% if fused and not from_model_sql %}
+      {#- create temp, merge / delete+insert / append, drop temp: one script -#}
+      {% do steps.append(build_sql) %}
+      {% do steps.append("drop table if exists " ~ temp_relation.render()) %}
+      {% set build_sql = adapter.fuse_sql_script(steps) %}
+    {% endif %}
   {% endif %}
   {{ return(build_sql) }}
 {% endmacro %}
 
+{#- Partition predicates only prune safely when a unique_key match implies the -#}
+{#- same partition. Otherwise a row whose key sits in a partition the delta    -#}
+{#- does not touch would be missed by the merge / delete and inserted again.   -#}
+{% macro mc_unique_key_covers_partitions(unique_key, partition_by) %}
+  {% if partition_by is none or not unique_key %}
+    {{ return(false) }}
+  {% endif %}
+  {% set key_columns = unique_key.split(',') if unique_key is string else unique_key %}
+  {% set key_columns = key_columns | map('trim') | map('lower') | list %}
+  {#- for auto-partitioned tables the fields are the columns partitioned on -#}
+  {% for field in partition_by.fields %}
+    {% if field | lower not in key_columns %}
+      {{ return(false) }}
+    {% endif %}
+  {% endfor %}
+  {{ return(true) }}
+{% endmacro %}
+
+{#- With skip_temp_relation, merge / append read the model SQL directly instead -#}
+{#- of a temp table, when the temp table is not needed to compare schemas       -#}
+{#- (on_schema_change='ignore') and the target columns are known.                -#}
+{% macro mc_merges_from_model_sql(strategy, temp_relation_exists, dest_columns) %}
+  {#- Not for delete+insert: its INSERT would evaluate the model SQL again, -#}
+  {#- against the target its DELETE just reduced.                           -#}
+  {{ return(config.get('skip_temp_relation', false)
+      and strategy in ('merge', 'append')
+      and not temp_relation_exists
+      and (dest_columns or []) | length > 0) }}
+{% endmacro %}
+
 {% macro get_quoted_list(column_names) %}
     {% set quoted = [] %}
     {% for col in column_names -%}
@@ -19,31 +19,88 @@
 {% macro mc_insert_overwrite_sql(
     tmp_relation, target_relation, sql, unique_key, partition_by, partitions, dest_columns, tmp_relation_exists, tblproperties
 ) %}
+      {% set is_static = partitions is not none and partitions != [] %}
+      {% if config.get('script_fusion', false) %}
+        {#- create tmp, delete static partitions, overwrite, drop tmp: one script -#}
+        {% set steps = [] %}
+        {% if not tmp_relation_exists %}
+          {% do steps.append(create_table_as_internal(True, tmp_relation, sql, True, partition_config=partition_by, tblproperties=tblproperties)) %}
+        {% endif %}
+        {% if is_static %}
+          {% do steps.append(mc_static_insert_overwrite_merge_sql(target_relation, tmp_relation, partition_by, partitions, inline_delete=True)) %}
+        {% else %}
+          {% do steps.append(mc_dynamic_insert_overwrite_sql(target_relation, tmp_relation, partition_by)) %}
+        {% endif %}
+        {% do steps.append("drop table if exists " ~ tmp_relation.render()) %}
+        {{ return(adapter.fuse_sql_script(steps)) }}
+      {% endif %}
+      {#- CLONE TABLE takes neither transactional nor auto-partitioned tables; -#}
+      {#- decide before the tmp table is built, which is then non-transactional -#}
+      {% set use_clone = partition_by.copy_partitions and not is_static and not partition_by.auto_partition()
+                         and adapter.can_clone_partitions(target_relation) %}
       {% if not tmp_relation_exists %}
         {%- call statement('create_tmp_relation') -%}
-          {{ create_table_as_internal(True, tmp_relation, sql, True, partition_config=partition_by, tblproperties=tblproperties) }}
+          {{ create_table_as_internal(True, tmp_relation, sql, not use_clone, partition_config=partition_by, tblproperties=tblproperties) }}
         {%- endcall -%}
       {% endif %}
+      {#- a dynamic overwrite replaces exactly the partitions of the tmp table -#}
+      {% set touched_partitions = none %}
+      {% if not is_static and config.get('partition_pruning', false) %}
+        {% set touched_partitions = adapter.list_partitions(tmp_relation) %}
+        {% do log("Overwriting " ~ touched_partitions | length ~ " partitions of " ~ target_relation ~ ": " ~ touched_partitions | join(', '), info=True) %}
+      {% endif %}
       -- 3. run the merge statement
+      {% if touched_partitions is none or touched_partitions | length > 0 %}
+      {#- copy the partitions of the tmp table instead of rewriting its rows; -#}
+      {#- none when the columns of the tmp table and the target differ -#}
+      {% set clone_sql = adapter.clone_partitions_sql(tmp_relation, target_relation) if use_clone else none %}
+      {% if clone_sql is not none %}
+        {% if clone_sql %}
+          {%- set sql_header = config.get('sql_header', none) -%}
+          {%- call statement('main') -%}
+            {{ sql_header if sql_header is not none }}
+            {{ clone_sql }}
+          {%- endcall -%}
+        {% endif %}
+      {% else %}
       {%- call statement('main') -%}
-      {% if partitions is not none and partitions != [] %} {# static #}
+      {% if is_static %}
           {{ mc_static_insert_overwrite_merge_sql(target_relation, tmp_relation, partition_by, partitions) }}
       {% else %} {# dynamic #}
           {{ mc_dynamic_insert_overwrite_sql(target_relation, tmp_relation, partition_by) }}
       {% endif %}
       {%- endcall -%}
+      {% endif %}
+      {% endif %}
       -- 4. clean up the temp table
       drop table if exists {{ tmp_relation }}
 {% endmacro %}
 
-{% macro mc_static_insert_overwrite_merge_sql(target, source, partition_by, partitions) -%}
+{% macro mc_static_insert_overwrite_merge_sql(target, source, partition_by, partitions, inline_delete=False) -%}
     {%- set sql_header = config.get('sql_header', none) -%}
     {{ sql_header if sql_header is not none }}
 
-    {%- call statement('drop_static_partition') -%}
+    {#- INSERT OVERWRITE replaces the partitions it writes; only the listed  -#}
+    {#- partitions without new rows need a DELETE to end up empty.           -#}
+    {%- set delete_partitions = partitions -%}
+    {%- if not inline_delete and not partition_by.auto_partition() -%}
+      {%- set missing_partitions = adapter.partitions_without_data(source, partitions) -%}
+      {%- if missing_partitions is not none -%}
+        {%- set delete_partitions = missing_partitions -%}
+      {%- endif -%}
+    {%- endif -%}
+    {%- set delete_sql -%}
     DELETE FROM {{ target }}
-    WHERE {{ partition_by.render(False) }} in ({{ partitions | join(',') }})
+    WHERE {{ partition_by.render(False) }} in ({{ delete_partitions | join(',') }})
+    {%- endset -%}
+    {%- if delete_partitions | length == 0 %}
+    {% elif inline_delete %}
+    {{ delete_sql }};
+    {% else -%}
+    {%- call statement('drop_static_partition') -%}
+    {{ delete_sql }}
     {%- endcall -%}
+    {%- endif %}
 
     {% if partition_by.auto_partition() -%}
     INSERT OVERWRITE TABLE {{ target }}
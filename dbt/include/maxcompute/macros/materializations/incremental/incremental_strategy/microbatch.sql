@@ -20,9 +20,39 @@
 {% macro mc_generate_microbatch_build_sql(
       tmp_relation, target_relation, sql, unique_key, partition_by, partitions, dest_columns, tmp_relation_exists, tblproperties
 ) %}
-    {% set build_sql = mc_insert_overwrite_sql(
-        tmp_relation, target_relation, sql, unique_key, partition_by, partitions, dest_columns, tmp_relation_exists, tblproperties
-    ) %}
+    {% if config.get('skip_temp_relation', false) and partition_by is not none
+          and not tmp_relation_exists and dest_columns %}
+      {#- each batch overwrites its partitions straight from the batch-filtered SQL -#}
+      {% set build_sql = mc_microbatch_overwrite_sql(target_relation, sql, partition_by, dest_columns) %}
+    {% else %}
+      {% set build_sql = mc_insert_overwrite_sql(
+          tmp_relation, target_relation, sql, unique_key, partition_by, partitions, dest_columns, tmp_relation_exists, tblproperties
+      ) %}
+    {% endif %}
 
     {{ return(build_sql) }}
 {% endmacro %}
+
+{% macro mc_microbatch_overwrite_sql(target, sql, partition_by, dest_columns) -%}
+    {%- set sql_header = config.get('sql_header', none) -%}
+    {{ sql_header if sql_header is not none }}
+    {% if partition_by.auto_partition() -%}
+    {#- the partition is derived server-side; dest_columns excludes the generated column -#}
+    {%- set dest_cols_csv = get_quoted_csv(dest_columns | map(attribute='name')) -%}
+    INSERT OVERWRITE TABLE {{ target }}
+    SELECT {{ dest_cols_csv }}
+    FROM (
+    {{ sql }}
+    ) as DBT_INTERNAL_SOURCE
+    {%- else -%}
+    {%- set partition_fields = partition_by.fields -%}
+    {%- set data_columns = dest_columns | rejectattr('name', 'in', partition_fields) | list -%}
+    {%- set data_cols_csv = get_quoted_csv(data_columns | map(attribute='name')) -%}
+    {%- set partition_cols_csv = get_quoted_csv(partition_fields) -%}
+    INSERT OVERWRITE TABLE {{ target }} PARTITION({{ partition_cols_csv }})
+    SELECT {{ data_cols_csv }}, {{ partition_cols_csv }}
+    FROM (
+    {{ sql }}
+    ) as DBT_INTERNAL_SOURCE
+    {%- endif -%}
+{%- endmacro %}
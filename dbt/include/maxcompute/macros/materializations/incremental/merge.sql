@@ -53,7 +53,7 @@
     {% else %}
         INSERT INTO {{ target }} ({{ dest_cols_csv }})
         SELECT {{ dest_cols_csv }}
-        FROM {{ source }}
+        FROM {{ source }} as DBT_INTERNAL_SOURCE
     {% endif %}
 {% endmacro %}
 
@@ -74,7 +74,7 @@
             {%- set key_csv = unique_key | join(', ') -%}
             delete from {{ target }}
             where ({{ key_csv }}) in (
-                select {{ key_csv }} from {{ source }}
+                select {{ key_csv }} from {{ source }} as DBT_INTERNAL_SOURCE
             )
             {%- if incremental_predicates %}
                 {% for predicate in incremental_predicates %}
@@ -86,7 +86,7 @@
             where (
                 {{ unique_key }}) in (
                 select ({{ unique_key }})
-                from {{ source }}
+                from {{ source }} as DBT_INTERNAL_SOURCE
             )
             {%- if incremental_predicates %}
                 {% for predicate in incremental_predicates %}
@@ -106,12 +106,12 @@
     {#- emit data cols then partition cols in the same order as the table.    -#}
     insert into {{ target }} partition ({{ partition_cols_csv }})
     select {{ data_cols_csv }}, {{ partition_cols_csv }}
-    from {{ source }}
+    from {{ source }} as DBT_INTERNAL_SOURCE
     {% else %}
     insert into {{ target }} ({{ dest_cols_csv }})
     (
         select {{ dest_cols_csv }}
-        from {{ source }}
+        from {{ source }} as DBT_INTERNAL_SOURCE
     )
     {% endif %}
 {%- endmacro %}
@@ -135,12 +135,12 @@
         {%- set partition_cols_csv = get_quoted_csv(partition_fields) -%}
     insert into {{ target }} partition ({{ partition_cols_csv }})
     select {{ data_cols_csv }}, {{ partition_cols_csv }}
-    from {{ source }}
+    from {{ source }} as DBT_INTERNAL_SOURCE
     {% else %}
     insert into {{ target }} ({{ dest_cols_csv }})
     (
         select {{ dest_cols_csv }}
-        from {{ source }}
+        from {{ source }} as DBT_INTERNAL_SOURCE
     )
     {% endif %}
 {%- endmacro %}
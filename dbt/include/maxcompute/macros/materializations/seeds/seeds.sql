@@ -2,6 +2,7 @@
   {%- set column_override = model['config'].get('column_types', {}) -%}
   {%- set quote_seed_column = model['config'].get('quote_columns', None) -%}
   {%- set is_transactional = model['config'].get('transactional', False) -%}
+  {%- do adapter.invalidate_table_metadata(this) -%}
 
   {% set sql %}
     create table {{ this.render() }} (
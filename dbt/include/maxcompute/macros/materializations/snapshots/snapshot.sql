@@ -37,6 +37,7 @@
 -- The original method of adding 1 column at a time in a loop has been changed to adding all columns at once.
 {% macro maxcompute__create_columns(relation, columns) %}
     {% if columns|length > 0 %}
+    {% do adapter.invalidate_table_metadata(relation) %}
     {% call statement() %}
       alter table {{ relation.render() }} add columns (
         {% for column in columns %}
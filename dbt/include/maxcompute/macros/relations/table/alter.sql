@@ -0,0 +1,25 @@
+{% macro reconcile_table_config(relation) %}
+  {#- Brings the lifecycle, tblproperties and table_comment of an existing table  -#}
+  {#- in line with the model config without rebuilding it. `config_drift`:        -#}
+  {#- `ignore` (default) leaves the table alone, `dry_run` only logs the ALTER    -#}
+  {#- statements and `apply` runs them as one script.                             -#}
+  {%- set mode = config.get('config_drift', 'ignore') -%}
+  {%- if mode not in ('ignore', 'apply', 'dry_run') -%}
+    {% do exceptions.raise_compiler_error("Invalid config_drift '" ~ mode ~ "', expected one of: ignore, apply, dry_run") %}
+  {%- endif -%}
+  {%- if mode != 'ignore' -%}
+    {%- set changes = adapter.table_config_changes(relation, config.model) -%}
+    {%- if changes -%}
+      {%- set alter_sql = adapter.table_config_alter_sql(relation, changes) -%}
+      {%- if mode == 'dry_run' -%}
+        {% do log("Config drift on " ~ relation ~ " (dry run), would run:\n" ~ alter_sql, info=True) %}
+      {%- else -%}
+        {% do log("Config drift on " ~ relation ~ ", applying: " ~ (changes.keys() | join(", ")), info=True) %}
+        {% call statement('reconcile_table_config') -%}
+          {{ alter_sql }}
+        {%- endcall %}
+        {% do adapter.invalidate_table_metadata(relation) %}
+      {%- endif -%}
+    {%- endif -%}
+  {%- endif -%}
+{% endmacro %}
@@ -15,9 +15,9 @@
     {%- set sql_header = merge_sql_hints_and_header(sql_hints, config.get('sql_header', none)) -%}
 
     {%- set is_delta = is_transactional and primary_keys is not none and primary_keys|length > 0 -%}
+    {% do adapter.invalidate_table_metadata(relation) %}
 
-    {% call statement('create_table', auto_begin=False) -%}
-        {{ sql_header if sql_header is not none }}
+    {%- set create_sql -%}
         create table {{ relation.render() }} (
             {% set contract_config = config.get('contract') %}
             {% if contract_config.enforced and (not temporary) %}
@@ -60,8 +60,19 @@
                 LIFECYCLE 1
             {%- endif %}
             ;
+    {%- endset -%}
+    {#- With script_fusion the DDL and the INSERT are submitted as one script, -#}
+    {#- i.e. one instance; the header (hints, set statements) leads it once.   -#}
+    {%- if config.get('script_fusion', false) -%}
+    {{ sql_header if sql_header is not none }}
+    {{ create_sql }}
+    {%- else -%}
+    {% call statement('create_table', auto_begin=False) -%}
+        {{ sql_header if sql_header is not none }}
+        {{ create_sql }}
     {%- endcall -%}
     {{ sql_header if sql_header is not none }}
+    {%- endif %}
     insert into {{ relation.render() }}
     {% if partition_config and partition_config.fields|length > 0 and not partition_config.auto_partition() -%}
         partition({{ partition_config.render(False) }})
@@ -1,4 +1,5 @@
 {% macro maxcompute__drop_table(relation) %}
+    {% do adapter.invalidate_table_metadata(relation) %}
     {% call statement(name="main") %}
     drop table if exists {{ relation }}
     {% endcall %}
@@ -1,3 +1,5 @@
 {%- macro maxcompute__get_rename_table_sql(relation, new_name) -%}
+    {%- do adapter.invalidate_table_metadata(relation) -%}
+    {%- do adapter.invalidate_table_metadata(relation.incorporate(path={"identifier": new_name})) -%}
     alter table {{ relation }} rename to {{ quote_ref(new_name) }}
 {%- endmacro -%}
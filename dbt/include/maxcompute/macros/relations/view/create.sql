@@ -1,6 +1,7 @@
 {% macro maxcompute__create_view_as(relation, sql) -%}
   {%- set sql_hints = config.get('sql_hints', none) -%}
   {%- set sql_header = merge_sql_hints_and_header(sql_hints, config.get('sql_header', none)) -%}
+  {%- do adapter.invalidate_table_metadata(relation) -%}
 
   {{ sql_header if sql_header is not none }}
   create or replace view {{ relation.render() }}
@@ -8,6 +9,10 @@
     {% if contract_config.enforced %}
       {{ get_assert_columns_equivalent(sql) }}
     {%- endif %}
+    {#- Saves persist_docs from recreating the view to set its comment #}
+    {% if config.persist_relation_docs() and model.description %}
+      comment {{ quote_and_escape(model.description) }}
+    {%- endif %}
   as (
     {{ sql }}
   );
@@ -1,4 +1,5 @@
 {% macro maxcompute__drop_view(relation) %}
+    {% do adapter.invalidate_table_metadata(relation) %}
     {% call statement(name="main") %}
     drop view if exists {{ relation }}
     {% endcall %}
@@ -53,11 +53,15 @@ setup(
         "dbt-common>=1.10,<2.0",
         "dbt-adapters>=1.19.0,<2.0",
         "pyodps>=0.12.0",  # latest
-        "alibabacloud_credentials>=0.3.6",  # latest
+        "alibabacloud_credentials>=1.0.0",  # latest
         "pandas>=0.17.0",
         # add dbt-core to ensure backwards compatibility of installation, this is not a functional dependency
         "dbt-core>=1.11.2",
     ],
+    extras_require={
+        # encrypted on-disk token cache (`token_cache: true`)
+        "token-cache": ["cryptography>=3.1"],
+    },
     zip_safe=False,
     classifiers=[
         "Development Status :: 5 - Production/Stable",
@@ -0,0 +1,58 @@
+"""Functional tests for `copy_partitions` on a dynamic `insert_overwrite`.
+
+CLONE TABLE copies the partitions of the temp table only when neither table
+is transactional and their columns match. `copy_plain` starts from a plain
+table created outside dbt and is cloned into. `copy_transactional` is created
+by dbt, transactional, and `copy_renamed` is a plain table whose second
+column has another name: both fall back to INSERT OVERWRITE. All three must
+end up with the same rows.
+"""
+
+import pytest
+
+from dbt.tests.util import run_dbt
+
+
+_model_sql = """
+{{ config(
+    materialized='incremental',
+    incremental_strategy='insert_overwrite',
+    partition_by={"fields": "ds", "data_types": "string", "copy_partitions": true}
+) }}
+select 1 as id, '{{ var("v", "a") }}' as v, '{{ var("ds", "d1") }}' as ds
+union all
+select 2 as id, '{{ var("v", "a") }}' as v, '{{ var("ds", "d1") }}' as ds
+"""
+
+
+MODELS = ("copy_plain", "copy_transactional", "copy_renamed")
+
+
+def _rows(project, model):
+    rows = project.run_sql(f"select * from {{schema}}.{model} order by ds, id", fetch="all")
+    return [tuple(row) for row in rows]
+
+
+class TestCopyPartitions:
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {f"{model}.sql": _model_sql for model in MODELS}
+
+    @pytest.fixture(scope="class")
+    def project_config_update(self):
+        return {"name": "copy_partitions"}
+
+    def test_partitions_replaced(self, project):
+        project.run_sql(
+            "create table {schema}.copy_plain (id bigint, v string) partitioned by (ds string)"
+        )
+        project.run_sql(
+            "create table {schema}.copy_renamed (id bigint, w string) partitioned by (ds string)"
+        )
+        run_dbt(["run"])
+        run_dbt(["run", "--vars", "{ds: d2}"])
+        run_dbt(["run", "--vars", "{ds: d1, v: b}"])
+
+        expected = [(1, "b", "d1"), (2, "b", "d1"), (1, "a", "d2"), (2, "a", "d2")]
+        for model in MODELS:
+            assert _rows(project, model) == expected, model
@@ -0,0 +1,86 @@
+"""Functional tests for concurrent microbatch batches.
+
+The adapter declares `MicrobatchConcurrency`, so with `concurrent_batches`
+and several threads the batches of one model run at the same time. Each
+batch builds its own `<model>__dbt_tmp_<batch id>` temp table; with a shared
+temp table the batches would overwrite each other's rows.
+"""
+
+import pytest
+
+from dbt.tests.util import run_dbt
+
+
+_input_model_sql = """
+{{ config(materialized='table', event_time='event_time') }}
+select 1 as id, TIMESTAMP'2024-12-30 00:00:00' as event_time
+union all
+select 2 as id, TIMESTAMP'2024-12-31 00:00:00' as event_time
+union all
+select 3 as id, TIMESTAMP'2025-01-01 00:00:00' as event_time
+"""
+
+_microbatch_model_sql = """
+{{ config(
+    materialized='incremental',
+    incremental_strategy='microbatch',
+    event_time='event_time',
+    batch_size='day',
+    begin='2024-12-30',
+    concurrent_batches=true,
+    partition_by={"fields": "event_time", "data_types": "timestamp", "granularity": "day"}
+) }}
+select id, event_time from {{ ref('input_model') }}
+"""
+
+BATCH_IDS = ("20241230", "20241231", "20250101")
+
+
+def _run_batches(*args):
+    return run_dbt(
+        [
+            "run",
+            "--threads",
+            "4",
+            "--event-time-start",
+            "2024-12-30",
+            "--event-time-end",
+            "2025-01-02",
+            *args,
+        ]
+    )
+
+
+class TestMicrobatchConcurrentBatches:
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {"input_model.sql": _input_model_sql, "microbatch_model.sql": _microbatch_model_sql}
+
+    @pytest.fixture(scope="class")
+    def project_config_update(self):
+        return {"name": "microbatch_concurrency"}
+
+    def test_batches_use_separate_temp_tables(self, project):
+        run_dbt(["run", "--select", "input_model"])
+        # The first run creates the table, the second one runs every batch
+        # against the existing table and therefore through a temp table
+        for _ in range(2):
+            results = _run_batches("--select", "microbatch_model")
+            assert len(results[0].batch_results.successful) == len(BATCH_IDS)
+            assert not results[0].batch_results.failed
+
+            rows = project.run_sql(
+                "select id from {schema}.microbatch_model order by id", fetch="all"
+            )
+            assert [row[0] for row in rows] == [1, 2, 3]
+
+        for batch_id in BATCH_IDS:
+            leaked = True
+            try:
+                project.run_sql(
+                    f"select count(*) from {{schema}}.microbatch_model__dbt_tmp_{batch_id}",
+                    fetch="one",
+                )
+            except Exception:
+                leaked = False
+            assert not leaked, f"temp table of batch {batch_id} survived the run"
@@ -0,0 +1,94 @@
+"""Functional tests for microbatch batches built with `skip_temp_relation`.
+
+Each batch then overwrites its partitions straight from the batch-filtered
+model SQL (`mc_microbatch_overwrite_sql`) instead of going through a temp
+table. Rerunning a batch must replace its partition, not append to it, and
+leave the partitions of the other batches alone.
+"""
+
+import pytest
+
+from dbt.tests.util import run_dbt
+
+
+_input_model_sql = """
+{{ config(materialized='table', event_time='event_time') }}
+select 1 as id, TIMESTAMP'2024-12-30 00:00:00' as event_time
+union all
+select 2 as id, TIMESTAMP'2024-12-31 00:00:00' as event_time
+union all
+select 3 as id, TIMESTAMP'2025-01-01 00:00:00' as event_time
+"""
+
+_microbatch_model_sql = """
+{{ config(
+    materialized='incremental',
+    incremental_strategy='microbatch',
+    event_time='event_time',
+    batch_size='day',
+    begin='2024-12-30',
+    skip_temp_relation=true,
+    partition_by={"fields": "ds", "data_types": "string", "granularity": "day"}
+) }}
+select id, event_time, to_char(event_time, 'yyyymmdd') as ds from {{ ref('input_model') }}
+"""
+
+
+def _rows(project):
+    rows = project.run_sql(
+        "select ds, id from {schema}.microbatch_model order by ds, id", fetch="all"
+    )
+    return [tuple(row) for row in rows]
+
+
+def _run_batches(start, end):
+    return run_dbt(
+        [
+            "run",
+            "--select",
+            "microbatch_model",
+            "--event-time-start",
+            start,
+            "--event-time-end",
+            end,
+        ]
+    )
+
+
+class TestMicrobatchSkipTempRelation:
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {"input_model.sql": _input_model_sql, "microbatch_model.sql": _microbatch_model_sql}
+
+    @pytest.fixture(scope="class")
+    def project_config_update(self):
+        return {"name": "microbatch_skip_temp_relation"}
+
+    def test_rerun_batch_overwrites_its_partition(self, project):
+        run_dbt(["run", "--select", "input_model"])
+        _run_batches("2024-12-30", "2025-01-02")
+        expected = [("20241230", 1), ("20241231", 2), ("20250101", 3)]
+        assert _rows(project) == expected
+
+        # Rerunning every batch against the existing table takes the direct path
+        _run_batches("2024-12-30", "2025-01-02")
+        assert _rows(project) == expected
+
+        # A late row for one day only rewrites that day's partition
+        project.run_sql(
+            "insert into {schema}.input_model values (4, TIMESTAMP'2024-12-31 12:00:00')"
+        )
+        results = _run_batches("2024-12-31", "2025-01-01")
+        assert len(results[0].batch_results.successful) == 1
+        assert _rows(project) == [
+            ("20241230", 1),
+            ("20241231", 2),
+            ("20241231", 4),
+            ("20250101", 3),
+        ]
+        partitions = project.run_sql("show partitions {schema}.microbatch_model", fetch="all")
+        assert sorted(str(p[0]) for p in partitions) == [
+            "ds=20241230",
+            "ds=20241231",
+            "ds=20250101",
+        ]
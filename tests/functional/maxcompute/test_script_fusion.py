@@ -0,0 +1,108 @@
+"""Functional tests for `script_fusion` on table builds.
+
+With `script_fusion: true` create_table_as_internal returns the CREATE TABLE
+and the INSERT as one script. The tables built that way must be identical to
+the ones built by the two-statement path: same rows, partitions, primary
+keys, tblproperties and lifecycle.
+"""
+
+import pytest
+
+from dbt.tests.util import run_dbt
+
+
+seeds_csv = """
+id,name,pt
+1,Alice,p01
+2,Bob,p01
+3,Carol,p02
+4,Dave,p03
+""".lstrip()
+
+schema_yml = """
+version: 2
+sources:
+  - name: raw
+    schema: "{{ target.schema }}"
+    tables:
+      - name: seed
+        identifier: seed_fusion
+"""
+
+_plain_sql = """
+{{ config(materialized='table', script_fusion=var('fusion', true), sql_header='set a=b;') }}
+select id, name from {{ source('raw', 'seed') }}
+"""
+
+_partitioned_sql = """
+{{ config(
+    materialized='table',
+    script_fusion=var('fusion', true),
+    partition_by={"fields": "pt", "data_types": "string"},
+    lifecycle=7
+) }}
+select id, name, pt from {{ source('raw', 'seed') }}
+"""
+
+_delta_sql = """
+{{ config(
+    materialized='table',
+    script_fusion=var('fusion', true),
+    transactional=true,
+    primary_keys=['id'],
+    tblproperties={"columnar.nested.type": "true"}
+) }}
+select id, name from {{ source('raw', 'seed') }}
+"""
+
+
+MODELS = ("fused_plain", "fused_partitioned", "fused_delta")
+
+
+def _rows(project, model):
+    return project.run_sql(f"select * from {{schema}}.{model} order by id", fetch="all")
+
+
+def _describe(project, model):
+    rows = project.run_sql(f"desc extended {{schema}}.{model}", fetch="all")
+    return "\n".join(str(row) for row in rows).lower()
+
+
+class TestScriptFusionTable:
+    @pytest.fixture(scope="class")
+    def seeds(self):
+        return {"seed_fusion.csv": seeds_csv}
+
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {
+            "fused_plain.sql": _plain_sql,
+            "fused_partitioned.sql": _partitioned_sql,
+            "fused_delta.sql": _delta_sql,
+            "schema.yml": schema_yml,
+        }
+
+    @pytest.fixture(scope="class")
+    def project_config_update(self):
+        return {"name": "script_fusion_table"}
+
+    def test_fused_build_matches_two_statement_build(self, project):
+        run_dbt(["seed"])
+        results = run_dbt(["run"])
+        assert len(results) == 3
+        fused = {model: _rows(project, model) for model in MODELS}
+        assert len(fused["fused_plain"]) == 4
+
+        partitions = project.run_sql("show partitions {schema}.fused_partitioned", fetch="all")
+        assert sorted(str(p[0]) for p in partitions) == ["pt=p01", "pt=p02", "pt=p03"]
+        assert "lifecycle" in _describe(project, "fused_partitioned")
+        delta = _describe(project, "fused_delta")
+        assert "transactional" in delta
+        assert "columnar.nested.type" in delta
+
+        # Rebuilding an existing table goes through the fused path as well
+        run_dbt(["run"])
+        assert _rows(project, "fused_plain") == fused["fused_plain"]
+
+        run_dbt(["run", "--vars", "{fusion: false}"])
+        assert {model: _rows(project, model) for model in MODELS} == fused
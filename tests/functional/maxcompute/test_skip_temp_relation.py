@@ -0,0 +1,52 @@
+"""Functional tests for `skip_temp_relation` on incremental models.
+
+The model below reads its own target. A `merge` from the model SQL reads it
+once, but a `delete+insert` would evaluate it a second time for the INSERT,
+after its DELETE removed the rows being rewritten, and lose them. That
+strategy therefore keeps the temp table even with `skip_temp_relation`.
+"""
+
+import pytest
+
+from dbt.tests.util import run_dbt
+
+
+_self_referencing_sql = """
+{{{{ config(
+    materialized='incremental',
+    incremental_strategy='{strategy}',
+    unique_key='id',
+    skip_temp_relation=true
+) }}}}
+{{% if is_incremental() %}}
+select id, v + 1 as v from {{{{ this }}}}
+union all
+select 3 as id, 30 as v
+{{% else %}}
+select 1 as id, 10 as v
+union all
+select 2 as id, 20 as v
+{{% endif %}}
+"""
+
+
+class TestSkipTempRelationSelfReference:
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {
+            "merge_model.sql": _self_referencing_sql.format(strategy="merge"),
+            "delete_insert_model.sql": _self_referencing_sql.format(strategy="delete+insert"),
+        }
+
+    @pytest.fixture(scope="class")
+    def project_config_update(self):
+        return {"name": "skip_temp_relation_self_reference"}
+
+    def test_rows_rewritten_once(self, project):
+        run_dbt(["run"])
+        run_dbt(["run"])
+        for model in ("merge_model", "delete_insert_model"):
+            rows = project.run_sql(
+                f"select id, v from {{schema}}.{model} order by id", fetch="all"
+            )
+            assert [tuple(r) for r in rows] == [(1, 11), (2, 21), (3, 30)], model
@@ -0,0 +1,154 @@
+"""Unit tests for the parallel catalog builder.
+
+The builder only talks to ODPS through `get_table(...).reload()`, so a fake
+client is enough to check the concurrency of the build without a MaxCompute
+project.
+"""
+
+import threading
+import unittest
+from unittest.mock import MagicMock
+
+import agate
+from dbt_common.exceptions import DbtRuntimeError
+
+from dbt.adapters.maxcompute.catalog import (
+    CATALOG_COLUMN_NAMES,
+    MaxComputeCatalogBuilder,
+    catalog_column_type,
+    relation_scopes,
+    schema_scopes,
+)
+from dbt.adapters.maxcompute.relation import MaxComputeRelation
+from tests.unit_test.fakes import FakeOdps, make_adapter
+
+
+def _relations(count, prefix="t_"):
+    return [
+        MaxComputeRelation.create(database="proj", schema="sch", identifier=f"{prefix}{i}")
+        for i in range(count)
+    ]
+
+
+class TestCatalogBuilder(unittest.TestCase):
+    def test_rows_keep_submission_order(self):
+        odps = FakeOdps()
+        relations = _relations(20)
+        table = MaxComputeCatalogBuilder(odps, max_workers=8, retry_times=1).build(relations)
+
+        self.assertEqual(list(table.column_names), CATALOG_COLUMN_NAMES)
+        names = [row["table_name"] for row in table.rows]
+        expected = [r.identifier for r in relations for _ in range(2)]
+        self.assertEqual(names, expected)
+        self.assertEqual([row["column_index"] for row in table.rows][:2], [1, 2])
+
+    def test_parallel_output_matches_serial(self):
+        relations = _relations(5) + _relations(3, prefix="v_") + _relations(2, prefix="mv_")
+        serial = MaxComputeCatalogBuilder(FakeOdps(), max_workers=1).build_rows(relations)
+        parallel = MaxComputeCatalogBuilder(FakeOdps(), max_workers=4).build_rows(relations)
+        self.assertEqual(serial, parallel)
+        self.assertEqual({row[3] for row in parallel}, {"TABLE", "VIEW", "MATERIALIZED_VIEW"})
+
+    def test_missing_tables_are_skipped(self):
+        odps = FakeOdps(missing={"t_1"})
+        rows = MaxComputeCatalogBuilder(odps, max_workers=4, retry_times=1).build_rows(
+            _relations(3)
+        )
+        self.assertEqual({row[2] for row in rows}, {"t_0", "t_2"})
+
+    def test_reloads_run_concurrently(self):
+        # Each reload waits for 4 reloads in flight: a smaller pool would break the barrier
+        odps = FakeOdps(barrier=threading.Barrier(4, timeout=10))
+        MaxComputeCatalogBuilder(odps, max_workers=4, retry_times=1).build(_relations(20))
+        self.assertEqual(odps.reload_calls, 20)
+        self.assertEqual(odps.peak, 4)
+
+    def test_pool_is_bounded(self):
+        odps = FakeOdps()
+        MaxComputeCatalogBuilder(odps, max_workers=3, retry_times=1).build(_relations(30))
+        self.assertEqual(odps.reload_calls, 30)
+        self.assertLessEqual(odps.peak, 3)
+
+
+def _make_adapter(catalog_mode="information_schema"):
+    adapter = make_adapter(catalog_mode=catalog_mode)
+    adapter._catalog_filter_table = MagicMock(side_effect=lambda table, used_schemas: table)
+    adapter._get_one_catalog_by_relations_from_metadata = MagicMock(return_value="metadata")
+    adapter.execute_macro = MagicMock(
+        return_value=agate.Table([], column_names=CATALOG_COLUMN_NAMES)
+    )
+    return adapter
+
+
+class TestInformationSchemaCatalog(unittest.TestCase):
+    def test_relation_scopes_group_by_schema(self):
+        relations = [
+            MaxComputeRelation.create(database="Proj", schema="s1", identifier="B"),
+            MaxComputeRelation.create(database="proj", schema="s1", identifier="a"),
+            MaxComputeRelation.create(database="proj", schema="s2", identifier="c"),
+        ]
+        self.assertEqual(
+            relation_scopes(relations),
+            [
+                {"project": "proj", "schema": "s1", "tables": ["a", "b"]},
+                {"project": "proj", "schema": "s2", "tables": ["c"]},
+            ],
+        )
+
+    def test_schema_scopes_deduplicate(self):
+        self.assertEqual(
+            schema_scopes([("proj", "S1"), ("proj", "s1")]),
+            [{"project": "proj", "schema": "s1", "tables": []}],
+        )
+
+    def test_single_query_used_when_enabled(self):
+        adapter = _make_adapter()
+        result = adapter._get_one_catalog_by_relations(None, _relations(3), frozenset())
+        self.assertIsInstance(result, agate.Table)
+        self.assertEqual(list(result.column_names), CATALOG_COLUMN_NAMES)
+        adapter.execute_macro.assert_called_once()
+        adapter._get_one_catalog_by_relations_from_metadata.assert_not_called()
+
+    def test_falls_back_to_table_metadata_once(self):
+        adapter = _make_adapter()
+        adapter.execute_macro.side_effect = DbtRuntimeError(
+            "ODPS-0130013: Authorization exception"
+        )
+        first = adapter._get_one_catalog_by_relations(None, _relations(3), frozenset())
+        second = adapter._get_one_catalog_by_relations(None, _relations(3), frozenset())
+        self.assertEqual((first, second), ("metadata", "metadata"))
+        # Once the information schema failed, later calls go straight to metadata.
+        adapter.execute_macro.assert_called_once()
+
+    def test_table_mode_skips_information_schema(self):
+        adapter = _make_adapter(catalog_mode="table")
+        adapter._get_one_catalog_by_relations(None, _relations(3), frozenset())
+        adapter.execute_macro.assert_not_called()
+
+    def test_column_types_match_table_metadata(self):
+        relations = _relations(1)
+        metadata_rows = MaxComputeCatalogBuilder(FakeOdps()).build_rows(relations)
+        # The information schema spells the same columns in upper case
+        index = CATALOG_COLUMN_NAMES.index("column_type")
+        information_schema_rows = []
+        for row in metadata_rows:
+            row = list(row)
+            row[index] = row[index].upper()
+            information_schema_rows.append(row)
+        adapter = _make_adapter()
+        adapter.execute_macro.return_value = agate.Table(
+            information_schema_rows, column_names=CATALOG_COLUMN_NAMES
+        )
+        result = adapter._get_one_catalog_by_relations(None, relations, frozenset())
+        self.assertEqual([row["column_type"] for row in result.rows], ["bigint", "string"])
+        self.assertEqual([tuple(row) for row in result.rows], metadata_rows)
+
+    def test_column_type_spelling(self):
+        self.assertEqual(catalog_column_type("DECIMAL(10, 2)"), "decimal(10,2)")
+        self.assertEqual(catalog_column_type("MAP<STRING, BIGINT>"), "map<string,bigint>")
+        self.assertEqual(catalog_column_type("varchar(10)"), "varchar(10)")
+        self.assertEqual(catalog_column_type("NOT A TYPE"), "not a type")
+
+
+if __name__ == "__main__":
+    unittest.main()
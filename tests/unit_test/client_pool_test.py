@@ -0,0 +1,114 @@
+"""Unit tests for the process-wide pool of validated ODPS clients."""
+
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from dbt_common.exceptions import DbtConfigError
+
+from dbt.adapters.maxcompute.client_pool import OdpsClientPool
+from dbt.adapters.maxcompute.connections import MaxComputeConnectionManager
+from dbt.adapters.maxcompute.credentials import MaxComputeCredentials
+
+
+def _credentials(**kwargs):
+    values = dict(
+        endpoint="http://service.example.com/api",
+        database="proj",
+        schema="default",
+        access_key_id="ak",
+        access_key_secret="sk",
+    )
+    values.update(kwargs)
+    return MaxComputeCredentials(**values)
+
+
+class CountingCredentials:
+    """Wrap credentials so that building and validating clients is observable."""
+
+    def __init__(self, credentials, latency=0.0, error=None):
+        self.credentials = credentials
+        self.latency = latency
+        self.error = error
+        self.built = 0
+        self.validated = 0
+        self._lock = threading.Lock()
+
+    def odps(self):
+        with self._lock:
+            self.built += 1
+        client = MagicMock()
+
+        def reload():
+            time.sleep(self.latency)
+            with self._lock:
+                self.validated += 1
+            if self.error:
+                raise self.error
+
+        client.get_project.return_value.reload.side_effect = reload
+        return client
+
+
+class TestOdpsClientPool(unittest.TestCase):
+    def setUp(self):
+        self.pool = OdpsClientPool()
+
+    def _get(self, counting):
+        counting.credentials.odps = counting.odps
+        return self.pool.get(counting.credentials)
+
+    def test_client_is_validated_once(self):
+        counting = CountingCredentials(_credentials())
+        first = self._get(counting)
+        second = self._get(counting)
+        self.assertIs(first, second)
+        self.assertEqual((counting.built, counting.validated), (1, 1))
+
+    def test_concurrent_opens_share_one_validation(self):
+        counting = CountingCredentials(_credentials(), latency=0.05)
+        counting.credentials.odps = counting.odps
+        clients = []
+        threads = [
+            threading.Thread(target=lambda: clients.append(self.pool.get(counting.credentials)))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len({id(client) for client in clients}), 1)
+        self.assertEqual((counting.built, counting.validated), (1, 1))
+
+    def test_profiles_get_their_own_client(self):
+        first = CountingCredentials(_credentials())
+        second = CountingCredentials(_credentials(database="other"))
+        self.assertIsNot(self._get(first), self._get(second))
+
+    def test_failed_validation_is_not_cached(self):
+        counting = CountingCredentials(_credentials(), error=RuntimeError("denied"))
+        with self.assertRaises(DbtConfigError):
+            self._get(counting)
+        counting.error = None
+        self._get(counting)
+        self.assertEqual(counting.validated, 2)
+
+
+class TestConnectionOpen(unittest.TestCase):
+    def test_connections_share_the_pooled_client(self):
+        credentials = _credentials()
+        client = MagicMock()
+        client.is_schema_namespace_enabled.return_value = True
+        pool = MagicMock()
+        pool.get.return_value = client
+        connections = [MagicMock(state="init", credentials=credentials) for _ in range(3)]
+        with patch("dbt.adapters.maxcompute.connections.CLIENT_POOL", pool):
+            for connection in connections:
+                MaxComputeConnectionManager.open(connection)
+        self.assertTrue(all(c.handle.odps is client for c in connections))
+        client.get_project.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
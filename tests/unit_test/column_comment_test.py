@@ -0,0 +1,110 @@
+"""Unit tests for relation and column comment persistence."""
+
+import unittest
+from unittest.mock import MagicMock
+
+from dbt.adapters.contracts.relation import RelationType
+from dbt_common.exceptions import DbtRuntimeError
+from odps.models.table import TableSchema
+
+from dbt.adapters.maxcompute.relation import MaxComputeRelation
+from tests.unit_test.fakes import make_adapter
+
+
+def _table(comments):
+    table = MagicMock()
+    table.table_schema = TableSchema(
+        columns=[
+            TableSchema.TableColumn(name=name, type="string", comment=comment)
+            for name, comment in comments.items()
+        ]
+    )
+    return table
+
+
+def _make_adapter(comments):
+    adapter = make_adapter()
+    adapter._load_table_metadata = MagicMock(return_value=_table(comments))
+    adapter.invalidate_table_metadata = MagicMock()
+    adapter.execute = MagicMock()
+    return adapter
+
+
+def _relation(relation_type=RelationType.Table):
+    return MaxComputeRelation.create(
+        database="proj", schema="sch", identifier="t", type=relation_type
+    )
+
+
+def _docs(**descriptions):
+    return {name: {"name": name, "description": text} for name, text in descriptions.items()}
+
+
+class TestAlterColumnComments(unittest.TestCase):
+    def test_only_changed_comments_in_one_script(self):
+        comments = {f"c{i}": f"doc {i}" for i in range(200)}
+        comments["c7"] = None
+        adapter = _make_adapter(comments)
+        docs = _docs(**{f"c{i}": f"doc {i}" for i in range(200)})
+        docs["c3"]["description"] = "new doc"
+        docs["missing"] = {"description": "not a column"}
+
+        changed = adapter.alter_column_comments(_relation(), docs)
+
+        self.assertEqual(changed, 2)
+        adapter._load_table_metadata.assert_called_once()
+        adapter.execute.assert_called_once()
+        script = adapter.execute.call_args.args[0]
+        self.assertEqual(
+            script.splitlines(),
+            [
+                "ALTER TABLE proj.sch.t CHANGE COLUMN `c3` COMMENT 'new doc';",
+                "ALTER TABLE proj.sch.t CHANGE COLUMN `c7` COMMENT 'doc 7';",
+            ],
+        )
+        adapter.invalidate_table_metadata.assert_called_once()
+
+    def test_nothing_to_change(self):
+        adapter = _make_adapter({"id": None, "name": "doc"})
+        changed = adapter.alter_column_comments(_relation(), _docs(id="", name="doc"))
+        self.assertEqual(changed, 0)
+        adapter.execute.assert_not_called()
+        adapter.invalidate_table_metadata.assert_not_called()
+
+    def test_view_and_materialized_view(self):
+        adapter = _make_adapter({"id": None})
+        adapter.alter_column_comments(_relation(RelationType.View), _docs(id="key"))
+        self.assertEqual(
+            adapter.execute.call_args.args[0],
+            "ALTER VIEW proj.sch.t CHANGE COLUMN `id` COMMENT 'key';",
+        )
+        with self.assertRaises(DbtRuntimeError):
+            adapter.alter_column_comments(
+                _relation(RelationType.MaterializedView), _docs(id="other")
+            )
+
+
+class TestAddComment(unittest.TestCase):
+    def _adapter(self, comment):
+        adapter = _make_adapter({"id": None})
+        adapter._load_table_metadata.return_value.comment = comment
+        adapter.get_odps_table_by_relation = MagicMock()
+        adapter.get_odps_table_by_relation.return_value.view_text = "select 1 as id"
+        return adapter
+
+    def test_unchanged_comment_is_skipped(self):
+        for relation_type in (RelationType.Table, RelationType.View):
+            adapter = self._adapter("doc")
+            self.assertEqual(adapter.add_comment(_relation(relation_type), "doc"), "")
+            adapter.get_odps_table_by_relation.assert_not_called()
+            adapter.invalidate_table_metadata.assert_not_called()
+
+    def test_changed_view_comment_recreates_view(self):
+        adapter = self._adapter(None)
+        sql = adapter.add_comment(_relation(RelationType.View), "doc")
+        self.assertEqual(sql, "CREATE OR REPLACE VIEW proj.sch.t COMMENT 'doc' AS select 1 as id;")
+        adapter.invalidate_table_metadata.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
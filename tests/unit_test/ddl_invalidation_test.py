@@ -0,0 +1,99 @@
+"""Unit tests for metadata invalidation in the DDL macros.
+
+Each macro is rendered on its own with a fake adapter, to check that the
+relations whose DDL it changes are dropped from the metadata caches.
+"""
+
+import os
+import unittest
+
+from dbt_common.clients.jinja import get_environment
+
+from dbt.adapters.maxcompute.relation import MaxComputeRelation
+from dbt.include.maxcompute import PACKAGE_PATH
+
+
+def _relation(identifier):
+    return MaxComputeRelation.create(database="proj", schema="sch", identifier=identifier)
+
+
+class FakeAdapter:
+    """Records invalidations; dbt's sandbox refuses to call MagicMocks."""
+
+    def __init__(self):
+        self.invalidated = []
+
+    def invalidate_table_metadata(self, relation):
+        self.invalidated.append(relation.identifier)
+        return ""
+
+    def convert_type(self, agate_table, index):
+        return "bigint"
+
+    def quote_seed_column(self, column, quote_config):
+        return column
+
+
+class FakeAgateTable:
+    column_names = ["id"]
+
+
+class TestDdlInvalidation(unittest.TestCase):
+    def setUp(self):
+        self.adapter = FakeAdapter()
+        self.statements = []
+
+    def _statement(self, name=None, auto_begin=True, fetch_result=False, caller=None):
+        self.statements.append(caller())
+        return ""
+
+    def _macro(self, path, name, **context):
+        with open(os.path.join(PACKAGE_PATH, "macros", path)) as f:
+            source = f.read()
+        context.update(
+            adapter=self.adapter,
+            statement=self._statement,
+            quote_ref=lambda name: f"`{name}`",
+            **{"return": lambda value: ""},
+        )
+        template = get_environment().from_string(source, globals=context)
+        # dbt prefixes the names of the macros it parses
+        return getattr(template.module, f"dbt_macro__{name}")
+
+    def test_clone(self):
+        clone = self._macro("materializations/clone.sql", "maxcompute__create_or_replace_clone")
+        sql = clone(_relation("model"), _relation("deferred"))
+        self.assertIn("clone table", sql)
+        self.assertEqual(self.adapter.invalidated, ["model"])
+
+    def test_drop_table(self):
+        self._macro("relations/table/drop.sql", "maxcompute__drop_table")(_relation("t"))
+        self.assertIn("drop table if exists", self.statements[0])
+        self.assertEqual(self.adapter.invalidated, ["t"])
+
+    def test_drop_view(self):
+        self._macro("relations/view/drop.sql", "maxcompute__drop_view")(_relation("v"))
+        self.assertEqual(self.adapter.invalidated, ["v"])
+
+    def test_rename_table(self):
+        rename = self._macro("relations/table/rename.sql", "maxcompute__get_rename_table_sql")
+        sql = rename(_relation("t__dbt_tmp"), "t")
+        self.assertIn("rename to `t`", sql)
+        self.assertEqual(self.adapter.invalidated, ["t__dbt_tmp", "t"])
+
+    def test_rename_view(self):
+        rename = self._macro("relations/view/rename.sql", "maxcompute__get_rename_view_sql")
+        rename(_relation("v__dbt_tmp"), "v")
+        self.assertEqual(self.adapter.invalidated, ["v__dbt_tmp", "v"])
+
+    def test_create_csv_table(self):
+        create = self._macro(
+            "materializations/seeds/seeds.sql", "maxcompute__create_csv_table", this=_relation("s")
+        )
+        create({"config": {}}, FakeAgateTable())
+        self.assertIn("id bigint", self.statements[0])
+        self.assertEqual(self.adapter.invalidated, ["s"])
+
+
+if __name__ == "__main__":
+    unittest.main()
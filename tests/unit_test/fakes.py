@@ -0,0 +1,99 @@
+"""Fakes shared by the unit tests."""
+
+import threading
+from unittest.mock import MagicMock
+
+from dbt.adapters.cache import RelationsCache
+from odps.errors import NoSuchObject
+from odps.models.table import TableSchema
+
+from dbt.adapters.maxcompute.impl import MaxComputeAdapter
+from dbt.adapters.maxcompute.probe_cache import SchemaProbeCache
+from dbt.adapters.maxcompute.table_cache import TableCache
+
+CREDENTIALS = {
+    "metadata_threads": 4,
+    "metadata_cache": False,
+    "metadata_cache_path": None,
+    "metadata_cache_max_age": 3600,
+    "wait_policies": None,
+    "catalog_mode": "table",
+    "schema_inference": "query",
+}
+
+
+def make_adapter(odps=None, **credentials):
+    """A MaxComputeAdapter with the state of `__init__` but no dbt config.
+
+    `credentials` override the profile fields in `CREDENTIALS`; with `odps`,
+    `get_odps_client` returns it instead of acquiring a connection.
+    """
+    adapter = MaxComputeAdapter.__new__(MaxComputeAdapter)
+    adapter.config = MagicMock()
+    adapter.config.credentials.configure_mock(**{**CREDENTIALS, **credentials})
+    adapter.cache = RelationsCache()
+    adapter._information_schema_catalog_failed = False
+    adapter._metadata_cache_instance = None
+    adapter._metadata_cache_lock = threading.Lock()
+    adapter._schema_state_lock = threading.Lock()
+    adapter._listed_schemas = {}
+    adapter._changed_schemas = {}
+    adapter._table_cache = TableCache()
+    adapter._probe_cache = SchemaProbeCache()
+    if odps is not None:
+        adapter.get_odps_client = MagicMock(return_value=odps)
+    return adapter
+
+
+class FakeTable:
+    def __init__(self, client, name, project, schema):
+        self._client = client
+        self.name = name
+        self.project = project
+        self.schema = schema
+        self.is_virtual_view = name.startswith("v_")
+        self.is_materialized_view = name.startswith("mv_")
+        self.comment = f"comment of {name}"
+        self.owner = "ALIYUN$owner"
+        self.last_data_modified_time = client.loaded_at.get(name)
+        self.table_schema = TableSchema.from_lists(["id", "name"], ["bigint", "string"])
+
+    def reload(self):
+        self._client.reload(self.name)
+
+
+class FakeOdps:
+    """An ODPS client whose metadata calls can be made to wait for each other.
+
+    With a `barrier`, each reload waits until `barrier.parties` reloads are in
+    flight at the same time, so a pool with fewer workers breaks the barrier
+    instead of passing slowly. `peak` is the largest number of reloads seen in
+    flight at once. `loaded_at` maps table names to their last data
+    modification time.
+    """
+
+    def __init__(self, missing=(), barrier=None, loaded_at=None):
+        self.missing = set(missing)
+        self.loaded_at = dict(loaded_at or {})
+        self.barrier = barrier
+        self.reload_calls = 0
+        self.peak = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    def get_table(self, name, project=None, schema=None):
+        return FakeTable(self, name, project, schema)
+
+    def reload(self, name):
+        with self._lock:
+            self.reload_calls += 1
+            self._in_flight += 1
+            self.peak = max(self.peak, self._in_flight)
+        try:
+            if self.barrier is not None:
+                self.barrier.wait()
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+        if name in self.missing:
+            raise NoSuchObject("Table not found")
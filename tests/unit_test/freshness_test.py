@@ -0,0 +1,60 @@
+"""Unit tests for batch source freshness from table metadata."""
+
+import threading
+import unittest
+from datetime import datetime, timedelta
+
+from dbt.adapters.capability import Capability, Support
+
+from dbt.adapters.maxcompute.impl import MaxComputeAdapter
+from dbt.adapters.maxcompute.relation import MaxComputeRelation
+from tests.unit_test.fakes import FakeOdps, make_adapter
+
+LOADED_AT = datetime(2024, 6, 1, 8, 0, 0)
+
+
+def _fake_odps(count=5, **kwargs):
+    loaded_at = {f"src_{i}": LOADED_AT + timedelta(minutes=i) for i in range(count)}
+    return FakeOdps(loaded_at=loaded_at, **kwargs)
+
+
+def _sources(count):
+    return [
+        MaxComputeRelation.create(database="proj", schema="raw", identifier=f"src_{i}")
+        for i in range(count)
+    ]
+
+
+def _make_adapter(odps, threads=8):
+    return make_adapter(odps, metadata_threads=threads)
+
+
+class TestFreshnessBatch(unittest.TestCase):
+    def test_capability_declared(self):
+        support = MaxComputeAdapter.capabilities()[Capability.TableLastModifiedMetadataBatch]
+        self.assertEqual(support.support, Support.Full)
+
+    def test_all_sources_in_one_pass(self):
+        odps = _fake_odps(missing={"src_2"})
+        sources = _sources(5)
+        responses, freshness = _make_adapter(odps).calculate_freshness_from_metadata_batch(sources)
+        self.assertEqual(responses, [])
+        self.assertEqual(set(freshness), {sources[i] for i in (0, 1, 3, 4)})
+        self.assertEqual(
+            freshness[sources[3]]["max_loaded_at"].replace(tzinfo=None),
+            LOADED_AT + timedelta(minutes=3),
+        )
+        self.assertGreater(freshness[sources[0]]["age"], 0)
+
+    def test_reloads_run_concurrently(self):
+        # Each reload waits for 4 reloads in flight: a smaller pool would break the barrier
+        odps = _fake_odps(count=12, barrier=threading.Barrier(4, timeout=10))
+        _, freshness = _make_adapter(odps, threads=4).calculate_freshness_from_metadata_batch(
+            _sources(12)
+        )
+        self.assertEqual(len(freshness), 12)
+        self.assertEqual(odps.peak, 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
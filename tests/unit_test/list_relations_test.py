@@ -0,0 +1,202 @@
+"""Unit tests for reload-free relation listing.
+
+`list_tables` already reports each table's type, so relation listing only
+reloads entries whose type is missing from the listing.
+"""
+
+import threading
+import unittest
+from unittest.mock import MagicMock
+
+from dbt.adapters.contracts.relation import RelationType
+from odps.errors import NoSuchObject
+from odps.models import Table
+
+from dbt.adapters.maxcompute.relation import MaxComputeRelation
+from dbt.adapters.maxcompute.utils import compile_like_pattern, like_pattern_prefix
+from tests.unit_test.fakes import make_adapter
+
+
+class FakeListedTable:
+    def __init__(self, name, table_type=None, is_view=False, dropped=False, tracker=None):
+        self.name = name
+        self._type = table_type
+        self.project = MagicMock()
+        self.project.name = "proj"
+        self.is_virtual_view = is_view
+        self.is_materialized_view = False
+        self.dropped = dropped
+        self.reload_calls = 0
+        self.tracker = tracker
+
+    def _getattr(self, attr):
+        assert attr == "type"
+        return self._type
+
+    def get_schema(self):
+        schema = MagicMock()
+        schema.name = "sch"
+        return schema
+
+    def reload(self):
+        self.reload_calls += 1
+        if self.tracker is not None:
+            self.tracker.reload()
+        if self.dropped:
+            raise NoSuchObject("Table not found")
+
+
+class ReloadTracker:
+    """Peak number of reloads in flight; each reload waits on `barrier`."""
+
+    def __init__(self, barrier):
+        self.barrier = barrier
+        self.peak = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    def reload(self):
+        with self._lock:
+            self._in_flight += 1
+            self.peak = max(self.peak, self._in_flight)
+        try:
+            self.barrier.wait()
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+
+def _make_adapter(threads=4):
+    return make_adapter(metadata_threads=threads)
+
+
+class TestRelationTypeFromListing(unittest.TestCase):
+    def test_known_types(self):
+        cases = {
+            Table.Type.MANAGED_TABLE: RelationType.Table,
+            Table.Type.EXTERNAL_TABLE: RelationType.Table,
+            Table.Type.VIRTUAL_VIEW: RelationType.View,
+            Table.Type.MATERIALIZED_VIEW: RelationType.MaterializedView,
+        }
+        for table_type, relation_type in cases.items():
+            table = FakeListedTable("t", table_type)
+            self.assertEqual(MaxComputeRelation.relation_type_from_listing(table), relation_type)
+
+    def test_unknown_type_is_ambiguous(self):
+        for table_type in (None, Table.Type.UNKNOWN):
+            table = FakeListedTable("t", table_type)
+            self.assertIsNone(MaxComputeRelation.relation_type_from_listing(table))
+
+
+class TestListSchemaRelations(unittest.TestCase):
+    def test_only_ambiguous_entries_are_reloaded(self):
+        tables = [
+            FakeListedTable("a", Table.Type.MANAGED_TABLE),
+            FakeListedTable("b", Table.Type.VIRTUAL_VIEW),
+            FakeListedTable("c", None, is_view=True),
+            FakeListedTable("d", None, dropped=True),
+        ]
+        odps = MagicMock()
+        odps.list_tables.return_value = iter(tables)
+
+        relations = _make_adapter()._list_schema_relations(odps, "proj", "sch")
+
+        self.assertEqual(
+            [(r.identifier, r.type) for r in relations],
+            [("a", RelationType.Table), ("b", RelationType.View), ("c", RelationType.View)],
+        )
+        self.assertEqual([t.reload_calls for t in tables], [0, 0, 1, 1])
+        odps.list_tables.assert_called_once_with(project="proj", schema="sch")
+
+    def test_schemas_share_one_pool(self):
+        tracker = ReloadTracker(threading.Barrier(2, timeout=10))
+        tables = {
+            f"s{i}": [FakeListedTable(f"t{i}_{j}", tracker=tracker) for j in range(2)]
+            for i in range(4)
+        }
+        odps = MagicMock()
+        odps.list_tables.side_effect = lambda project, schema: iter(tables[schema])
+
+        relations = _make_adapter(threads=2)._list_schemas_relations(
+            odps, [("proj", schema) for schema in tables]
+        )
+
+        self.assertEqual(len(relations), 8)
+        # Listings and reloads of all schemas run on the same 2 workers
+        self.assertEqual(tracker.peak, 2)
+
+    def test_missing_schema_returns_empty(self):
+        odps = MagicMock()
+        odps.list_tables.side_effect = NoSuchObject("Schema not found")
+        self.assertEqual(_make_adapter()._list_schema_relations(odps, "proj", "sch"), [])
+
+
+class TestLikePatterns(unittest.TestCase):
+    def test_prefix(self):
+        self.assertEqual(like_pattern_prefix("stg_orders%"), "stg")
+        self.assertEqual(like_pattern_prefix("orders%"), "orders")
+        self.assertEqual(like_pattern_prefix("orders"), "orders")
+        self.assertIsNone(like_pattern_prefix("%orders"))
+        self.assertIsNone(like_pattern_prefix(""))
+
+    def test_compiled_once(self):
+        self.assertIs(compile_like_pattern("a%"), compile_like_pattern("a%"))
+        self.assertTrue(compile_like_pattern("a_c%").fullmatch("abcdef"))
+        self.assertFalse(compile_like_pattern("a_c%").fullmatch("xabc"))
+
+
+class TestRelationsByPattern(unittest.TestCase):
+    def _odps(self, tables_by_schema):
+        odps = MagicMock()
+        odps.list_schemas.return_value = [MagicMock() for _ in tables_by_schema]
+        for schema, name in zip(odps.list_schemas.return_value, tables_by_schema):
+            schema.name = name
+        odps.list_tables.side_effect = lambda project, schema, prefix=None: iter(
+            t for t in tables_by_schema[schema] if t.name.startswith(prefix or "")
+        )
+        return odps
+
+    def test_prefix_pushed_down_and_types_from_listing(self):
+        tables = {
+            "s1": [
+                FakeListedTable("orders_a", Table.Type.MANAGED_TABLE),
+                FakeListedTable("orders_tmp", Table.Type.MANAGED_TABLE),
+                FakeListedTable("orders", Table.Type.VIRTUAL_VIEW),
+            ],
+            "s2": [FakeListedTable("orders_b", Table.Type.VIRTUAL_VIEW)],
+            "other": [FakeListedTable("orders_c", Table.Type.MANAGED_TABLE)],
+        }
+        odps = self._odps(tables)
+        adapter = _make_adapter()
+        adapter.get_odps_client = MagicMock(return_value=odps)
+
+        relations = adapter.get_relations_by_pattern("s%", "orders_%", "%tmp", "proj")
+
+        self.assertEqual(
+            sorted((r.identifier, r.type) for r in relations),
+            [("orders_a", RelationType.Table), ("orders_b", RelationType.View)],
+        )
+        prefixes = {call.kwargs.get("prefix") for call in odps.list_tables.call_args_list}
+        self.assertEqual(prefixes, {"orders"})
+        self.assertEqual(
+            sorted(call.kwargs["schema"] for call in odps.list_tables.call_args_list),
+            ["s1", "s2"],
+        )
+        for schema_tables in tables.values():
+            self.assertTrue(all(t.reload_calls == 0 for t in schema_tables))
+
+    def test_relations_by_prefix(self):
+        tables = {
+            "s1": [
+                FakeListedTable("stg_a", Table.Type.MANAGED_TABLE),
+                FakeListedTable("stg_old", Table.Type.MANAGED_TABLE),
+            ]
+        }
+        adapter = _make_adapter()
+        adapter.get_odps_client = MagicMock(return_value=self._odps(tables))
+        relations = adapter.get_relations_by_prefix("s1", "stg", "%old", "proj")
+        self.assertEqual([r.identifier for r in relations], ["stg_a"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,195 @@
+"""Unit tests for the on-disk table metadata cache.
+
+Each test opens the SQLite file twice to stand for two dbt invocations: the
+first one reloads tables and fills the cache, the second one only lists the
+schema and must be able to answer from the cache.
+"""
+
+import os
+import tempfile
+import time
+import unittest
+from datetime import datetime
+from unittest.mock import MagicMock
+
+from dbt.adapters.contracts.relation import RelationType
+from odps.models.table import TableSchema
+
+from dbt.adapters.maxcompute.metadata_cache import MetadataCache, metadata_version
+from dbt.adapters.maxcompute.relation import MaxComputeRelation
+from tests.unit_test.fakes import make_adapter
+
+CREATED = datetime(2024, 1, 1, 8, 0, 0)
+ALTERED = datetime(2024, 6, 1, 8, 0, 0)
+
+
+class FakeTable:
+    """A table as returned by `list_tables`, or after `reload()`."""
+
+    def __init__(self, name, altered=ALTERED, is_view=False):
+        self.name = name
+        self.project = MagicMock()
+        self.project.name = "proj"
+        self.is_virtual_view = is_view
+        self.is_materialized_view = False
+        self.comment = f"comment of {name}"
+        self.owner = "ALIYUN$owner"
+        partition = TableSchema.TablePartition(name="pt", type="string", comment="day")
+        self.table_schema = TableSchema(
+            columns=[
+                TableSchema.TableColumn(name="id", type="bigint", comment="key"),
+                TableSchema.TableColumn(name="amount", type="decimal(10,2)", comment=None),
+            ],
+            partitions=[partition],
+        )
+        self._times = {
+            "creation_time": CREATED,
+            "last_data_modified_time": datetime(2024, 6, 2, 8, 0, 0),
+            "last_meta_modified_time": altered,
+        }
+        self.reload_calls = 0
+
+    def _getattr(self, attr):
+        if attr == "type":
+            # The listing did not carry the table type.
+            return None
+        return self._times[attr]
+
+    def get_schema(self):
+        schema = MagicMock()
+        schema.name = "sch"
+        return schema
+
+    def reload(self):
+        self.reload_calls += 1
+
+
+class TestMetadataCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "target", "maxcompute_metadata.db")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_entry_survives_invocations(self):
+        first = MetadataCache(self.path)
+        first.store_table("proj", "sch", FakeTable("t"))
+        first.close()
+
+        second = MetadataCache(self.path)
+        # Not listed in this invocation yet, so the version is unknown.
+        self.assertIsNone(second.cached_table("proj", "sch", "t"))
+        second.observe("proj", "sch", FakeTable("t"))
+        cached = second.cached_table("PROJ", "SCH", "T")
+        self.assertEqual(cached.comment, "comment of t")
+        self.assertEqual(
+            [(c.name, c.type.name, c.comment) for c in cached.table_schema.simple_columns],
+            [("id", "bigint", "key"), ("amount", "decimal(10,2)", None)],
+        )
+        self.assertEqual([p.name for p in cached.table_schema._partitions], ["pt"])
+        second.close()
+
+    def test_changed_table_is_not_served(self):
+        cache = MetadataCache(self.path)
+        cache.store_table("proj", "sch", FakeTable("t"))
+        # DDL run outside dbt, e.g. ALTER TABLE ... ADD COLUMNS
+        cache.observe("proj", "sch", FakeTable("t", altered=datetime(2024, 7, 1)))
+        self.assertIsNone(cache.cached_table("proj", "sch", "t"))
+        cache.close()
+
+    def test_listing_without_ddl_time_is_not_served(self):
+        cache = MetadataCache(self.path)
+        cache.store_table("proj", "sch", FakeTable("t"))
+        cache.observe("proj", "sch", FakeTable("t", altered=None))
+        self.assertIsNone(cache.cached_table("proj", "sch", "t"))
+        cache.close()
+
+    def test_data_change_keeps_entry(self):
+        cache = MetadataCache(self.path)
+        cache.store_table("proj", "sch", FakeTable("t"))
+        loaded = FakeTable("t")
+        loaded._times["last_data_modified_time"] = datetime(2024, 7, 1)
+        cache.observe("proj", "sch", loaded)
+        self.assertIsNotNone(cache.cached_table("proj", "sch", "t"))
+        cache.close()
+
+    def test_invalidate(self):
+        cache = MetadataCache(self.path)
+        cache.store_table("proj", "sch", FakeTable("t"))
+        cache.invalidate("proj", "sch", "t")
+        self.assertIsNone(cache.cached_table("proj", "sch", "t"))
+        self.assertIsNone(cache.get("proj", "sch", "t", metadata_version(FakeTable("t"))))
+        cache.close()
+
+    def test_dropped_and_expired_entries_are_evicted(self):
+        cache = MetadataCache(self.path)
+        version = metadata_version(FakeTable("t"))
+        cache.store_table("proj", "sch", FakeTable("a"))
+        cache.store_table("proj", "sch", FakeTable("b"))
+        cache.retain_schema("proj", "sch", ["a"])
+        self.assertIsNotNone(cache.get("proj", "sch", "a", version))
+        self.assertIsNone(cache.get("proj", "sch", "b", version))
+        cache.close()
+
+        expired = MetadataCache(self.path, max_age=0)
+        time.sleep(0.01)
+        expired.evict_expired()
+        self.assertIsNone(expired.get("proj", "sch", "a", version))
+        expired.close()
+
+
+def _make_adapter(path):
+    return make_adapter(metadata_cache=True, metadata_cache_path=path)
+
+
+class TestAdapterMetadataCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "maxcompute_metadata.db")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _invocation(self, tables):
+        adapter = _make_adapter(self.path)
+        odps = MagicMock()
+        odps.list_tables.return_value = iter(tables)
+        odps.get_table.side_effect = lambda name, project=None, schema=None: FakeTable(name)
+        adapter.get_odps_client = MagicMock(return_value=odps)
+        relations = adapter._list_schema_relations(odps, "proj", "sch")
+        return adapter, odps, relations
+
+    def test_second_invocation_skips_reloads(self):
+        first_tables = [FakeTable("t"), FakeTable("v", is_view=True)]
+        adapter, odps, relations = self._invocation(first_tables)
+        self.assertEqual([t.reload_calls for t in first_tables], [1, 1])
+        self.assertEqual([r.type for r in relations], [RelationType.Table, RelationType.View])
+        self.assertTrue(odps.list_tables.call_args.kwargs["extended"])
+        adapter._metadata_cache().close()
+
+        second_tables = [FakeTable("t"), FakeTable("v", is_view=True)]
+        adapter, odps, relations = self._invocation(second_tables)
+        self.assertEqual([t.reload_calls for t in second_tables], [0, 0])
+        self.assertEqual([r.type for r in relations], [RelationType.Table, RelationType.View])
+
+        relation = MaxComputeRelation.create(database="proj", schema="sch", identifier="t")
+        columns = adapter.get_columns_in_relation(relation)
+        self.assertEqual([c.name for c in columns], ["id", "amount", "pt"])
+        odps.get_table.assert_not_called()
+
+        # Once invalidated, the relation's metadata is read from ODPS again.
+        adapter.invalidate_table_metadata(relation)
+        adapter.get_columns_in_relation(relation)
+        odps.get_table.assert_called_once()
+        adapter._metadata_cache().close()
+
+    def test_disabled_by_default(self):
+        adapter = _make_adapter(self.path)
+        adapter.config.credentials.metadata_cache = False
+        self.assertIsNone(adapter._metadata_cache())
+        self.assertFalse(os.path.exists(self.path))
+
+
+if __name__ == "__main__":
+    unittest.main()
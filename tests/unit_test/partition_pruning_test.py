@@ -0,0 +1,198 @@
+"""Unit tests for reading the partitions touched by an incremental run."""
+
+import os
+import unittest
+from unittest.mock import MagicMock
+
+from dbt_common.clients.jinja import get_environment
+from dbt_common.exceptions.macros import MacroReturn
+from odps.models.table import TableSchema
+from odps.types import PartitionSpec
+
+from dbt.adapters.maxcompute.relation import MaxComputeRelation
+from dbt.adapters.maxcompute.relation_configs import PartitionConfig
+from dbt.include.maxcompute import PACKAGE_PATH
+from dbt.adapters.maxcompute.utils import unquote_literal
+from tests.unit_test.fakes import make_adapter
+
+
+def _table(partitions, specs=(), transactional=False, columns=(("id", "bigint"),)):
+    table = MagicMock()
+    table.is_transactional = transactional
+    table.table_schema = TableSchema(
+        columns=[TableSchema.TableColumn(name=name, type=type_) for name, type_ in columns],
+        partitions=[TableSchema.TableColumn(name=name, type=type_) for name, type_ in partitions],
+    )
+    table.iterate_partitions.return_value = [
+        MagicMock(partition_spec=PartitionSpec(spec)) for spec in specs
+    ]
+    return table
+
+
+def _make_adapter(target, source):
+    adapter = make_adapter()
+    adapter._load_table_metadata = MagicMock(return_value=target)
+    adapter.get_odps_table_by_relation = MagicMock(return_value=source)
+    return adapter
+
+
+TARGET = MaxComputeRelation.create(database="proj", schema="sch", identifier="t")
+TEMP = MaxComputeRelation.create(database="proj", schema="sch", identifier="t__dbt_tmp")
+
+
+class TestPartitionPredicates(unittest.TestCase):
+    def test_values_of_each_partition_column(self):
+        partitions = [("ds", "string"), ("hh", "bigint")]
+        source = _table(
+            partitions, ["ds='20240102',hh=1", "ds='20240101',hh=23", "ds='20240102',hh=2"]
+        )
+        adapter = _make_adapter(_table(partitions), source)
+
+        self.assertEqual(
+            adapter.partition_predicates(TEMP, TARGET, "DBT_INTERNAL_DEST"),
+            [
+                "DBT_INTERNAL_DEST.`ds` in ('20240101', '20240102')",
+                "DBT_INTERNAL_DEST.`hh` in (1, 2, 23)",
+            ],
+        )
+        # The freshly filled temp table is never read from the cache
+        adapter.get_odps_table_by_relation.assert_called_once_with(TEMP, 3, use_cache=False)
+
+    def test_no_predicates(self):
+        ds = [("ds", "string")]
+        cases = [
+            (_table([]), _table([])),
+            (_table(ds), _table([("dt", "string")], ["dt='1'"])),
+            (_table(ds), _table(ds)),
+            (None, _table(ds, ["ds='1'"])),
+        ]
+        for target, source in cases:
+            adapter = _make_adapter(target, source)
+            self.assertEqual(adapter.partition_predicates(TEMP, TARGET), [])
+
+    def test_too_many_values(self):
+        ds = [("ds", "string")]
+        adapter = _make_adapter(_table(ds), _table(ds, [f"ds='{i}'" for i in range(5)]))
+        self.assertEqual(adapter.partition_predicates(TEMP, TARGET, max_values=4), [])
+        self.assertEqual(len(adapter.partition_predicates(TEMP, TARGET, max_values=5)), 1)
+
+
+class TestInsertOverwritePartitions(unittest.TestCase):
+    def test_partitions_without_data(self):
+        source = _table([("ds", "string")], ["ds='20240101'", "ds='20240103'"])
+        adapter = _make_adapter(None, source)
+        partitions = ["'20240101'", "'20240102'", '"20240103"']
+        self.assertEqual(adapter.partitions_without_data(TEMP, partitions), ["'20240102'"])
+        self.assertEqual(adapter.partitions_without_data(TEMP, partitions[::2]), [])
+        # An expression cannot be compared with the partition values
+        self.assertIsNone(adapter.partitions_without_data(TEMP, ["date_sub('20240102', 1)"]))
+
+    def test_multi_level_partitions_are_not_compared(self):
+        source = _table([("ds", "string"), ("hh", "string")], ["ds='1',hh='2'"])
+        adapter = _make_adapter(None, source)
+        self.assertIsNone(adapter.partitions_without_data(TEMP, ["'1'"]))
+        self.assertEqual(adapter.list_partitions(TEMP), ["ds=1,hh=2"])
+
+    def test_clone_partitions_sql(self):
+        source = _table([("ds", "string")], ["ds='1'", "ds='2'", "ds='3'"])
+        adapter = _make_adapter(None, source)
+        self.assertEqual(
+            adapter.clone_partitions_sql(TEMP, TARGET, batch_size=2).splitlines(),
+            [
+                "clone table `proj`.`sch`.`t__dbt_tmp` partition(ds='1'), partition(ds='2') "
+                "to `proj`.`sch`.`t` if exists overwrite;",
+                "clone table `proj`.`sch`.`t__dbt_tmp` partition(ds='3') "
+                "to `proj`.`sch`.`t` if exists overwrite;",
+            ],
+        )
+        self.assertEqual(
+            _make_adapter(None, _table([("ds", "string")])).clone_partitions_sql(TEMP, TARGET), ""
+        )
+
+    def test_clone_falls_back_for_transactional_tables(self):
+        source = _table([("ds", "string")], ["ds='1'"])
+        target = _table([("ds", "string")], transactional=True)
+        adapter = _make_adapter(None, source)
+        adapter.get_odps_table_by_relation.side_effect = lambda relation, *args, **kwargs: (
+            source if relation is TEMP else target
+        )
+        self.assertIsNone(adapter.clone_partitions_sql(TEMP, TARGET))
+        target.is_transactional = False
+        self.assertIn("clone table", adapter.clone_partitions_sql(TEMP, TARGET))
+        source.is_transactional = True
+        self.assertIsNone(adapter.clone_partitions_sql(TEMP, TARGET))
+
+    def test_clone_falls_back_when_columns_differ(self):
+        source = _table(
+            [("ds", "string")], ["ds='1'"], columns=[("id", "bigint"), ("v", "string")]
+        )
+        targets = {
+            "reordered": _table([("ds", "string")], columns=[("v", "string"), ("id", "bigint")]),
+            "retyped": _table([("ds", "string")], columns=[("id", "int"), ("v", "string")]),
+            "extended": _table([("ds", "string")], columns=[("id", "bigint")]),
+            "repartitioned": _table(
+                [("dt", "string")], columns=[("id", "bigint"), ("v", "string")]
+            ),
+        }
+        for name, target in targets.items():
+            adapter = _make_adapter(None, source)
+            adapter.get_odps_table_by_relation.side_effect = lambda relation, *a, **k: (
+                source if relation is TEMP else target
+            )
+            self.assertIsNone(adapter.clone_partitions_sql(TEMP, TARGET), name)
+
+    def test_can_clone_partitions(self):
+        self.assertTrue(
+            _make_adapter(None, _table([("ds", "string")])).can_clone_partitions(TARGET)
+        )
+        transactional = _table([("ds", "string")], transactional=True)
+        self.assertFalse(_make_adapter(None, transactional).can_clone_partitions(TARGET))
+        self.assertFalse(_make_adapter(None, None).can_clone_partitions(TARGET))
+
+    def test_unquote_literal(self):
+        self.assertEqual(unquote_literal(" '2024-01-01' "), "2024-01-01")
+        self.assertEqual(unquote_literal("20240101"), "20240101")
+        self.assertIsNone(unquote_literal("'it\\'s'"))
+        self.assertIsNone(unquote_literal("current_date()"))
+
+
+def _return(value):
+    raise MacroReturn(value)
+
+
+def _covers_partitions(unique_key, partition_by):
+    path = os.path.join(PACKAGE_PATH, "macros/materializations/incremental/incremental.sql")
+    with open(path) as f:
+        template = get_environment().from_string(f.read(), globals={"return": _return})
+    # dbt prefixes the names of the macros it parses
+    macro = template.module.dbt_macro__mc_unique_key_covers_partitions
+    try:
+        macro(unique_key, PartitionConfig.parse(partition_by))
+    except MacroReturn as e:
+        return e.value
+
+
+class TestUniqueKeyCoversPartitions(unittest.TestCase):
+    def test_unique_key_with_partition_columns(self):
+        partition_by = {"fields": "ds, hh"}
+        self.assertTrue(_covers_partitions("id,ds,hh", partition_by))
+        self.assertTrue(_covers_partitions(["id", "DS", "hh"], partition_by))
+
+    def test_unique_key_without_partition_column(self):
+        # A key matched in a partition the delta does not touch would be
+        # inserted a second time if the merge were pruned to the delta
+        self.assertFalse(_covers_partitions("id", {"fields": "ds"}))
+        self.assertFalse(_covers_partitions(["id", "ds"], {"fields": "ds,hh"}))
+
+    def test_auto_partition_on_key_column(self):
+        partition_by = {"fields": "event_time", "data_types": "timestamp"}
+        self.assertTrue(_covers_partitions(["id", "event_time"], partition_by))
+        self.assertFalse(_covers_partitions("id", partition_by))
+
+    def test_no_unique_key_or_partitions(self):
+        self.assertFalse(_covers_partitions(None, {"fields": "ds"}))
+        self.assertFalse(_covers_partitions("id,ds", None))
+
+
+if __name__ == "__main__":
+    unittest.main()
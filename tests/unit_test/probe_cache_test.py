@@ -0,0 +1,61 @@
+"""Unit tests for the per-invocation cache of query schema probes."""
+
+import unittest
+from unittest.mock import MagicMock
+
+from dbt.adapters.maxcompute.probe_cache import probe_key
+from dbt.adapters.maxcompute.relation import MaxComputeRelation
+from tests.unit_test.fakes import make_adapter
+
+PROBE = "select * from (\n  select id, name from `proj`.`sch`.`orders`\n) as __dbt_sbq where false limit 0"
+
+
+def _make_adapter():
+    adapter = make_adapter()
+    cursor = MagicMock()
+    cursor.description = [("id", "bigint"), ("name", "string")]
+    adapter.connections = MagicMock()
+    adapter.connections.add_select_query.return_value = (None, cursor)
+    return adapter
+
+
+class TestProbeKey(unittest.TestCase):
+    def test_whitespace_and_trailing_semicolon_are_ignored(self):
+        self.assertEqual(probe_key(PROBE), probe_key(" ".join(PROBE.split()) + ";"))
+
+    def test_settings_are_part_of_the_key(self):
+        with_hints = "set odps.sql.type.system.odps2=true;\nset a=b;\n" + PROBE
+        reordered = "set a=b;\nset odps.sql.type.system.odps2=true;\n" + PROBE
+        self.assertNotEqual(probe_key(PROBE), probe_key(with_hints))
+        self.assertEqual(probe_key(with_hints), probe_key(reordered))
+
+
+class TestSchemaProbeCache(unittest.TestCase):
+    def test_each_query_is_probed_once(self):
+        adapter = _make_adapter()
+        first = adapter.get_column_schema_from_query(PROBE)
+        second = adapter.get_column_schema_from_query("  " + PROBE + "\n")
+        self.assertEqual(
+            [(c.name, c.dtype) for c in second], [("id", "bigint"), ("name", "string")]
+        )
+        self.assertEqual([c.name for c in first], [c.name for c in second])
+        adapter.connections.add_select_query.assert_called_once()
+        self.assertEqual(adapter._probe_cache.stats(), {"hits": 1, "probes": 1, "size": 1})
+
+    def test_ddl_on_a_read_relation_drops_the_probe(self):
+        adapter = _make_adapter()
+        adapter.get_column_schema_from_query(PROBE)
+        adapter.invalidate_table_metadata(
+            MaxComputeRelation.create(database="proj", schema="sch", identifier="customers")
+        )
+        adapter.get_column_schema_from_query(PROBE)
+        self.assertEqual(adapter.connections.add_select_query.call_count, 1)
+        adapter.invalidate_table_metadata(
+            MaxComputeRelation.create(database="proj", schema="sch", identifier="Orders")
+        )
+        adapter.get_column_schema_from_query(PROBE)
+        self.assertEqual(adapter.connections.add_select_query.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
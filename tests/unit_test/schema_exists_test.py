@@ -0,0 +1,72 @@
+"""Unit tests for check_schema_exists.
+
+Schemas that were not touched by this process are answered from the
+relation cache or from one `list_schemas` call; only schemas created or
+dropped by this process are polled until the server agrees.
+"""
+
+import unittest
+from unittest.mock import MagicMock
+
+
+from dbt.adapters.maxcompute.relation import MaxComputeRelation
+from tests.unit_test.fakes import make_adapter
+
+
+def _named(name):
+    schema = MagicMock()
+    schema.name = name
+    return schema
+
+
+def _make_adapter(schemas=("existing",)):
+    odps = MagicMock()
+    odps.list_schemas.side_effect = lambda project: [_named(name) for name in schemas]
+    wait_policies = {"schema_visible": {"initial_delay": 0, "jitter": 0, "max_attempts": 5}}
+    return make_adapter(odps, wait_policies=wait_policies), odps
+
+
+class TestCheckSchemaExists(unittest.TestCase):
+    def test_answers_from_one_listing(self):
+        adapter, odps = _make_adapter()
+        self.assertTrue(adapter.check_schema_exists("proj", "Existing"))
+        self.assertFalse(adapter.check_schema_exists("proj", "missing"))
+        self.assertTrue(adapter.check_schema_exists("`proj`", "`existing`"))
+        odps.list_schemas.assert_called_once_with("proj")
+        odps.exist_schema.assert_not_called()
+
+    def test_answers_from_relation_cache(self):
+        adapter, odps = _make_adapter(schemas=())
+        adapter.cache.add(MaxComputeRelation.create(database="proj", schema="sch", identifier="t"))
+        self.assertTrue(adapter.check_schema_exists("proj", "sch"))
+        odps.list_schemas.assert_not_called()
+
+    def test_polls_after_create_until_visible(self):
+        adapter, odps = _make_adapter(schemas=())
+        odps.exist_schema.side_effect = [False, False, True]
+        adapter.create_schema(MaxComputeRelation.create(database="proj", schema="new"))
+        self.assertTrue(adapter.check_schema_exists("proj", "new"))
+        self.assertEqual(odps.exist_schema.call_count, 3)
+        # Once observed, later checks no longer poll.
+        self.assertTrue(adapter.check_schema_exists("proj", "new"))
+        self.assertEqual(odps.exist_schema.call_count, 3)
+
+    def test_polls_after_drop(self):
+        adapter, odps = _make_adapter()
+        adapter.list_relations_without_caching = MagicMock(return_value=[])
+        self.assertTrue(adapter.check_schema_exists("proj", "existing"))
+        odps.exist_schema.side_effect = [True, False]
+        adapter.drop_schema(MaxComputeRelation.create(database="proj", schema="existing"))
+        self.assertFalse(adapter.check_schema_exists("proj", "existing"))
+        self.assertEqual(odps.exist_schema.call_count, 2)
+
+    def test_gives_up_with_last_observed_state(self):
+        adapter, odps = _make_adapter(schemas=())
+        odps.exist_schema.return_value = False
+        adapter.create_schema(MaxComputeRelation.create(database="proj", schema="new"))
+        self.assertFalse(adapter.check_schema_exists("proj", "new"))
+        self.assertEqual(odps.exist_schema.call_count, 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+"""Unit tests for output schema inference from EXPLAIN plans."""
+
+import unittest
+from unittest.mock import MagicMock
+
+from dbt.adapters.maxcompute.schema_inference import explain_query_schema, parse_explain_schema
+from tests.unit_test.fakes import make_adapter
+
+PLAN = """job0 is root job
+
+In Job job0:
+root Tasks: M1
+
+In Task M1:
+    Data source: proj.sch.orders
+    TS: proj.sch.orders
+        FIL: false
+            SEL: id, amount, CAST(created AS DATE) _c2, tags
+                FS: output: Screen
+                    schema:
+                      orders.id (bigint) AS id
+                      amount (decimal(10,2))
+                      _c2 (date) AS created_date
+                      tags (map<string,array<bigint>>) AS tags
+
+
+OK
+"""
+
+
+class TestParseExplainSchema(unittest.TestCase):
+    def test_screen_schema(self):
+        self.assertEqual(
+            parse_explain_schema(PLAN),
+            [
+                ("id", "bigint"),
+                ("amount", "decimal(10,2)"),
+                ("created_date", "date"),
+                ("tags", "map<string,array<bigint>>"),
+            ],
+        )
+
+    def test_backquoted_names(self):
+        plan = (
+            "FS: output: Screen\n"
+            "    schema:\n"
+            "      `order id` (bigint) AS `order id`\n"
+            "      t.`unit price` (double)\n"
+            "  OK\n"
+        )
+        self.assertEqual(
+            parse_explain_schema(plan), [("order id", "bigint"), ("unit price", "double")]
+        )
+
+    def test_section_ends_at_dedent(self):
+        plan = PLAN.replace("\n\n\nOK", "\n            FS: output: Other\nOK")
+        self.assertEqual(len(parse_explain_schema(plan)), 4)
+
+    def test_unparseable_column_is_not_truncated(self):
+        plan = PLAN.replace("_c2 (date) AS created_date", "_c2 date AS created_date")
+        self.assertIsNone(parse_explain_schema(plan))
+
+    def test_unexpected_layout(self):
+        self.assertIsNone(parse_explain_schema("job0 is root job\nOK"))
+        self.assertIsNone(parse_explain_schema("FS: output: Screen\n  columns: id"))
+
+
+class TestExplainQuerySchema(unittest.TestCase):
+    def test_settings_become_hints(self):
+        odps = MagicMock()
+        odps.execute_sql.return_value.get_task_results.return_value = {"AnonymousSQLTask": PLAN}
+        sql = "set odps.sql.allow.fullscan=false;\nselect * from (select 1) as __dbt_sbq limit 0;"
+        self.assertEqual(len(explain_query_schema(odps, sql)), 4)
+        (statement,) = odps.execute_sql.call_args.args
+        hints = odps.execute_sql.call_args.kwargs["hints"]
+        self.assertEqual(statement, "explain select * from (select 1) as __dbt_sbq limit 0;")
+        self.assertEqual(hints["odps.sql.allow.fullscan"], "false")
+        self.assertNotIn("odps.sql.submit.mode", hints)
+
+
+def _make_adapter(mode, plan=PLAN):
+    odps = MagicMock()
+    odps.execute_sql.return_value.get_task_results.return_value = {"task": plan}
+    adapter = make_adapter(odps, schema_inference=mode)
+    cursor = MagicMock()
+    cursor.description = [("id", "bigint")]
+    adapter.connections = MagicMock()
+    adapter.connections.add_select_query.return_value = (None, cursor)
+    return adapter, odps
+
+
+class TestAdapterSchemaInference(unittest.TestCase):
+    def test_explain_avoids_running_the_query(self):
+        adapter, _ = _make_adapter("explain")
+        columns = adapter.get_column_schema_from_query("select 1")
+        self.assertEqual([c.name for c in columns], ["id", "amount", "created_date", "tags"])
+        self.assertEqual(columns[1].dtype, "decimal(10,2)")
+        adapter.connections.add_select_query.assert_not_called()
+
+    def test_falls_back_to_the_query(self):
+        adapter, odps = _make_adapter("explain", plan="unexpected")
+        self.assertEqual(
+            [c.name for c in adapter.get_column_schema_from_query("select 1")], ["id"]
+        )
+        odps.execute_sql.side_effect = RuntimeError("ODPS-0130161: parse error")
+        adapter.get_column_schema_from_query("select 2")
+        self.assertEqual(adapter.connections.add_select_query.call_count, 2)
+
+    def test_disabled_by_default(self):
+        adapter, odps = _make_adapter("query")
+        adapter.get_column_schema_from_query("select 1")
+        odps.execute_sql.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+"""Unit tests for assembling materialization steps and hooks into scripts."""
+
+import unittest
+
+from dbt.adapters.maxcompute.utils import returns_rows
+from tests.unit_test.fakes import make_adapter
+
+
+class TestFuseSqlScript(unittest.TestCase):
+    def setUp(self):
+        self.adapter = make_adapter()
+
+    def test_headers_are_hoisted(self):
+        script = self.adapter.fuse_sql_script(
+            [
+                "set odps.sql.type.system.odps2=true;\ncreate table t__tmp (id bigint);\n"
+                "insert into t__tmp select 1",
+                "set odps.sql.type.system.odps2=true;\nset a=b;\nmerge into t using t__tmp on 1=1;",
+                "drop table if exists t__tmp",
+            ]
+        )
+        self.assertEqual(
+            script.splitlines(),
+            [
+                "set odps.sql.type.system.odps2=true;",
+                "set a=b;",
+                "create table t__tmp (id bigint);",
+                "insert into t__tmp select 1;",
+                "merge into t using t__tmp on 1=1;",
+                "drop table if exists t__tmp;",
+            ],
+        )
+
+    def test_empty_steps_are_skipped(self):
+        self.assertEqual(self.adapter.fuse_sql_script(["", "  \n", None, "select 1"]), "select 1;")
+
+
+class TestBatchHookSql(unittest.TestCase):
+    def setUp(self):
+        self.adapter = make_adapter()
+
+    def test_hooks_with_same_settings_share_a_script(self):
+        hooks = [
+            "grant select on table t to user u",
+            "analyze table t compute statistics",
+            "set odps.merge.smallfile.filesize.threshold=64;\nalter table t merge smallfiles",
+            "set odps.merge.smallfile.filesize.threshold=64;\nalter table t2 merge smallfiles;",
+            "insert into audit values ('t')",
+        ]
+        self.assertEqual(
+            self.adapter.batch_hook_sql(hooks),
+            [
+                "grant select on table t to user u;\nanalyze table t compute statistics;",
+                "set odps.merge.smallfile.filesize.threshold=64;\n"
+                "alter table t merge smallfiles;\nalter table t2 merge smallfiles;",
+                "insert into audit values ('t');",
+            ],
+        )
+
+    def test_hooks_returning_data_run_one_by_one(self):
+        hooks = [
+            "analyze table t compute statistics",
+            "set a=b;\n-- audit\nselect count(*) from t",
+        ]
+        self.assertEqual(self.adapter.batch_hook_sql(hooks), hooks)
+
+    def test_returns_rows(self):
+        self.assertTrue(returns_rows("/* audit */ WITH x AS (select 1) select * from x"))
+        self.assertTrue(returns_rows("insert into t values (1); desc t"))
+        self.assertFalse(returns_rows("-- select\ninsert into t select * from s"))
+        self.assertFalse(returns_rows(""))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+"""Unit tests for the in-process cache of reloaded ODPS tables."""
+
+import unittest
+from unittest.mock import MagicMock
+
+from odps.errors import NoSuchObject
+from odps.models import Table
+
+from dbt.adapters.maxcompute.relation import MaxComputeRelation
+from dbt.adapters.maxcompute.table_cache import TableCache
+from tests.unit_test.fakes import make_adapter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _relation(name):
+    return MaxComputeRelation.create(database="proj", schema="sch", identifier=name)
+
+
+class TestTableCache(unittest.TestCase):
+    def test_hits_and_misses(self):
+        cache = TableCache(max_size=4)
+        table = object()
+        self.assertIsNone(cache.get(_relation("t")))
+        cache.put(_relation("t"), table)
+        self.assertIs(cache.get(_relation("T")), table)
+        self.assertEqual(cache.stats(), {"hits": 1, "misses": 1, "size": 1})
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = TableCache(max_size=2)
+        cache.put(_relation("a"), "a")
+        cache.put(_relation("b"), "b")
+        cache.get(_relation("a"))
+        cache.put(_relation("c"), "c")
+        self.assertEqual(cache.get(_relation("a")), "a")
+        self.assertIsNone(cache.get(_relation("b")))
+        self.assertEqual(cache.get(_relation("c")), "c")
+
+    def test_entries_expire(self):
+        clock = FakeClock()
+        cache = TableCache(max_size=2, ttl=10, clock=clock)
+        cache.put(_relation("a"), "a")
+        clock.now = 9
+        self.assertEqual(cache.get(_relation("a")), "a")
+        clock.now = 10
+        self.assertIsNone(cache.get(_relation("a")))
+        self.assertEqual(cache.stats()["size"], 0)
+
+    def test_zero_size_disables_cache(self):
+        cache = TableCache(max_size=0)
+        cache.put(_relation("a"), "a")
+        self.assertIsNone(cache.get(_relation("a")))
+
+
+def _make_adapter():
+    odps = MagicMock()
+    odps.get_table.side_effect = lambda name, project=None, schema=None: MagicMock(spec=Table)
+    return make_adapter(odps), odps
+
+
+class TestAdapterTableCache(unittest.TestCase):
+    def test_reloaded_table_is_reused(self):
+        adapter, odps = _make_adapter()
+        first = adapter.get_odps_table_by_relation(_relation("t"))
+        second = adapter.get_odps_table_by_relation(_relation("t"))
+        self.assertIs(first, second)
+        self.assertEqual(odps.get_table.call_count, 1)
+        self.assertEqual(adapter.table_cache_stats(), {"hits": 1, "misses": 1, "size": 1})
+
+    def test_ddl_invalidates_entry(self):
+        adapter, odps = _make_adapter()
+        adapter.get_odps_table_by_relation(_relation("t"))
+        adapter.invalidate_table_metadata(_relation("t"))
+        adapter.get_odps_table_by_relation(_relation("t"))
+        self.assertEqual(odps.get_table.call_count, 2)
+
+    def test_bypass_cache(self):
+        adapter, odps = _make_adapter()
+        adapter.get_odps_table_by_relation(_relation("t"))
+        adapter.get_odps_table_by_relation(_relation("t"), use_cache=False)
+        self.assertEqual(odps.get_table.call_count, 2)
+
+    def test_missing_table_is_not_cached(self):
+        adapter, odps = _make_adapter()
+        missing = MagicMock(spec=Table)
+        missing.reload.side_effect = NoSuchObject("Table not found")
+        odps.get_table.side_effect = None
+        odps.get_table.return_value = missing
+        self.assertIsNone(adapter.get_odps_table_by_relation(_relation("t")))
+        self.assertEqual(adapter.table_cache_stats()["size"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+"""Unit tests for the in-place reconciliation of table configs."""
+
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from dbt.adapters.maxcompute.relation import MaxComputeRelation
+from dbt.adapters.maxcompute.relation_configs._table import MaxComputeTableConfig
+from tests.unit_test.fakes import make_adapter
+
+
+def _table(lifecycle=30, comment=None, properties=None):
+    table = MagicMock()
+    table.name = "orders"
+    table.project.name = "proj"
+    table.get_schema.return_value.name = "sch"
+    table.lifecycle = lifecycle
+    table.comment = comment
+    table.table_properties = properties
+    return table
+
+
+def _model(**config):
+    return SimpleNamespace(identifier="orders", schema="sch", database="proj", config=config)
+
+
+def _make_adapter(table):
+    adapter = make_adapter()
+    adapter.get_odps_table_by_relation = MagicMock(return_value=table)
+    return adapter
+
+
+RELATION = MaxComputeRelation.create(database="proj", schema="sch", identifier="orders")
+
+
+class TestTableConfigChanges(unittest.TestCase):
+    def test_no_drift(self):
+        adapter = _make_adapter(_table(properties={"transactional": "true"}))
+        self.assertIsNone(adapter.table_config_changes(RELATION, _model(lifecycle=30)))
+        # Settings the model leaves unset never drift.
+        self.assertIsNone(adapter.table_config_changes(RELATION, _model()))
+
+    def test_minimal_changes(self):
+        adapter = _make_adapter(
+            _table(comment="old", properties={"transactional": "true", "a": "1", "b": "2"})
+        )
+        model = _model(
+            lifecycle=7,
+            table_comment="it's new",
+            tblproperties={"a": 1, "b": "3", "c": "x", "transactional": "false"},
+        )
+        changes = adapter.table_config_changes(RELATION, model)
+        self.assertEqual(
+            changes,
+            {
+                "lifecycle": (30, 7),
+                "table_comment": ("old", "it's new"),
+                "tblproperties": {"b": ("2", "3"), "c": (None, "x")},
+            },
+        )
+        self.assertEqual(
+            adapter.table_config_alter_sql(RELATION, changes).splitlines(),
+            [
+                "ALTER TABLE `proj`.`sch`.`orders` SET LIFECYCLE 7;",
+                'ALTER TABLE `proj`.`sch`.`orders` SET TBLPROPERTIES("b"="3", "c"="x");',
+                "ALTER TABLE `proj`.`sch`.`orders` SET COMMENT 'it\\'s new';",
+            ],
+        )
+
+    def test_tblproperties_are_normalized(self):
+        adapter = _make_adapter(
+            _table(properties={"transactional": "true", "columnar.nested.type": "true"})
+        )
+        model = _model(tblproperties={"Columnar.Nested.Type": True, "transactional": "TRUE"})
+        self.assertIsNone(adapter.table_config_changes(RELATION, model))
+        model = _model(tblproperties={"columnar.nested.type": False})
+        self.assertEqual(
+            adapter.table_config_changes(RELATION, model),
+            {"tblproperties": {"columnar.nested.type": ("true", "false")}},
+        )
+
+    def test_persist_docs_takes_precedence_over_table_comment(self):
+        adapter = _make_adapter(_table(comment="from the description"))
+        model = _model(table_comment="from the config", persist_docs={"relation": True})
+        model.description = "from the description"
+        self.assertIsNone(adapter.table_config_changes(RELATION, model))
+        # Without a description there is nothing for persist_docs to set
+        model.description = ""
+        self.assertEqual(
+            adapter.table_config_changes(RELATION, model),
+            {"table_comment": ("from the description", "from the config")},
+        )
+
+    def test_missing_table(self):
+        adapter = _make_adapter(None)
+        self.assertIsNone(adapter.table_config_changes(RELATION, _model(lifecycle=7)))
+        self.assertEqual(adapter.table_config_alter_sql(RELATION, None), "")
+
+    def test_lifecycle_of_permanent_table(self):
+        existing = MaxComputeTableConfig.from_mc_table(_table(lifecycle=-1))
+        self.assertIsNone(existing.lifecycle)
+        new = MaxComputeTableConfig.from_dict(
+            {"name": "orders", "schema": "sch", "project": "proj", "lifecycle": "14"}
+        )
+        self.assertEqual(new.changes_from(existing), {"lifecycle": (None, 14)})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,271 @@
+"""Unit tests for the shared credential provider and its on-disk token cache."""
+
+import importlib.util
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from alibabacloud_credentials.provider import (
+    EcsRamRoleCredentialsProvider,
+    OIDCRoleArnCredentialsProvider,
+    RamRoleArnCredentialsProvider,
+    RsaKeyPairCredentialsProvider,
+    StaticAKCredentialsProvider,
+)
+from alibabacloud_credentials.provider.refreshable import Credentials
+from dbt_common.exceptions import DbtRuntimeError
+
+from dbt.adapters.maxcompute import token_cache
+from dbt.adapters.maxcompute.credentials import MaxComputeCredentials
+from dbt.adapters.maxcompute.token_cache import (
+    CachedCredentialProvider,
+    TokenCache,
+    TokenStore,
+    auth_key,
+)
+
+HAS_CRYPTOGRAPHY = importlib.util.find_spec("cryptography") is not None
+# A Fernet key: 32 url-safe base64 encoded bytes
+KEY = "q2dRM2ZwZ1NVRzRjb1hyUDFWeTc0OXlYa2lXTjZHNzQ="
+OTHER_KEY = "T0ZSYWxSRk5uWVpYMGl0WnR4Y3dMMmN1cEI4dU5OVkI="
+
+
+def _credentials(**kwargs):
+    values = dict(
+        endpoint="http://service.example.com/api",
+        database="proj",
+        schema="default",
+        auth_type="ram_role_arn",
+        access_key_id="ak",
+        access_key_secret="sk",
+        role_arn="acs:ram::1:role/dbt",
+    )
+    values.update(kwargs)
+    return MaxComputeCredentials(**values)
+
+
+class FakeStsProvider:
+    """A credentials provider whose every fetch is an STS exchange."""
+
+    def __init__(self, lifetime=3600):
+        self.lifetime = lifetime
+        self.exchanges = 0
+        self.exchanged = threading.Event()
+
+    def get_provider_name(self):
+        return "ram_role_arn"
+
+    def get_credentials(self):
+        self.exchanges += 1
+        self.exchanged.set()
+        return Credentials(
+            access_key_id=f"STS.{self.exchanges}",
+            access_key_secret="secret",
+            security_token=f"token-{self.exchanges}",
+            expiration=int(time.time() + self.lifetime),
+            provider_name="ram_role_arn",
+        )
+
+
+class TestCachedCredentialProvider(unittest.TestCase):
+    def test_token_is_exchanged_once(self):
+        client = FakeStsProvider()
+        provider = CachedCredentialProvider(client, "key")
+        credentials = [provider.get_credential() for _ in range(10)]
+        self.assertEqual(client.exchanges, 1)
+        self.assertEqual({c.access_key_id for c in credentials}, {"STS.1"})
+        self.assertEqual(credentials[0].security_token, "token-1")
+        provider.close()
+
+    def test_refreshes_in_background_before_expiry(self):
+        client = FakeStsProvider(lifetime=3600)
+        provider = CachedCredentialProvider(client, "key")
+        provider.get_credential()
+        # Scheduled 5 minutes before the token expires
+        self.assertAlmostEqual(provider._refresh_delay(), 3300, delta=5)
+        self.assertAlmostEqual(provider._timer.interval, 3300, delta=5)
+        client.exchanged.clear()
+        provider._schedule(0)
+        self.assertTrue(client.exchanged.wait(2))
+        self.assertEqual(provider.get_credential().access_key_id, "STS.2")
+        self.assertEqual(client.exchanges, 2)
+        provider.close()
+
+    def test_short_lived_tokens_refresh_at_three_quarters(self):
+        provider = CachedCredentialProvider(FakeStsProvider(lifetime=900), "key")
+        provider.get_credential()
+        self.assertAlmostEqual(provider._refresh_delay(), 675, delta=5)
+        provider.close()
+
+    def test_static_keys_are_not_refreshed(self):
+        static = StaticAKCredentialsProvider(access_key_id="ak", access_key_secret="sk")
+        provider = CachedCredentialProvider(static, "key")
+        with patch.object(static, "get_credentials", wraps=static.get_credentials) as fetch:
+            provider.get_credential()
+            self.assertEqual(provider.get_credential().access_key_id, "ak")
+        fetch.assert_called_once()
+        self.assertIsNone(provider._timer)
+
+
+class TestTokenCache(unittest.TestCase):
+    def test_shared_per_auth_config(self):
+        cache = TokenCache()
+        factory = MagicMock(side_effect=FakeStsProvider)
+        first = cache.provider(_credentials(), factory)
+        # Same auth, different project: one exchange for both profiles
+        second = cache.provider(_credentials(database="other"), factory)
+        third = cache.provider(_credentials(role_arn="acs:ram::1:role/other"), factory)
+        self.assertIs(first, second)
+        self.assertIsNot(first, third)
+        self.assertEqual(factory.call_count, 2)
+        cache.clear()
+
+    def test_auth_key_ignores_connection_fields(self):
+        self.assertEqual(
+            auth_key(_credentials()), auth_key(_credentials(endpoint="http://other/api"))
+        )
+        self.assertNotEqual(auth_key(_credentials()), auth_key(_credentials(access_key_id="x")))
+
+    def test_persistence_needs_cryptography(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with patch.dict("sys.modules", {"cryptography.fernet": None}):
+                self.assertIsNone(token_cache.open_token_store(tmp, 60, KEY))
+
+    def test_persistence_needs_a_key(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "tokens")
+            self.assertIsNone(token_cache.open_token_store(path, 60, None))
+            self.assertFalse(os.path.exists(path))
+
+
+class TestCredentialsProvider(unittest.TestCase):
+    def test_built_from_the_auth_config(self):
+        provider = _credentials()._credentials_provider()
+        self.assertIsInstance(provider, RamRoleArnCredentialsProvider)
+        provider = _credentials(auth_type="access_key")._credentials_provider()
+        self.assertIsInstance(provider, StaticAKCredentialsProvider)
+        self.assertEqual(provider.get_credentials().get_access_key_id(), "ak")
+
+    def test_unknown_auth_type(self):
+        with self.assertRaises(DbtRuntimeError):
+            _credentials(auth_type="unknown")._credentials_provider()
+
+    def test_ram_role_arn_duration_seconds(self):
+        provider = _credentials(duration_seconds=1800)._credentials_provider()
+        self.assertEqual(provider._duration_seconds, 1800)
+        # role_session_expiration, the current name, wins
+        provider = _credentials(
+            duration_seconds=1800, role_session_expiration=2400
+        )._credentials_provider()
+        self.assertEqual(provider._duration_seconds, 2400)
+
+    def test_oidc_role_arn_duration_seconds(self):
+        with tempfile.NamedTemporaryFile() as token_file:
+            provider = _credentials(
+                auth_type="oidc_role_arn",
+                oidc_provider_arn="acs:ram::1:oidc-provider/dbt",
+                oidc_token_file_path=token_file.name,
+                duration_seconds=1800,
+            )._credentials_provider()
+        self.assertIsInstance(provider, OIDCRoleArnCredentialsProvider)
+        self.assertEqual(provider._duration_seconds, 1800)
+
+    def test_rsa_key_pair_duration_seconds(self):
+        with tempfile.NamedTemporaryFile("w") as key_file:
+            key_file.write("private key")
+            key_file.flush()
+            provider = _credentials(
+                auth_type="rsa_key_pair",
+                public_key_id="pk",
+                private_key_file=key_file.name,
+                duration_seconds=1800,
+            )._credentials_provider()
+        self.assertIsInstance(provider, RsaKeyPairCredentialsProvider)
+        self.assertEqual(provider._duration_seconds, 1800)
+
+    def test_ecs_ram_role_enable_imds_v2(self):
+        provider = _credentials(auth_type="ecs_ram_role", role_name="dbt")._credentials_provider()
+        self.assertIsInstance(provider, EcsRamRoleCredentialsProvider)
+        self.assertFalse(provider._disable_imds_v1)
+        provider = _credentials(
+            auth_type="ecs_ram_role", role_name="dbt", enable_imds_v2=True
+        )._credentials_provider()
+        self.assertTrue(provider._disable_imds_v1)
+        with self.assertRaises(DbtRuntimeError):
+            _credentials(
+                auth_type="ecs_ram_role", role_name="dbt", metadata_token_duration=60
+            )._credentials_provider()
+
+    def test_unsupported_auth_options_raise(self):
+        for auth_type in ("access_key", "sts", "ram_role_arn", "ecs_ram_role", "credentials_uri"):
+            with self.assertRaises(DbtRuntimeError, msg=auth_type):
+                _credentials(
+                    auth_type=auth_type, auth_host="sts.example.com"
+                )._credentials_provider()
+        for auth_type in ("access_key", "sts", "ecs_ram_role", "credentials_uri"):
+            with self.assertRaises(DbtRuntimeError, msg=auth_type):
+                _credentials(auth_type=auth_type, duration_seconds=1800)._credentials_provider()
+        for auth_type in ("access_key", "ram_role_arn"):
+            with self.assertRaises(DbtRuntimeError, msg=auth_type):
+                _credentials(auth_type=auth_type, enable_imds_v2=True)._credentials_provider()
+
+
+@unittest.skipUnless(HAS_CRYPTOGRAPHY, "cryptography is not installed")
+class TestTokenStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "tokens")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_next_invocation_skips_the_exchange(self):
+        first_client = FakeStsProvider()
+        first = CachedCredentialProvider(
+            first_client, "key", store=TokenStore(self.path, 3600, KEY)
+        )
+        first.get_credential()
+        first.close()
+
+        second_client = FakeStsProvider()
+        second = CachedCredentialProvider(
+            second_client, "key", store=TokenStore(self.path, 3600, KEY)
+        )
+        self.assertEqual(second.get_credential().access_key_id, "STS.1")
+        self.assertEqual(second_client.exchanges, 0)
+        second.close()
+
+        with open(os.path.join(self.path, "key.token"), "rb") as f:
+            self.assertNotIn(b"token-1", f.read())
+        # The key is never written next to the tokens
+        self.assertEqual(os.listdir(self.path), ["key.token"])
+
+    def test_other_key_cannot_read_tokens(self):
+        provider = CachedCredentialProvider(
+            FakeStsProvider(), "key", store=TokenStore(self.path, 3600, KEY)
+        )
+        provider.get_credential()
+        provider.close()
+        self.assertIsNone(TokenStore(self.path, 3600, OTHER_KEY).load("key", time.time()))
+
+    def test_stale_entries_are_not_reused(self):
+        store = TokenStore(self.path, 3600, KEY)
+        provider = CachedCredentialProvider(FakeStsProvider(lifetime=30), "key", store=store)
+        provider.get_credential()
+        provider.close()
+        # Expires within the guard interval
+        self.assertIsNone(store.load("key", time.time()))
+
+        provider = CachedCredentialProvider(FakeStsProvider(), "other", store=store)
+        provider.get_credential()
+        provider.close()
+        self.assertIsNotNone(store.load("other", time.time()))
+        with patch("cryptography.fernet.time.time", return_value=time.time() + 7200):
+            self.assertIsNone(TokenStore(self.path, 3600, KEY).load("other", time.time()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,172 @@
+"""Unit tests for the shared metadata consistency wait policy."""
+
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from dbt_common.exceptions import DbtConfigError
+from odps.errors import NoSuchObject, ODPSError
+
+from dbt.adapters.maxcompute.utils import (
+    WAIT_STATS,
+    WaitPolicy,
+    call_with_retry,
+    is_table_not_found,
+    resolve_wait_policy,
+    retry_on_exception,
+)
+from dbt.adapters.maxcompute.wrapper import CursorWrapper
+from tests.unit_test.fakes import make_adapter
+
+
+class Flaky:
+    """Raise `error` on the first `failures` calls, then return "ok"."""
+
+    def __init__(self, failures, error=ValueError("not yet")):
+        self.failures = failures
+        self.error = error
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.error
+        return "ok"
+
+
+class TestWaitPolicy(unittest.TestCase):
+    def test_delays_grow_and_are_capped(self):
+        policy = WaitPolicy(initial_delay=1, max_delay=5, backoff=2, jitter=0, max_attempts=6)
+        self.assertEqual(list(policy.delays()), [1, 2, 4, 5, 5])
+
+    def test_jitter_stays_within_bounds(self):
+        policy = WaitPolicy(initial_delay=1, max_delay=1, jitter=0.5, max_attempts=50)
+        for delay in policy.delays():
+            self.assertTrue(0.5 <= delay <= 1.5)
+
+    def test_overrides(self):
+        policy = resolve_wait_policy("table_visible", {"table_visible": {"deadline": 5}})
+        self.assertEqual(policy.deadline, 5)
+        self.assertEqual(resolve_wait_policy("table_visible", {"other": {}}).deadline, 120)
+        with self.assertRaises(DbtConfigError):
+            resolve_wait_policy("table_visible", {"table_visible": {"timeout": 5}})
+
+
+class TestCallWithRetry(unittest.TestCase):
+    def test_retries_until_success(self):
+        sleeps = []
+        func = Flaky(failures=3)
+        policy = WaitPolicy(initial_delay=0.1, jitter=0, deadline=None)
+        result = call_with_retry(func, policy, call_site="test_success", sleep=sleeps.append)
+        self.assertEqual(result, "ok")
+        self.assertEqual(sleeps, [0.1, 0.2, 0.4])
+        stats = WAIT_STATS.snapshot()["test_success"]
+        self.assertEqual((stats["waits"], stats["retries"], stats["failures"]), (1, 3, 0))
+
+    def test_gives_up_after_max_attempts(self):
+        func = Flaky(failures=10)
+        policy = WaitPolicy(initial_delay=0, jitter=0, max_attempts=3)
+        with self.assertRaises(ValueError):
+            call_with_retry(func, policy, call_site="test_failure", sleep=lambda _: None)
+        self.assertEqual(func.calls, 3)
+        self.assertEqual(WAIT_STATS.snapshot()["test_failure"]["failures"], 1)
+
+    def test_deadline_bounds_total_wait(self):
+        sleeps = []
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+            time.sleep(seconds)
+
+        policy = WaitPolicy(initial_delay=10, jitter=0, deadline=0.05)
+        with self.assertRaises(ValueError):
+            call_with_retry(Flaky(failures=10), policy, sleep=sleep)
+        self.assertEqual(len(sleeps), 1)
+        self.assertLessEqual(sleeps[0], 0.05)
+
+    def test_other_errors_are_not_retried(self):
+        func = Flaky(failures=1, error=KeyError("boom"))
+        with self.assertRaises(KeyError):
+            call_with_retry(func, WaitPolicy(), exceptions=(ValueError,))
+        func = Flaky(failures=1)
+        with self.assertRaises(ValueError):
+            call_with_retry(func, WaitPolicy(), condition=lambda e: False)
+        self.assertEqual(func.calls, 1)
+
+    def test_retry_on_exception_decorator(self):
+        func = Flaky(failures=2)
+        decorated = retry_on_exception(max_retries=3, delay=0)(func)
+        self.assertEqual(decorated(), "ok")
+        self.assertEqual(func.calls, 3)
+
+
+class FakeSeed:
+    """The parts of a seed's agate table that load_dataframe reads."""
+
+    column_names = ["id"]
+    column_types = []
+
+    def __init__(self, path):
+        self.original_abspath = path
+
+
+class TestSeedUploadRetry(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        path = os.path.join(self.tmp.name, "seed.csv")
+        with open(path, "w") as f:
+            f.write("id\n1\n")
+        self.seed = FakeSeed(path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _load(self, write_table):
+        adapter = make_adapter(
+            wait_policies={"seed_table_visible": {"initial_delay": 0.01, "jitter": 0}}
+        )
+        adapter.get_odps_client = MagicMock(return_value=MagicMock(write_table=write_table))
+        adapter.load_dataframe("proj", "sch", "seed", self.seed, {}, ",")
+
+    def test_table_not_visible_is_retried(self):
+        write_table = Flaky(failures=2, error=NoSuchObject("Table not found"))
+        self._load(lambda *args, **kwargs: write_table())
+        self.assertEqual(write_table.calls, 3)
+
+    def test_other_errors_raise_right_away(self):
+        write_table = Flaky(failures=5, error=ODPSError("ODPS-0420095: Access Denied"))
+        start = time.monotonic()
+        with self.assertRaises(ODPSError):
+            self._load(lambda *args, **kwargs: write_table())
+        self.assertEqual(write_table.calls, 1)
+        self.assertLess(time.monotonic() - start, 1)
+
+    def test_is_table_not_found(self):
+        self.assertTrue(is_table_not_found(NoSuchObject("seed")))
+        self.assertTrue(is_table_not_found(ODPSError("ODPS-0130131:Table not found - seed")))
+        self.assertFalse(is_table_not_found(ODPSError("ODPS-0130013: Authorization exception")))
+
+
+class TestCursorRetry(unittest.TestCase):
+    def test_transient_errors_are_resubmitted(self):
+        cursor = CursorWrapper.__new__(CursorWrapper)
+        cursor._maxqa_config = None
+        cursor._wait_policy = WaitPolicy(initial_delay=0, jitter=0, max_attempts=3)
+        error = ODPSError("conflict", code="ODPS-0130211")
+        calls = []
+
+        def execute(*args, **kwargs):
+            calls.append(args)
+            if len(calls) < 3:
+                raise error
+            cursor._instance = MagicMock()
+
+        with patch("odps.dbapi.Cursor.execute", side_effect=execute):
+            cursor.execute("select 1")
+        self.assertEqual(len(calls), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()